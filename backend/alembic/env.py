@@ -12,7 +12,16 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 # Import your settings and models
 from app.core.config import settings
 from app.core.database import Base
-from app.models import candidate, candidateskill, config, jobpost, user
+from app.models import (
+    candidate,
+    candidateskill,
+    config,
+    indeed,
+    jobpost,
+    mail,
+    table_version,
+    user,
+)
 
 # Alembic Config object
 alembic_config = context.config
@@ -0,0 +1,52 @@
+"""Add candidate skill indexes
+
+Revision ID: 3f9a6b1d0c27
+Revises: 8d41c2a7e5b3
+Create Date: 2026-10-18 11:02:15.402871
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f9a6b1d0c27"
+down_revision: Union[str, Sequence[str], None] = "8d41c2a7e5b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # candidate_skills is large; build the indexes without blocking writes
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f("ix_candidate_skills_candidate_id"),
+            "candidate_skills",
+            ["candidate_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_candidate_skills_skill_name_score",
+            "candidate_skills",
+            ["skill_name", "score"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_candidate_skills_skill_name_score",
+            table_name="candidate_skills",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            op.f("ix_candidate_skills_candidate_id"),
+            table_name="candidate_skills",
+            postgresql_concurrently=True,
+        )
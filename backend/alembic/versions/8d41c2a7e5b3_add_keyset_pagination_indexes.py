@@ -0,0 +1,39 @@
+"""Add keyset pagination indexes
+
+Revision ID: 8d41c2a7e5b3
+Revises: 25febb77c931
+Create Date: 2026-10-18 09:12:40.118302
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8d41c2a7e5b3"
+down_revision: Union[str, Sequence[str], None] = "25febb77c931"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_candidates_created_at_id",
+        "candidates",
+        ["created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_job_posts_created_at_id",
+        "job_posts",
+        ["created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_job_posts_created_at_id", table_name="job_posts")
+    op.drop_index("ix_candidates_created_at_id", table_name="candidates")
@@ -0,0 +1,42 @@
+"""Add lower(skill_name) index on candidate_skills
+
+Revision ID: 9c3e7a5b1f80
+Revises: b8e4f0a26d73
+Create Date: 2026-10-18 21:14:37.208415
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9c3e7a5b1f80"
+down_revision: Union[str, Sequence[str], None] = "b8e4f0a26d73"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # candidate_skills is large; build the index without blocking writes
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_candidate_skills_lower_skill_name",
+            "candidate_skills",
+            [sa.text("lower(skill_name)")],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_candidate_skills_lower_skill_name",
+            table_name="candidate_skills",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,103 @@
+"""Add dashboard stats views
+
+Revision ID: a7d3e9f15c62
+Revises: f2c8d5a17b46
+Create Date: 2026-10-18 19:12:37.508114
+
+"""
+
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a7d3e9f15c62"
+down_revision: Union[str, Sequence[str], None] = "f2c8d5a17b46"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Aggregates behind GET /stats/dashboard (app/utils/dashboard_stats.py holds
+# the live equivalents used on other dialects). Each view needs a unique
+# index for REFRESH MATERIALIZED VIEW CONCURRENTLY.
+VIEWS = {
+    "stats_candidates_by_job_post": (
+        """
+        SELECT job_post_id,
+               count(*) AS candidates,
+               count(rate_card_hourly) AS rated,
+               sum(rate_card_hourly) AS rate_sum
+          FROM candidates
+         GROUP BY job_post_id
+        """,
+        ["job_post_id"],
+    ),
+    "stats_candidates_by_visa_type": (
+        """
+        SELECT visa_type,
+               count(*) AS candidates,
+               count(rate_card_hourly) AS rated,
+               sum(rate_card_hourly) AS rate_sum,
+               count(experience_years) AS experienced,
+               sum(experience_years) AS experience_sum
+          FROM candidates
+         GROUP BY visa_type
+        """,
+        ["visa_type"],
+    ),
+    "stats_candidate_skills": (
+        """
+        SELECT lower(skill_name) AS skill_name,
+               count(DISTINCT candidate_id) AS candidates,
+               avg(score) AS avg_score
+          FROM candidate_skills
+         WHERE skill_name IS NOT NULL
+         GROUP BY lower(skill_name)
+        """,
+        ["skill_name"],
+    ),
+    "stats_candidates_daily": (
+        """
+        SELECT date(created_at) AS day, count(*) AS candidates
+          FROM candidates
+         GROUP BY date(created_at)
+        """,
+        ["day"],
+    ),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == "postgresql":
+        for name, (query, unique) in VIEWS.items():
+            op.execute(f"CREATE MATERIALIZED VIEW {name} AS {query}")
+            op.execute(f"CREATE UNIQUE INDEX ux_{name} ON {name} ({', '.join(unique)})")
+        # Top skills are read by candidate count
+        op.execute(
+            "CREATE INDEX ix_stats_candidate_skills_candidates "
+            "ON stats_candidate_skills (candidates DESC, skill_name)"
+        )
+    table_versions = sa.table(
+        "table_versions",
+        sa.column("name", sa.String),
+        sa.column("version", sa.BigInteger),
+        sa.column("updated_at", sa.DateTime),
+    )
+    op.execute(
+        table_versions.insert().values(
+            name="dashboard_stats",
+            version=0,
+            updated_at=datetime.now(timezone.utc).replace(tzinfo=None),
+        )
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DELETE FROM table_versions WHERE name = 'dashboard_stats'")
+    if op.get_bind().dialect.name == "postgresql":
+        for name in reversed(list(VIEWS)):
+            op.execute(f"DROP MATERIALIZED VIEW {name}")
@@ -0,0 +1,122 @@
+"""Add candidate search
+
+Revision ID: b62e0f4c9d18
+Revises: 3f9a6b1d0c27
+Create Date: 2026-10-18 12:20:03.774519
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b62e0f4c9d18"
+down_revision: Union[str, Sequence[str], None] = "3f9a6b1d0c27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rebuilds a candidate's document from its own columns plus its skill names.
+# Weighted so that name and skill matches rank above location and remarks.
+CANDIDATE_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION candidates_search_vector_refresh() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(
+            (SELECT string_agg(skill_name, ' ')
+               FROM candidate_skills WHERE candidate_id = NEW.id), '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.current_location, '')), 'C') ||
+        setweight(to_tsvector('english', coalesce(NEW.remarks, '')), 'D');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER candidates_search_vector_trg
+    BEFORE INSERT OR UPDATE OF name, current_location, remarks ON candidates
+    FOR EACH ROW EXECUTE FUNCTION candidates_search_vector_refresh();
+"""
+
+# Skill changes re-run the candidate trigger once per affected candidate per
+# statement (transition tables), so a bulk import of skills costs one UPDATE.
+SKILLS_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION candidate_skills_search_vector_touch() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE candidates SET name = name
+         WHERE id IN (SELECT DISTINCT candidate_id FROM new_rows);
+    END IF;
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        UPDATE candidates SET name = name
+         WHERE id IN (SELECT DISTINCT candidate_id FROM old_rows);
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER candidate_skills_search_insert_trg
+    AFTER INSERT ON candidate_skills REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION candidate_skills_search_vector_touch();
+CREATE TRIGGER candidate_skills_search_update_trg
+    AFTER UPDATE ON candidate_skills
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION candidate_skills_search_vector_touch();
+CREATE TRIGGER candidate_skills_search_delete_trg
+    AFTER DELETE ON candidate_skills REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION candidate_skills_search_vector_touch();
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    is_postgres = op.get_bind().dialect.name == "postgresql"
+    op.add_column(
+        "candidates",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR().with_variant(sa.Text(), "sqlite"),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_candidates_experience_years", "candidates", ["experience_years"]
+    )
+    op.create_index(
+        "ix_candidates_rate_card_hourly", "candidates", ["rate_card_hourly"]
+    )
+    op.create_index("ix_candidates_visa_type", "candidates", ["visa_type"])
+    if not is_postgres:
+        return
+
+    op.execute(CANDIDATE_TRIGGER_SQL)
+    op.execute(SKILLS_TRIGGER_SQL)
+    # Backfill existing rows through the trigger
+    op.execute("UPDATE candidates SET name = name")
+    op.create_index(
+        "ix_candidates_search_vector",
+        "candidates",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "postgresql":
+        op.drop_index("ix_candidates_search_vector", table_name="candidates")
+        for trigger in (
+            "candidate_skills_search_insert_trg",
+            "candidate_skills_search_update_trg",
+            "candidate_skills_search_delete_trg",
+        ):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger} ON candidate_skills")
+        op.execute("DROP TRIGGER IF EXISTS candidates_search_vector_trg ON candidates")
+        op.execute("DROP FUNCTION IF EXISTS candidate_skills_search_vector_touch()")
+        op.execute("DROP FUNCTION IF EXISTS candidates_search_vector_refresh()")
+    op.drop_index("ix_candidates_visa_type", table_name="candidates")
+    op.drop_index("ix_candidates_rate_card_hourly", table_name="candidates")
+    op.drop_index("ix_candidates_experience_years", table_name="candidates")
+    op.drop_column("candidates", "search_vector")
@@ -0,0 +1,67 @@
+"""Make created_at not null
+
+Revision ID: b8e4f0a26d73
+Revises: a7d3e9f15c62
+Create Date: 2026-10-18 20:31:05.117342
+
+"""
+
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b8e4f0a26d73"
+down_revision: Union[str, Sequence[str], None] = "a7d3e9f15c62"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Keyset pagination compares (created_at, id); rows with a NULL created_at
+# never match the cursor, so the page after one came back empty.
+TABLES = ("candidates", "job_posts")
+
+
+def set_nullable(name: str, nullable: bool) -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.alter_column(
+            name, "created_at", existing_type=sa.DateTime(), nullable=nullable
+        )
+        return
+    # SQLite rebuilds the table, which loses expression indexes it cannot
+    # reflect; put the case-insensitive email index back
+    with op.batch_alter_table(name) as batch_op:
+        batch_op.alter_column(
+            "created_at", existing_type=sa.DateTime(), nullable=nullable
+        )
+    if name == "candidates":
+        op.create_index(
+            "ix_candidates_email_lower", "candidates", [sa.text("lower(email)")]
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    for name in TABLES:
+        table = sa.table(name, sa.column("created_at", sa.DateTime))
+        # Rows without a timestamp predate the column default; give them the
+        # oldest existing timestamp so they stay at the end of newest-first
+        # listings
+        oldest = bind.scalar(sa.select(sa.func.min(table.c.created_at)))
+        op.execute(
+            table.update()
+            .where(table.c.created_at.is_(None))
+            .values(
+                created_at=oldest or datetime.now(timezone.utc).replace(tzinfo=None)
+            )
+        )
+        set_nullable(name, False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in TABLES:
+        set_nullable(name, True)
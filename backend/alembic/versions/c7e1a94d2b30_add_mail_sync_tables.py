@@ -0,0 +1,75 @@
+"""Add mail sync tables
+
+Revision ID: c7e1a94d2b30
+Revises: b62e0f4c9d18
+Create Date: 2026-10-18 13:05:41.218337
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c7e1a94d2b30"
+down_revision: Union[str, Sequence[str], None] = "b62e0f4c9d18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "mail_messages",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("mailbox", sa.String(), nullable=False),
+        sa.Column("message_id", sa.String(), nullable=False),
+        sa.Column("subject", sa.String(), nullable=True),
+        sa.Column("from_name", sa.String(), nullable=True),
+        sa.Column("from_address", sa.String(), nullable=True),
+        sa.Column("received_at", sa.DateTime(), nullable=True),
+        sa.Column("body_preview", sa.Text(), nullable=True),
+        sa.Column("synced_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("mailbox", "message_id", name="uq_mail_messages_message"),
+    )
+    op.create_index(
+        "ix_mail_messages_mailbox_received",
+        "mail_messages",
+        ["mailbox", "received_at"],
+    )
+    op.create_index(
+        "ix_mail_messages_mailbox_from_received",
+        "mail_messages",
+        ["mailbox", "from_address", "received_at"],
+    )
+    op.create_table(
+        "mail_sync_state",
+        sa.Column("mailbox", sa.String(), nullable=False),
+        sa.Column("delta_link", sa.Text(), nullable=True),
+        sa.Column("next_link", sa.Text(), nullable=True),
+        sa.Column("synced_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("mailbox"),
+    )
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql" and bind.scalar(
+        sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    ):
+        # Trigram index so subject "contains" filters avoid a mailbox scan;
+        # skipped where the contrib extension is not installed
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute(
+            "CREATE INDEX ix_mail_messages_subject_trgm ON mail_messages "
+            "USING gin (subject gin_trgm_ops)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS ix_mail_messages_subject_trgm")
+    op.drop_table("mail_sync_state")
+    op.drop_index("ix_mail_messages_mailbox_from_received", table_name="mail_messages")
+    op.drop_index("ix_mail_messages_mailbox_received", table_name="mail_messages")
+    op.drop_table("mail_messages")
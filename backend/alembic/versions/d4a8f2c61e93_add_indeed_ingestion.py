@@ -0,0 +1,65 @@
+"""Add Indeed ingestion
+
+Revision ID: d4a8f2c61e93
+Revises: c7e1a94d2b30
+Create Date: 2026-10-18 14:02:17.530862
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d4a8f2c61e93"
+down_revision: Union[str, Sequence[str], None] = "c7e1a94d2b30"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "indeed_applications",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("job_id", sa.String(), nullable=False),
+        sa.Column("candidate_id", sa.Integer(), nullable=False),
+        sa.Column("external_id", sa.String(), nullable=True),
+        sa.Column("applied_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["candidate_id"], ["candidates.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "job_id", "candidate_id", name="uq_indeed_applications_job_candidate"
+        ),
+    )
+    op.create_index(
+        "ix_indeed_applications_candidate_id",
+        "indeed_applications",
+        ["candidate_id"],
+    )
+    op.create_table(
+        "indeed_pages",
+        sa.Column("job_id", sa.String(), nullable=False),
+        sa.Column("page", sa.Integer(), nullable=False),
+        sa.Column("etag", sa.String(), nullable=True),
+        sa.Column("item_count", sa.Integer(), nullable=True),
+        sa.Column("total_pages", sa.Integer(), nullable=True),
+        sa.Column("checked_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("job_id", "page"),
+    )
+    op.create_index(
+        "ix_candidates_email_lower", "candidates", [sa.text("lower(email)")]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_candidates_email_lower", table_name="candidates")
+    op.drop_table("indeed_pages")
+    op.drop_index(
+        "ix_indeed_applications_candidate_id", table_name="indeed_applications"
+    )
+    op.drop_table("indeed_applications")
@@ -0,0 +1,39 @@
+"""Add table versions
+
+Revision ID: e5b9c3d71f04
+Revises: d4a8f2c61e93
+Create Date: 2026-10-18 16:20:41.907215
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e5b9c3d71f04"
+down_revision: Union[str, Sequence[str], None] = "d4a8f2c61e93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    table_versions = op.create_table(
+        "table_versions",
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.bulk_insert(
+        table_versions,
+        [{"name": name, "version": 0} for name in ("config", "job_posts", "users")],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("table_versions")
@@ -0,0 +1,130 @@
+"""Add job post skill terms
+
+Revision ID: f2c8d5a17b46
+Revises: e5b9c3d71f04
+Create Date: 2026-10-18 18:05:12.441920
+
+"""
+
+from typing import Any, Dict, Iterable, List, Sequence, Set, Union
+
+import re
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f2c8d5a17b46"
+down_revision: Union[str, Sequence[str], None] = "e5b9c3d71f04"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DOCUMENT_COLUMNS = (
+    "key_responsibilities",
+    "required_qualifications",
+    "preferred_qualifications",
+    "addons",
+)
+
+# Frozen copy of the term extraction in app.utils.matching as of this
+# revision, so the backfill does not change when the app's version does
+MAX_SKILL_WORDS = 3
+_WORD = re.compile(r"[a-z0-9+#.]+")
+
+
+def normalize_skill(name: str) -> str:
+    words = (w.strip(".") for w in _WORD.findall(name.lower()))
+    return " ".join(w for w in words if w)
+
+
+def iter_text(value: Any) -> Iterable[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for v in value.values():
+            yield from iter_text(v)
+    elif isinstance(value, (list, tuple)):
+        for v in value:
+            yield from iter_text(v)
+
+
+def qualification_terms(value: Any) -> Set[str]:
+    terms: Set[str] = set()
+    for text in iter_text(value):
+        words = normalize_skill(text).split()
+        for size in range(1, MAX_SKILL_WORDS + 1):
+            for i in range(len(words) - size + 1):
+                terms.add(" ".join(words[i : i + size]))
+    return terms
+
+
+def job_skill_terms(required: Any, preferred: Any) -> Dict[str, List[str]]:
+    return {
+        "required": sorted(qualification_terms(required)),
+        "preferred": sorted(qualification_terms(preferred)),
+    }
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    is_postgres = bind.dialect.name == "postgresql"
+    if is_postgres:
+        for column in DOCUMENT_COLUMNS:
+            op.execute(
+                f"ALTER TABLE job_posts ALTER COLUMN {column} "
+                f"TYPE JSONB USING {column}::jsonb"
+            )
+    op.add_column(
+        "job_posts",
+        sa.Column(
+            "skill_terms",
+            postgresql.JSONB().with_variant(sa.JSON(), "sqlite"),
+            nullable=True,
+        ),
+    )
+
+    job_posts = sa.table(
+        "job_posts",
+        sa.column("id", sa.Integer),
+        sa.column("required_qualifications", sa.JSON),
+        sa.column("preferred_qualifications", sa.JSON),
+        sa.column("skill_terms", sa.JSON),
+    )
+    rows = bind.execute(
+        sa.select(
+            job_posts.c.id,
+            job_posts.c.required_qualifications,
+            job_posts.c.preferred_qualifications,
+        )
+    ).all()
+    for job_id, required, preferred in rows:
+        bind.execute(
+            job_posts.update()
+            .where(job_posts.c.id == job_id)
+            .values(skill_terms=job_skill_terms(required, preferred))
+        )
+
+    if is_postgres:
+        op.create_index(
+            "ix_job_posts_skill_terms",
+            "job_posts",
+            ["skill_terms"],
+            postgresql_using="gin",
+            postgresql_ops={"skill_terms": "jsonb_path_ops"},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    is_postgres = op.get_bind().dialect.name == "postgresql"
+    if is_postgres:
+        op.drop_index("ix_job_posts_skill_terms", table_name="job_posts")
+    op.drop_column("job_posts", "skill_terms")
+    if is_postgres:
+        for column in DOCUMENT_COLUMNS:
+            op.execute(
+                f"ALTER TABLE job_posts ALTER COLUMN {column} "
+                f"TYPE JSON USING {column}::json"
+            )
@@ -1,6 +1,17 @@
 from fastapi import APIRouter, Depends
 
-from app.api import auth, candidate, candidateskill, config, jobpost, outlook, users
+from app.api import (
+    auth,
+    candidate,
+    candidateskill,
+    config,
+    indeed,
+    internal,
+    jobpost,
+    outlook,
+    stats,
+    users,
+)
 
 api_router = APIRouter()
 api_router.include_router(
@@ -12,36 +23,56 @@ api_router.include_router(
     jobpost.router,
     prefix="/jobposts",
     tags=["jobposts"],
-    dependencies=[Depends(auth.get_current_user)],
+    dependencies=[Depends(auth.get_current_claims)],
 )
 api_router.include_router(
     candidate.router,
     prefix="/candidates",
     tags=["candidates"],
-    dependencies=[Depends(auth.get_current_user)],
+    dependencies=[Depends(auth.get_current_claims)],
 )
 api_router.include_router(
     candidateskill.router,
     prefix="/candidateskills",
     tags=["candidateskills"],
-    dependencies=[Depends(auth.get_current_user)],
+    dependencies=[Depends(auth.get_current_claims)],
 )
 api_router.include_router(
     users.router,
     prefix="/users",
     tags=["users"],
-    dependencies=[Depends(auth.get_current_user)],
+    dependencies=[Depends(auth.get_current_claims)],
 )
 api_router.include_router(
     config.router,
     prefix="/config",
     tags=["config"],
-    dependencies=[Depends(auth.get_current_user)],
+    dependencies=[Depends(auth.get_current_claims)],
+)
+
+api_router.include_router(
+    stats.router,
+    prefix="/stats",
+    tags=["stats"],
+    dependencies=[Depends(auth.get_current_claims)],
 )
 
 api_router.include_router(
     outlook.router,
     prefix="/mail",
     tags=["mail"],
-    dependencies=[Depends(auth.get_current_user)],
+    dependencies=[Depends(auth.get_current_claims)],
+)
+
+api_router.include_router(
+    indeed.router,
+    tags=["indeed"],
+    dependencies=[Depends(auth.get_current_claims)],
+)
+
+api_router.include_router(
+    internal.router,
+    prefix="/internal",
+    tags=["internal"],
+    dependencies=[Depends(auth.require_admin)],
 )
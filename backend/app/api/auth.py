@@ -1,22 +1,31 @@
-import logging
 from datetime import timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import get_async_db, get_db
+from app.core.request_context import set_request_user
+from app.core.response_cache import response_cache
 from app.core.security import (
+    PasswordHashingBusy,
     create_access_token,
-    get_password_hash,
+    get_password_hash_async,
     needs_rehash,
-    verify_password,
+    verify_password_async,
 )
+from app.core.user_cache import user_cache
 from app.models.user import User
 from app.schemas.token import Token
-from app.schemas.user import UserBase, UserCreate, UserOut
+from app.schemas.user import CurrentUser, UserBase, UserCreate, UserOut, UserRole
+from app.utils.logging_utils import setup_logger
+
+logger = setup_logger(__name__)
 
 router = APIRouter()
 
@@ -24,41 +33,110 @@ router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
-) -> User:
-    """Extract and return the current user from JWT token"""
+def _decode_token(token: str) -> dict:
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
         )
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(status_code=401, detail="Invalid token")
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
+    if payload.get("sub") is None:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    return payload
+
 
-    user = db.query(User).filter(User.id == int(user_id)).first()
+def _snapshot(user: User) -> CurrentUser:
+    return CurrentUser(id=user.id, role=user.role, is_active=user.is_active)
+
+
+def get_current_user(
+    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+) -> User:
+    """Extract and return the current user from JWT token"""
+    payload = _decode_token(token)
+    user = db.query(User).filter(User.id == int(payload["sub"])).first()
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
 
+    user_cache.set(_snapshot(user))
+    set_request_user(user.id)
     return user
 
 
+async def get_current_claims(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)
+) -> CurrentUser:
+    """Resolve the caller from verified token claims without loading the ORM user.
+
+    The user's role and active flag come from the in-process user cache; on a
+    miss they are read once from the database (the session only checks out a
+    connection at that point) or, with AUTH_TRUST_TOKEN_CLAIMS, taken from the
+    token itself. Use get_current_user when the endpoint needs the User row.
+    """
+    payload = _decode_token(token)
+    try:
+        user_id = int(payload["sub"])
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    current = user_cache.get(user_id)
+    if current is None:
+        if settings.AUTH_TRUST_TOKEN_CLAIMS:
+            try:
+                current = CurrentUser(
+                    id=user_id,
+                    role=payload.get("role"),
+                    is_active=payload.get("is_active", True),
+                )
+            except ValidationError:
+                raise HTTPException(status_code=401, detail="Invalid token")
+        else:
+            user = await db.get(User, user_id)
+            if user is None:
+                raise HTTPException(status_code=404, detail="User not found")
+            current = _snapshot(user)
+            user_cache.set(current)
+
+    set_request_user(current.id)
+    if not current.is_active:
+        raise HTTPException(status_code=403, detail="Inactive user")
+    return current
+
+
+def require_admin(
+    current_user: CurrentUser = Depends(get_current_claims),
+) -> CurrentUser:
+    if current_user.role != UserRole.admin:
+        raise HTTPException(status_code=403, detail="Admin privileges required")
+    return current_user
+
+
+def hashing_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server busy, please retry",
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.post("/login", response_model=Token)
-def login(
-    form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
+async def login(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    user = db.query(User).filter(User.email == form_data.username).first()
+    user = await db.scalar(select(User).where(User.email == form_data.username))
     if not user:
-        logging.debug("Login failed: user not found: %s", form_data.username)
+        logger.debug("Login failed: user not found: %s", form_data.username)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
         )
 
-    verified = verify_password(form_data.password, user.hashed_password)
-    logging.debug(
+    try:
+        verified = await verify_password_async(form_data.password, user.hashed_password)
+    except PasswordHashingBusy:
+        raise hashing_busy()
+    logger.debug(
         "Login attempt for %s: hashed_password_len=%s verified=%s",
         form_data.username,
         len(user.hashed_password) if user.hashed_password else 0,
@@ -70,41 +148,47 @@ def login(
             detail="Incorrect email or password",
         )
 
+    # Read before the rehash: a rollback there would expire the instance
+    claims = {"sub": str(user.id), "role": user.role, "is_active": user.is_active}
+    email = user.email
     # Rehash password to preferred scheme on successful login if needed
     try:
         if needs_rehash(user.hashed_password):
-            logging.info(
-                "Rehashing password for user %s to preferred scheme", user.email
-            )
-            user.hashed_password = get_password_hash(form_data.password)
-            db.add(user)
-            db.commit()
-            db.refresh(user)
+            logger.info("Rehashing password for user %s to preferred scheme", email)
+            user.hashed_password = await get_password_hash_async(form_data.password)
+            await db.commit()
     except Exception:
-        # Don't block login on rehash failures; log for investigation
-        logging.exception("Failed to rehash password for user %s", user.email)
+        # Don't block login on rehash failures (including a busy hashing
+        # pool); log for investigation
+        logger.exception("Failed to rehash password for user %s", email)
+        await db.rollback()
     access_token = create_access_token(
-        data={"sub": str(user.id), "role": user.role},
+        data=claims,
         expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
 
 @router.post("/register", response_model=UserOut)
-def register(user_in: UserCreate, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == user_in.email).first()
+async def register(user_in: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    user = await db.scalar(select(User.id).where(User.email == user_in.email))
     if user:
         raise HTTPException(status_code=400, detail="Email already registered")
+    try:
+        hashed_password = await get_password_hash_async(user_in.password)
+    except PasswordHashingBusy:
+        raise hashing_busy()
     db_user = User(
         name=user_in.name,
         email=user_in.email,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=hashed_password,
         role=user_in.role,
         is_active=user_in.is_active,
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await response_cache.bump(db, "users")
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
 
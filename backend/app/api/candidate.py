@@ -1,41 +1,344 @@
-from typing import List
+from typing import List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from pydantic import ValidationError
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import joinedload, selectinload
 
-from app.core.database import get_db
+from app.core.constants import BULK_IMPORT_CHUNK_SIZE
+from app.core.database import get_async_db
+from app.core.replicas import get_read_db, get_read_sessionmaker
 from app.models.candidate import Candidate
-from app.schemas.candidate import CandidateCreate, CandidateOut
+from app.models.candidateskill import CandidateSkill
+from app.models.jobpost import JobPost
+from app.schemas.candidate import (
+    CandidateCreate,
+    CandidateDetailOut,
+    CandidateImportResult,
+    CandidateImportRow,
+    CandidateJobsResult,
+    CandidateOut,
+    CandidateSearchResult,
+    ImportRowError,
+    VisaType,
+)
+from app.schemas.pagination import Page
+from app.utils.bulk_import import iter_import_records
+from app.utils.candidate_search import build_filters, facet_counts, text_condition
+from app.utils.export import ExportFormat, export_response
+from app.utils.fast_json import FastJSONResponse, fetch_rows, output_columns
+from app.utils.job_search import jobs_for_skills
+from app.utils.logging_utils import setup_logger
+from app.utils.matching import normalize_skill
+from app.utils.pagination import keyset_paginate, keyset_paginate_rows
+
+logger = setup_logger(__name__)
 
 router = APIRouter()
 
 
 @router.post("/", response_model=CandidateOut)
-def create_candidate(candidate: CandidateCreate, db: Session = Depends(get_db)):
+async def create_candidate(
+    candidate: CandidateCreate, db: AsyncSession = Depends(get_async_db)
+):
     db_candidate = Candidate(**candidate.dict())
     db.add(db_candidate)
-    db.commit()
-    db.refresh(db_candidate)
+    await db.commit()
+    await db.refresh(db_candidate)
     return db_candidate
 
 
+def _format_errors(exc: Exception) -> List[str]:
+    if isinstance(exc, ValidationError):
+        return [
+            f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}"
+            for err in exc.errors()
+        ]
+    return [str(exc)]
+
+
+async def _insert_chunk(
+    db: AsyncSession,
+    chunk: List[Tuple[int, CandidateImportRow]],
+    errors: List[ImportRowError],
+) -> int:
+    """Insert one chunk of validated rows and their skills in one transaction.
+
+    Returns the number of candidates inserted; rows that fail are appended to
+    ``errors``.
+    """
+    job_post_ids = {record.job_post_id for _, record in chunk}
+    known = set(
+        await db.scalars(select(JobPost.id).where(JobPost.id.in_(job_post_ids)))
+    )
+    rows = []
+    for row, record in chunk:
+        if record.job_post_id in known:
+            rows.append((row, record))
+        else:
+            errors.append(
+                ImportRowError(
+                    row=row,
+                    errors=[f"job_post_id: job post {record.job_post_id} not found"],
+                )
+            )
+    if not rows:
+        return 0
+
+    try:
+        ids = (
+            await db.scalars(
+                insert(Candidate).returning(Candidate.id, sort_by_parameter_order=True),
+                [record.dict(exclude={"skills"}) for _, record in rows],
+            )
+        ).all()
+        skills = [
+            {"candidate_id": candidate_id, **skill.dict()}
+            for candidate_id, (_, record) in zip(ids, rows)
+            for skill in record.skills
+        ]
+        if skills:
+            await db.execute(insert(CandidateSkill), skills)
+        await db.commit()
+    except SQLAlchemyError as e:
+        await db.rollback()
+        logger.exception("Bulk import chunk of %d rows failed", len(rows))
+        detail = f"database error: {str(getattr(e, 'orig', e))[:200]}"
+        errors.extend(ImportRowError(row=row, errors=[detail]) for row, _ in rows)
+        return 0
+    return len(ids)
+
+
+@router.post("/import", response_model=CandidateImportResult)
+async def import_candidates(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Bulk-create candidates (with skills) from a JSON array, NDJSON or CSV body.
+
+    Rows are validated and inserted in chunks of BULK_IMPORT_CHUNK_SIZE, one
+    transaction per chunk; NDJSON and CSV bodies are consumed as they stream.
+    CSV uploads take a header row and an optional ``skills`` column formatted
+    as ``python:8;sql:6``. Invalid rows are skipped and reported by position.
+    """
+    errors: List[ImportRowError] = []
+    chunk: List[Tuple[int, CandidateImportRow]] = []
+    inserted = 0
+
+    async for row, record in iter_import_records(request):
+        try:
+            if isinstance(record, Exception):
+                raise record
+            chunk.append((row, CandidateImportRow.model_validate(record)))
+        except (ValidationError, ValueError) as e:
+            errors.append(ImportRowError(row=row, errors=_format_errors(e)))
+        if len(chunk) >= BULK_IMPORT_CHUNK_SIZE:
+            inserted += await _insert_chunk(db, chunk, errors)
+            chunk = []
+    if chunk:
+        inserted += await _insert_chunk(db, chunk, errors)
+
+    errors.sort(key=lambda e: e.row)
+    return CandidateImportResult(inserted=inserted, failed=len(errors), errors=errors)
+
+
 @router.get("/", response_model=List[CandidateOut])
-def list_candidates(
-    db: Session = Depends(get_db),
+async def list_candidates(
+    db: AsyncSession = Depends(get_read_db),
     skip: int = 0,
     limit: int = Query(10, le=100),
 ):
-    return db.query(Candidate).offset(skip).limit(limit).all()
+    stmt = (
+        select(*output_columns(CandidateOut, Candidate))
+        .order_by(Candidate.id)
+        .offset(skip)
+        .limit(limit)
+    )
+    return FastJSONResponse(await fetch_rows(db, stmt))
 
 
-@router.put("/{candidate_id}", response_model=CandidateOut)
-def update_candidate(
-    candidate_id: int, candidate: CandidateCreate, db: Session = Depends(get_db)
+@router.get("/page", response_model=Page[CandidateOut])
+async def list_candidates_page(
+    db: AsyncSession = Depends(get_read_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=100),
+):
+    """Newest-first keyset pagination; pass back ``next_cursor`` for the next page."""
+    items, next_cursor = await keyset_paginate_rows(
+        db, select(*output_columns(CandidateOut, Candidate)), Candidate, cursor, limit
+    )
+    return FastJSONResponse({"items": items, "next_cursor": next_cursor})
+
+
+def with_details(stmt):
+    """Eager-load skills (one extra IN query) and the job post (joined)."""
+    return stmt.options(selectinload(Candidate.skills), joinedload(Candidate.job_post))
+
+
+@router.get("/detailed", response_model=Page[CandidateDetailOut])
+async def list_candidates_detailed(
+    db: AsyncSession = Depends(get_read_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=100),
+):
+    """Keyset-paginated candidates with embedded skills and job-post summary."""
+    items, next_cursor = await keyset_paginate(
+        db, with_details(select(Candidate)), Candidate, cursor, limit
+    )
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.get("/search", response_model=CandidateSearchResult)
+async def search_candidates(
+    db: AsyncSession = Depends(get_read_db),
+    q: Optional[str] = Query(
+        None, description="Free text over name, location, remarks and skill names"
+    ),
+    skills: Optional[List[str]] = Query(None, description="Require all of these"),
+    visa_type: Optional[List[VisaType]] = Query(None),
+    min_experience: Optional[float] = None,
+    max_experience: Optional[float] = None,
+    min_rate: Optional[float] = None,
+    max_rate: Optional[float] = None,
+    willing_to_relocate: Optional[bool] = None,
+    job_post_id: Optional[int] = None,
+    facets: bool = Query(
+        False, description="Also count matches per visa type, experience and skill"
+    ),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100),
 ):
-    db_candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
+    """Filter candidates, ranked by text relevance when ``q`` is given.
+
+    ``skills`` match case-insensitively. Facet counts (visa type, relocation,
+    experience bucket, top skills) are computed over the full filtered set,
+    one GROUP BY each, so they are only returned with ``facets=true``.
+    """
+    conditions = build_filters(
+        skills=skills,
+        visa_types=visa_type,
+        min_experience=min_experience,
+        max_experience=max_experience,
+        min_rate=min_rate,
+        max_rate=max_rate,
+        willing_to_relocate=willing_to_relocate,
+        job_post_id=job_post_id,
+    )
+    rank = None
+    if q and q.strip():
+        text_match, rank = text_condition(db.get_bind().dialect.name, q.strip())
+        conditions.append(text_match)
+
+    stmt = select(Candidate).where(*conditions)
+    if rank is not None:
+        stmt = stmt.order_by(rank.desc(), Candidate.id.desc())
+    else:
+        stmt = stmt.order_by(Candidate.created_at.desc(), Candidate.id.desc())
+    items = (await db.scalars(stmt.offset(skip).limit(limit))).all()
+    total = await db.scalar(
+        select(func.count()).select_from(Candidate).where(*conditions)
+    )
+
+    return {
+        "total": total,
+        "items": items,
+        "facets": await facet_counts(db, conditions) if facets else {},
+    }
+
+
+@router.get("/export")
+async def export_candidates(
+    fmt: ExportFormat = Query("ndjson", alias="format"),
+    job_post_id: Optional[int] = None,
+    session_factory: async_sessionmaker = Depends(get_read_sessionmaker),
+):
+    """Stream all candidates with their skills as NDJSON or CSV.
+
+    The CSV ``skills`` column uses the ``python:8;sql:6`` form accepted by
+    ``/import``.
+    """
+    table_columns = [
+        c for c in Candidate.__table__.columns if c.name != "search_vector"
+    ]
+    columns = [c.name for c in table_columns]
+    stmt = select(*table_columns).order_by(Candidate.id)
+    if job_post_id is not None:
+        stmt = stmt.where(Candidate.job_post_id == job_post_id)
+
+    async def attach_skills(db: AsyncSession, records: List[dict]) -> None:
+        by_candidate = {record["id"]: [] for record in records}
+        rows = await db.execute(
+            select(
+                CandidateSkill.candidate_id,
+                CandidateSkill.skill_name,
+                CandidateSkill.score,
+            ).where(CandidateSkill.candidate_id.in_(by_candidate))
+        )
+        for candidate_id, skill_name, score in rows:
+            by_candidate[candidate_id].append(
+                {"skill_name": skill_name, "score": score}
+            )
+        for record in records:
+            skills = by_candidate[record["id"]]
+            if fmt == "csv":
+                skills = ";".join(f"{s['skill_name']}:{s['score']}" for s in skills)
+            record["skills"] = skills
+
+    return export_response(
+        stmt,
+        fmt,
+        columns + ["skills"],
+        "candidates",
+        on_batch=attach_skills,
+        session_factory=session_factory,
+    )
+
+
+@router.get("/{candidate_id}", response_model=CandidateDetailOut)
+async def get_candidate(candidate_id: int, db: AsyncSession = Depends(get_read_db)):
+    stmt = with_details(select(Candidate).where(Candidate.id == candidate_id))
+    db_candidate = await db.scalar(stmt)
     if not db_candidate:
-        from fastapi import HTTPException
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    return db_candidate
+
+
+@router.get("/{candidate_id}/jobs", response_model=CandidateJobsResult)
+async def match_jobs(
+    candidate_id: int,
+    k: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Rank job posts by how many of the candidate's skills they ask for."""
+    if await db.get(Candidate, candidate_id) is None:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    skills = {}
+    rows = await db.execute(
+        select(CandidateSkill.skill_name, CandidateSkill.score).where(
+            CandidateSkill.candidate_id == candidate_id
+        )
+    )
+    for skill_name, score in rows:
+        name = normalize_skill(skill_name or "")
+        if name:
+            skills[name] = max(skills.get(name, 0.0), float(score or 0))
+    ranked = await jobs_for_skills(db, skills, k)
+    return {
+        "candidate_id": candidate_id,
+        "matches": [
+            {"job_post": row, "score": score, "matched_skills": matched}
+            for row, score, matched in ranked
+        ],
+    }
+
 
+@router.put("/{candidate_id}", response_model=CandidateOut)
+async def update_candidate(
+    candidate_id: int,
+    candidate: CandidateCreate,
+    db: AsyncSession = Depends(get_async_db),
+):
+    db_candidate = await db.get(Candidate, candidate_id)
+    if not db_candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
 
     # Update fields
@@ -43,6 +346,6 @@ def update_candidate(
         setattr(db_candidate, key, value)
 
     db.add(db_candidate)
-    db.commit()
-    db.refresh(db_candidate)
+    await db.commit()
+    await db.refresh(db_candidate)
     return db_candidate
@@ -1,24 +1,56 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import get_async_db
+from app.core.replicas import get_read_db
 from app.models.candidateskill import CandidateSkill
 from app.schemas.candidateskill import CandidateSkillCreate, CandidateSkillOut
 
 router = APIRouter()
 
+# Hard cap on rows returned by a single listing request
+MAX_SKILLS_PAGE = 1000
+
 
 @router.post("/", response_model=CandidateSkillOut)
-def create_candidate_skill(skill: CandidateSkillCreate, db: Session = Depends(get_db)):
+async def create_candidate_skill(
+    skill: CandidateSkillCreate, db: AsyncSession = Depends(get_async_db)
+):
     db_skill = CandidateSkill(**skill.dict())
     db.add(db_skill)
-    db.commit()
-    db.refresh(db_skill)
+    await db.commit()
+    await db.refresh(db_skill)
     return db_skill
 
 
 @router.get("/", response_model=List[CandidateSkillOut])
-def list_candidate_skills(db: Session = Depends(get_db)):
-    return db.query(CandidateSkill).all()
+async def list_candidate_skills(
+    db: AsyncSession = Depends(get_read_db),
+    candidate_id: Optional[int] = None,
+    skill_name: Optional[str] = None,
+    min_score: Optional[int] = None,
+    after_id: Optional[int] = Query(
+        None, description="Return rows with id greater than this (keyset paging)"
+    ),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_SKILLS_PAGE),
+):
+    """List skills filtered by candidate, exact skill name and minimum score.
+
+    Filters map onto the candidate_id and (skill_name, score) indexes. For deep
+    paging pass the last id seen as ``after_id`` instead of growing ``skip``.
+    """
+    stmt = select(CandidateSkill)
+    if candidate_id is not None:
+        stmt = stmt.where(CandidateSkill.candidate_id == candidate_id)
+    if skill_name is not None:
+        stmt = stmt.where(CandidateSkill.skill_name == skill_name)
+    if min_score is not None:
+        stmt = stmt.where(CandidateSkill.score >= min_score)
+    if after_id is not None:
+        stmt = stmt.where(CandidateSkill.id > after_id)
+    stmt = stmt.order_by(CandidateSkill.id).offset(skip).limit(limit)
+    return (await db.scalars(stmt)).all()
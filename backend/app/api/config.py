@@ -1,46 +1,77 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.config_service import (
+    ConfigService,
+    config_service,
+    get_config_service,
+)
+from app.core.database import get_async_db
+from app.core.response_cache import cached, response_cache
 from app.models.config import Config
 from app.schemas.config import ConfigCreate, ConfigOut, ConfigUpdate
 
 router = APIRouter()
 
 
-@router.get("/", response_model=list[ConfigOut])
-def get_all_configs(db: Session = Depends(get_db)):
-    return db.query(Config).all()
+@router.get(
+    "/", response_model=list[ConfigOut], dependencies=[Depends(cached("config"))]
+)
+async def get_all_configs(db: AsyncSession = Depends(get_async_db)):
+    return (await db.scalars(select(Config))).all()
+
+
+@router.get("/value")
+async def get_config_value(
+    path: str, service: ConfigService = Depends(get_config_service)
+):
+    """Look up a value by path from this worker's in-memory snapshot."""
+    value = service.get(path)
+    if value is None:
+        raise HTTPException(status_code=404, detail="Config not found")
+    return {"path": path, "value": value}
 
 
 @router.delete("/{config_id}")
-def delete_config(config_id: int, db: Session = Depends(get_db)):
-    db_config = db.query(Config).filter(Config.config_id == config_id).first()
+async def delete_config(config_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_config = await db.get(Config, config_id)
     if not db_config:
         raise HTTPException(status_code=404, detail="Config not found")
-    db.delete(db_config)
-    db.commit()
+    await db.delete(db_config)
+    await config_service.notify_change(db, db_config.path)
+    await response_cache.bump(db, "config")
+    await db.commit()
+    config_service.invalidate()
     return {"detail": "Config deleted"}
 
 
 @router.post("/", response_model=ConfigOut)
-def create_config(config: ConfigCreate, db: Session = Depends(get_db)):
-    db_config = db.query(Config).filter(Config.path == config.path).first()
+async def create_config(config: ConfigCreate, db: AsyncSession = Depends(get_async_db)):
+    db_config = await db.scalar(select(Config).where(Config.path == config.path))
     if db_config:
         raise HTTPException(status_code=400, detail="Config path already exists")
     new_config = Config(path=config.path, value=config.value)
     db.add(new_config)
-    db.commit()
-    db.refresh(new_config)
+    await config_service.notify_change(db, new_config.path)
+    await response_cache.bump(db, "config")
+    await db.commit()
+    config_service.invalidate()
+    await db.refresh(new_config)
     return new_config
 
 
 @router.put("/{config_id}", response_model=ConfigOut)
-def update_config(config_id: int, config: ConfigUpdate, db: Session = Depends(get_db)):
-    db_config = db.query(Config).filter(Config.config_id == config_id).first()
+async def update_config(
+    config_id: int, config: ConfigUpdate, db: AsyncSession = Depends(get_async_db)
+):
+    db_config = await db.get(Config, config_id)
     if not db_config:
         raise HTTPException(status_code=404, detail="Config not found")
     db_config.value = config.value
-    db.commit()
-    db.refresh(db_config)
+    await config_service.notify_change(db, db_config.path)
+    await response_cache.bump(db, "config")
+    await db.commit()
+    config_service.invalidate()
+    await db.refresh(db_config)
     return db_config
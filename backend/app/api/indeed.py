@@ -1,24 +1,32 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 
-import requests
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.auth import get_current_user  # Assuming you have this dependency
-from app.schemas.candidate import Candidate as CandidateSchema
+from app.core.database import get_async_db
+from app.models.candidate import Candidate
+from app.models.indeed import IndeedApplication
+from app.models.jobpost import JobPost
+from app.utils.http_client import HttpClient, get_http_client
+from app.utils.indeed_ingest import IngestStats, job_ingestor, job_listing_cache
+from app.utils.logging_utils import setup_logger
 
-router = APIRouter()
+logger = setup_logger(__name__)
 
-INDEED_API_URL = "https://api.indeed.com/v2/employer/jobs"  # Example endpoint
-INDEED_API_KEY = "YOUR_INDEED_API_KEY"  # Replace with your actual key
+router = APIRouter()
 
 
 class IndeedCandidateOut(BaseModel):
-    candidate_id: str
-    name: str
+    candidate_id: str | None = None
+    # Id of the row in candidates this applicant was ingested into
+    local_id: int
+    name: str | None = None
     email: str
     resume_url: str | None = None
-    applied_at: str | None = None
+    applied_at: datetime | None = None
 
 
 class JobPostOut(BaseModel):
@@ -29,36 +37,105 @@ class JobPostOut(BaseModel):
     posted_at: str
 
 
-@router.get("/indeed/jobs/{job_id}/candidates", response_model=List[IndeedCandidateOut])
-def get_candidates_for_job(job_id: str, user=Depends(get_current_user)):
-    INDEED_CANDIDATES_API_URL = f"https://api.indeed.com/v2/jobs/{job_id}/candidates"
-    headers = {"Authorization": f"Bearer {INDEED_API_KEY}"}
-    response = requests.get(INDEED_CANDIDATES_API_URL, headers=headers)
-    if response.status_code != 200:
+class IndeedIngestResult(BaseModel):
+    pages: int
+    pages_unchanged: int
+    fetched: int
+    inserted: int
+    updated: int
+    skipped: int
+    errors: List[str]
+
+
+async def _check_job_post(db: AsyncSession, job_post_id: Optional[int]) -> None:
+    if job_post_id is not None and await db.get(JobPost, job_post_id) is None:
+        raise HTTPException(status_code=404, detail="Job post not found")
+
+
+async def _ingest(
+    db: AsyncSession,
+    http: HttpClient,
+    job_id: str,
+    job_post_id: Optional[int],
+    force: bool,
+) -> Optional[IngestStats]:
+    try:
+        return await job_ingestor.ensure_fresh(
+            db, http, job_id, job_post_id=job_post_id, force=force
+        )
+    except Exception as e:
+        await db.rollback()
+        logger.error("Indeed ingestion failed for job %s: %s", job_id, e)
         raise HTTPException(
             status_code=502, detail="Failed to fetch candidates from Indeed"
         )
-    candidates = response.json().get("candidates", [])
+
+
+@router.post("/indeed/jobs/{job_id}/ingest", response_model=IndeedIngestResult)
+async def ingest_candidates_for_job(
+    job_id: str,
+    job_post_id: Optional[int] = Query(
+        None, description="Local job post to attach newly ingested candidates to"
+    ),
+    db: AsyncSession = Depends(get_async_db),
+    http: HttpClient = Depends(get_http_client),
+):
+    """Pull all applicants of an Indeed job into candidates now.
+
+    Unchanged pages are skipped via ETags; applicants are upserted by email.
+    """
+    await _check_job_post(db, job_post_id)
+    stats = await _ingest(db, http, job_id, job_post_id, force=True)
+    return IndeedIngestResult(**vars(stats))
+
+
+@router.get("/indeed/jobs/{job_id}/candidates", response_model=List[IndeedCandidateOut])
+async def get_candidates_for_job(
+    job_id: str,
+    job_post_id: Optional[int] = Query(
+        None, description="Local job post to attach newly ingested candidates to"
+    ),
+    refresh: bool = Query(False, description="Re-check Indeed even if fresh"),
+    db: AsyncSession = Depends(get_async_db),
+    http: HttpClient = Depends(get_http_client),
+):
+    """Applicants of an Indeed job, served from the ingested candidates.
+
+    Indeed is only contacted when the job has not been checked within
+    INDEED_CANDIDATES_TTL_SECONDS (or ``refresh`` is set).
+    """
+    await _check_job_post(db, job_post_id)
+    await _ingest(db, http, job_id, job_post_id, force=refresh)
+    rows = await db.execute(
+        select(IndeedApplication, Candidate)
+        .join(Candidate, Candidate.id == IndeedApplication.candidate_id)
+        .where(IndeedApplication.job_id == job_id)
+        .order_by(IndeedApplication.applied_at.desc(), IndeedApplication.id)
+    )
     return [
         IndeedCandidateOut(
-            candidate_id=c.get("id"),
-            name=c.get("name"),
-            email=c.get("email"),
-            resume_url=c.get("resume_url"),
-            applied_at=c.get("applied_at"),
+            candidate_id=application.external_id,
+            local_id=candidate.id,
+            name=candidate.name,
+            email=candidate.email,
+            resume_url=candidate.cv_file_url,
+            applied_at=application.applied_at,
         )
-        for c in candidates
+        for application, candidate in rows
     ]
 
 
 @router.get("/indeed/jobs/{employer_id}", response_model=List[JobPostOut])
-def get_indeed_jobs(employer_id: str, user=Depends(get_current_user)):
-    headers = {"Authorization": f"Bearer {INDEED_API_KEY}"}
-    params = {"employer_id": employer_id}
-    response = requests.get(INDEED_API_URL, headers=headers, params=params)
-    if response.status_code != 200:
+async def get_indeed_jobs(
+    employer_id: str,
+    http: HttpClient = Depends(get_http_client),
+):
+    """Employer job listings, cached per worker for INDEED_JOBS_CACHE_TTL_SECONDS."""
+    try:
+        jobs = await job_listing_cache.get(http, employer_id)
+    except Exception as e:
+        logger.error("Indeed job listing failed for employer %s: %s", employer_id, e)
         raise HTTPException(status_code=502, detail="Failed to fetch jobs from Indeed")
-    jobs = response.json().get("jobs", [])
     return [
         JobPostOut(
             job_id=job.get("id"),
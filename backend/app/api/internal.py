@@ -0,0 +1,40 @@
+from fastapi import APIRouter
+
+from app.core.database import get_pools
+from app.core.pool_metrics import all_snapshots
+from app.core.replicas import replica_router
+from app.core.response_cache import response_cache
+from app.core.security import password_hasher
+from app.utils.logging_utils import log_queue_stats
+
+router = APIRouter()
+
+
+@router.get("/db/pool")
+async def get_pool_stats():
+    """Live connection pool usage and checkout latency for this worker."""
+    return {"pools": all_snapshots(get_pools())}
+
+
+@router.get("/db/replicas")
+async def get_replica_stats():
+    """Replica health and how this worker's read-only requests were routed."""
+    return replica_router.stats()
+
+
+@router.get("/logging")
+async def get_logging_stats():
+    """Log queue depth and dropped-record counters for this worker."""
+    return log_queue_stats()
+
+
+@router.get("/password-hashing")
+async def get_password_hashing_stats():
+    """Password hashing pool size, queued callers and rejections for this worker."""
+    return password_hasher.stats()
+
+
+@router.get("/response-cache")
+async def get_response_cache_stats():
+    """Table versions seen by this worker and its response body cache counters."""
+    return response_cache.stats()
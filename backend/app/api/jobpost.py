@@ -1,45 +1,160 @@
-from typing import List
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.core.database import get_db
+from app.core.database import get_async_db
+from app.core.replicas import get_read_db, get_read_sessionmaker
+from app.core.response_cache import cached, response_cache
+from app.models.candidate import Candidate
 from app.models.jobpost import JobPost
+from app.schemas.candidate import JobMatchResult
 from app.schemas.jobpost import JobPostCreate, JobPostOut
+from app.schemas.pagination import Page
+from app.utils.export import ExportFormat, export_response
+from app.utils.fast_json import FastJSONResponse, fetch_rows, output_columns
+from app.utils.job_search import build_job_filters, job_skill_terms
+from app.utils.matching import rank_candidates
+from app.utils.pagination import keyset_paginate_rows
 
 router = APIRouter()
 
+REQUIRES_HELP = "Skill terms that must all appear in the required qualifications"
+MENTIONS_HELP = "Skill terms that must all appear in required or preferred ones"
+
 
 @router.post("/", response_model=JobPostOut)
-def create_job_post(job_post: JobPostCreate, db: Session = Depends(get_db)):
+async def create_job_post(
+    job_post: JobPostCreate, db: AsyncSession = Depends(get_async_db)
+):
     db_job_post = JobPost(**job_post.dict())
+    db_job_post.skill_terms = job_skill_terms(
+        job_post.required_qualifications, job_post.preferred_qualifications
+    )
     db.add(db_job_post)
-    db.commit()
-    db.refresh(db_job_post)
+    await response_cache.bump(db, "job_posts")
+    await db.commit()
+    await db.refresh(db_job_post)
     return db_job_post
 
 
-@router.get("/", response_model=List[JobPostOut])
-def list_job_posts(
-    db: Session = Depends(get_db),
+@router.get(
+    "/",
+    response_model=List[JobPostOut],
+    dependencies=[Depends(cached("job_posts"))],
+)
+async def list_job_posts(
+    db: AsyncSession = Depends(get_async_db),
     skip: int = 0,
     limit: int = Query(10, le=100),
+    requires: Optional[List[str]] = Query(None, description=REQUIRES_HELP),
+    mentions: Optional[List[str]] = Query(None, description=MENTIONS_HELP),
+):
+    stmt = (
+        select(*output_columns(JobPostOut, JobPost))
+        .where(
+            *build_job_filters(
+                db.get_bind().dialect.name, requires=requires, mentions=mentions
+            )
+        )
+        .order_by(JobPost.id)
+        .offset(skip)
+        .limit(limit)
+    )
+    return FastJSONResponse(await fetch_rows(db, stmt))
+
+
+@router.get(
+    "/page",
+    response_model=Page[JobPostOut],
+    dependencies=[Depends(cached("job_posts"))],
+)
+async def list_job_posts_page(
+    db: AsyncSession = Depends(get_async_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=100),
+    requires: Optional[List[str]] = Query(None, description=REQUIRES_HELP),
+    mentions: Optional[List[str]] = Query(None, description=MENTIONS_HELP),
+):
+    """Newest-first keyset pagination; pass back ``next_cursor`` for the next page."""
+    stmt = select(*output_columns(JobPostOut, JobPost)).where(
+        *build_job_filters(
+            db.get_bind().dialect.name, requires=requires, mentions=mentions
+        )
+    )
+    items, next_cursor = await keyset_paginate_rows(db, stmt, JobPost, cursor, limit)
+    return FastJSONResponse({"items": items, "next_cursor": next_cursor})
+
+
+@router.get("/export")
+async def export_job_posts(
+    fmt: ExportFormat = Query("ndjson", alias="format"),
+    session_factory: async_sessionmaker = Depends(get_read_sessionmaker),
+):
+    """Stream all job posts as NDJSON or CSV (JSON fields are JSON-encoded in CSV)."""
+    # skill_terms is derived from the qualifications; not part of the export
+    exported = [c for c in JobPost.__table__.columns if c.name != "skill_terms"]
+    stmt = select(*exported).order_by(JobPost.id)
+    return export_response(
+        stmt,
+        fmt,
+        [c.name for c in exported],
+        "job_posts",
+        session_factory=session_factory,
+    )
+
+
+@router.get("/{jobpost_id}/matches", response_model=JobMatchResult)
+async def match_candidates(
+    jobpost_id: int,
+    k: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    return db.query(JobPost).offset(skip).limit(limit).all()
+    """Rank all candidates against the job's required and preferred skills."""
+    db_job_post = await db.get(JobPost, jobpost_id)
+    if not db_job_post:
+        raise HTTPException(status_code=404, detail="Job post not found")
+
+    ranked, job_skills = await rank_candidates(
+        db_job_post.required_qualifications,
+        db_job_post.preferred_qualifications,
+        k,
+    )
+    ids = [candidate_id for candidate_id, _, _ in ranked]
+    candidates = {
+        c.id: c
+        for c in await db.scalars(select(Candidate).where(Candidate.id.in_(ids)))
+    }
+    return {
+        "job_post_id": jobpost_id,
+        "skills": job_skills,
+        "matches": [
+            {"candidate": candidates[cid], "score": score, "matched_skills": skills}
+            for cid, score, skills in ranked
+            if cid in candidates
+        ],
+    }
 
 
 @router.put("/{jobpost_id}", response_model=JobPostOut)
-def update_job_post(
-    jobpost_id: int, job_post: JobPostCreate, db: Session = Depends(get_db)
+async def update_job_post(
+    jobpost_id: int,
+    job_post: JobPostCreate,
+    db: AsyncSession = Depends(get_async_db),
 ):
-    db_job_post = db.query(JobPost).filter(JobPost.id == jobpost_id).first()
+    db_job_post = await db.get(JobPost, jobpost_id)
     if not db_job_post:
         raise HTTPException(status_code=404, detail="Job post not found")
 
     for key, value in job_post.dict().items():
         setattr(db_job_post, key, value)
+    db_job_post.skill_terms = job_skill_terms(
+        job_post.required_qualifications, job_post.preferred_qualifications
+    )
 
     db.add(db_job_post)
-    db.commit()
-    db.refresh(db_job_post)
+    await response_cache.bump(db, "job_posts")
+    await db.commit()
+    await db.refresh(db_job_post)
     return db_job_post
@@ -1,10 +1,13 @@
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.auth import get_current_user
+from app.api.auth import get_current_claims
+from app.core.database import get_async_db
 from app.utils.logging_utils import setup_logger
-from app.utils.outlook_client import get_outlook_client
+from app.utils.mail_sync import mailbox_sync, search_messages
+from app.utils.outlook_client import resolve_mailbox
 
 logger = setup_logger(__name__)
 
@@ -16,7 +19,7 @@ class OutlookMessageOut(dict):
 
 
 @router.get("/outlook/messages", response_model=List[dict])
-def get_outlook_messages(
+async def get_outlook_messages(
     subject: Optional[str] = Query(
         None, description="Filter messages where subject contains this string"
     ),
@@ -27,21 +30,24 @@ def get_outlook_messages(
         None, description="Mailbox userPrincipalName or id to query"
     ),
     top: int = Query(10, ge=1, le=50),
-    user=Depends(get_current_user),
+    refresh: bool = Query(
+        False, description="Pull changes from Graph before answering"
+    ),
+    db: AsyncSession = Depends(get_async_db),
+    user=Depends(get_current_claims),
 ):
-    """Return recent messages from an Outlook mailbox using Microsoft Graph (app-only).
+    """Return recent messages from an Outlook mailbox Inbox.
 
-    Requires AZURE_* settings configured in the backend environment. For app-only tokens
-    the mailbox param must be a valid userPrincipalName or id that the app has access to.
+    Messages are served from the local mirror kept current by the background
+    Graph delta sync (see app.utils.mail_sync). The first request for a
+    mailbox that has never been synced, or one with ``refresh=true``, runs a
+    sync round inline. Only AZURE_MAILBOX and the mailboxes listed in
+    MAIL_SYNC_MAILBOXES are served. Requires AZURE_* settings configured in
+    the backend environment; for app-only tokens the mailbox must be a valid
+    userPrincipalName or id that the app has access to.
     """
-    client = get_outlook_client()
     try:
-        messages = client.get_recent_messages(
-            mailbox=mailbox,
-            top=top,
-            subject_contains=subject,
-            from_address=from_address,
-        )
+        mailbox = resolve_mailbox(mailbox)
     except ValueError as ve:
         logger.error(
             "Invalid request parameters: %s, params: mailbox=%s subject=%s from=%s",
@@ -51,33 +57,50 @@ def get_outlook_messages(
             from_address,
         )
         raise HTTPException(status_code=400, detail=str(ve))
-    except Exception as e:
-        logger.error(
-            "Failed to fetch messages: %s, params: mailbox=%s subject=%s from=%s",
-            str(e),
-            mailbox,
-            subject,
-            from_address,
+    if not mailbox_sync.allowed(mailbox):
+        raise HTTPException(
+            status_code=403,
+            detail="Mailbox is not enabled; add it to MAIL_SYNC_MAILBOXES",
         )
-        raise HTTPException(status_code=502, detail=f"Failed to fetch messages: {e}")
 
+    if refresh or not await mailbox_sync.is_synced(db, mailbox):
+        try:
+            await mailbox_sync.sync(mailbox, wait=True)
+        except Exception as e:
+            logger.error(
+                "Failed to sync messages: %s, params: mailbox=%s subject=%s from=%s",
+                str(e),
+                mailbox,
+                subject,
+                from_address,
+            )
+            raise HTTPException(
+                status_code=502, detail=f"Failed to fetch messages: {e}"
+            )
+
+    messages = await search_messages(
+        db,
+        mailbox,
+        top,
+        subject_contains=subject,
+        from_address=from_address,
+    )
     logger.info(
-        "Successfully fetched %d messages for mailbox=%s subject=%s from=%s",
+        "Served %d messages for mailbox=%s subject=%s from=%s",
         len(messages),
         mailbox,
         subject,
         from_address,
     )
-    # Return relevant fields only
-    out = []
-    for m in messages:
-        out.append(
-            {
-                "id": m.get("id"),
-                "subject": m.get("subject"),
-                "from": m.get("from", {}).get("emailAddress", {}),
-                "receivedDateTime": m.get("receivedDateTime"),
-                "bodyPreview": m.get("bodyPreview"),
-            }
-        )
-    return out
+    return [
+        {
+            "id": m.message_id,
+            "subject": m.subject,
+            "from": {"name": m.from_name, "address": m.from_address},
+            "receivedDateTime": (
+                m.received_at.strftime("%Y-%m-%dT%H:%M:%SZ") if m.received_at else None
+            ),
+            "bodyPreview": m.body_preview,
+        }
+        for m in messages
+    ]
@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_async_db
+from app.core.response_cache import cached
+from app.schemas.stats import DashboardStatsOut
+from app.utils.dashboard_stats import STATS_TABLE, dashboard_summary
+
+router = APIRouter()
+
+
+@router.get(
+    "/dashboard",
+    response_model=DashboardStatsOut,
+    dependencies=[Depends(cached(STATS_TABLE))],
+)
+async def get_dashboard_stats(
+    db: AsyncSession = Depends(get_async_db),
+    days: int = Query(30, ge=1, le=365),
+    job_posts: int = Query(20, ge=1, le=100),
+    skills: int = Query(20, ge=1, le=100),
+):
+    """Dashboard widgets from precomputed aggregates (see ``refreshed_at``)."""
+    return await dashboard_summary(
+        db, days=days, top_job_posts=job_posts, top_skills=skills
+    )
@@ -1,32 +1,44 @@
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
-from app.core.security import get_password_hash
+from app.api.auth import hashing_busy
+from app.core.database import get_async_db
+from app.core.response_cache import cached, response_cache
+from app.core.security import PasswordHashingBusy, get_password_hash_async
+from app.core.user_cache import user_cache
 from app.models.user import User
 from app.schemas.user import UserBase, UserOut
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[UserOut])
-def list_users(db: Session = Depends(get_db)):
-    return db.query(User).all()
+@router.get("/", response_model=List[UserOut], dependencies=[Depends(cached("users"))])
+async def list_users(db: AsyncSession = Depends(get_async_db)):
+    return (await db.scalars(select(User))).all()
 
 
 # Update user endpoint (partial update)
 @router.put("/{user_id}", response_model=UserOut)
-def update_user(user_id: str, user_in: UserBase, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.id == user_id).first()
+async def update_user(
+    user_id: int, user_in: UserBase, db: AsyncSession = Depends(get_async_db)
+):
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    user.hashed_password = (get_password_hash(user_in.password),)
+    if user_in.password:
+        try:
+            user.hashed_password = await get_password_hash_async(user_in.password)
+        except PasswordHashingBusy:
+            raise hashing_busy()
     user.email = user_in.email
     user.name = user_in.name
     user.role = user_in.role
     user.is_active = user_in.is_active
-    db.commit()
-    db.refresh(user)
+    await response_cache.bump(db, "users")
+    await db.commit()
+    user_cache.invalidate(user.id)
+    await db.refresh(user)
     return user
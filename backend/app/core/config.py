@@ -24,6 +24,15 @@ def parse_cors(v: Any) -> list[str] | str:
     raise ValueError(v)
 
 
+def parse_list(v: Any) -> list[str] | str:
+    """Parse a comma-separated environment variable into a list."""
+    if isinstance(v, str) and not v.startswith("["):
+        return [i.strip() for i in v.split(",") if i.strip()]
+    elif isinstance(v, list) or isinstance(v, str):
+        return v
+    raise ValueError(v)
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -50,8 +59,66 @@ class Settings(BaseSettings):
         ]
 
     JWT_ALGORITHM: str = "HS256"
+    # Seconds a verified user snapshot (role, is_active) is reused by
+    # get_current_claims before it is re-read from the database. 0 disables.
+    AUTH_USER_CACHE_TTL_SECONDS: int = 30
+    # When True, token claims are trusted on a cache miss and the database is
+    # never consulted by get_current_claims (fully stateless).
+    AUTH_TRUST_TOKEN_CLAIMS: bool = False
+
+    # argon2id cost for new password hashes; existing hashes are upgraded on
+    # the next successful login after these change
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536  # KiB
+    ARGON2_PARALLELISM: int = 4
+    # Dedicated password hashing pool: threads, callers allowed to queue, and
+    # seconds a caller waits for a slot before the request is refused (503)
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_WAITING: int = 64
+    PASSWORD_HASH_QUEUE_TIMEOUT: float = 5
 
     DB_URL: str = Field(env="DB_URL")
+    # Optional explicit URL for the asyncio engine; derived from DB_URL
+    # (e.g. postgresql:// -> postgresql+asyncpg://) when unset.
+    ASYNC_DB_URL: str | None = None
+    # Connection pool sizing, applied per engine in every worker process
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    # Connections all workers together may open to one database server; 0
+    # means no cap. When set, each pool is shrunk to fit its worker's share
+    # (see pool_limits in app.core.database).
+    DB_MAX_CONNECTIONS: int = 0
+    # Worker processes sharing DB_MAX_CONNECTIONS; gunicorn.conf.py exports
+    # its worker count here
+    WEB_CONCURRENCY: int = 1
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    # "always" pings on every checkout, "idle" only after the connection sat
+    # unused for DB_POOL_PRE_PING_IDLE_SECONDS, "never" disables pinging.
+    DB_POOL_PRE_PING: Literal["always", "idle", "never"] = "always"
+    DB_POOL_PRE_PING_IDLE_SECONDS: float = 30
+    # Optional read replicas, comma-separated in the same form as DB_URL.
+    # Read-only list, search and export endpoints are spread across the
+    # healthy ones; everything else (and everything when unset) uses DB_URL.
+    DB_REPLICA_URLS: Annotated[list[str] | str, BeforeValidator(parse_list)] = []
+    # Seconds between replica health checks, and how long one check may take
+    DB_REPLICA_CHECK_SECONDS: float = 5
+    DB_REPLICA_CHECK_TIMEOUT: float = 2
+    # After a write, reads by the same user (and browser) go to the primary
+    # for this many seconds; keep it above the replicas' usual lag
+    DB_READ_YOUR_WRITES_SECONDS: float = 5
+    # Response cache for GET endpoints declared with cached(...) (see
+    # app.core.response_cache): serialised bodies kept per worker, keyed by
+    # ETag; 0 keeps only ETags
+    RESPONSE_CACHE_MAX_ENTRIES: int = 256
+    # Mixed into every ETag so a deploy invalidates the ETags (and bodies)
+    # clients hold from the previous build. Unset, a digest of the app's
+    # source is used, which changes with any code change.
+    APP_BUILD_ID: str | None = None
+    # Fraction of successful requests written to the JSON access log; errors
+    # and requests slower than ACCESS_LOG_SLOW_MS are always written
+    ACCESS_LOG_SAMPLE_RATE: float = 1.0
+    ACCESS_LOG_SLOW_MS: float = 1000
     # Microsoft Graph / Azure AD configuration (optional)
     AZURE_TENANT_ID: str | None = None
     AZURE_CLIENT_ID: str | None = None
@@ -60,6 +127,37 @@ class Settings(BaseSettings):
     # should provide the mailbox; otherwise the app client id is sometimes used
     # as a fallback but it's recommended to set an actual mailbox/email.
     AZURE_MAILBOX: str | None = None
+    # Endpoints are overridable so integrations can run against a stub server
+    AZURE_LOGIN_BASE: str = "https://login.microsoftonline.com"
+    GRAPH_API_BASE: str = "https://graph.microsoft.com/v1.0"
+    # Further mailboxes to mirror besides AZURE_MAILBOX, comma-separated. Only
+    # these can be read through the mail API.
+    MAIL_SYNC_MAILBOXES: Annotated[list[str] | str, BeforeValidator(parse_list)] = []
+    # Background Inbox mirror (Graph delta queries); 0 disables the loop
+    MAIL_SYNC_INTERVAL_SECONDS: float = 60
+    # Initial sync only fetches messages received within this many days (0 = all)
+    MAIL_SYNC_LOOKBACK_DAYS: int = 90
+
+    # Dashboard aggregates are recomputed when older than this; 0 disables
+    # the refresh loop
+    DASHBOARD_STATS_REFRESH_SECONDS: float = 60
+
+    # Indeed employer API
+    INDEED_API_BASE: str = "https://api.indeed.com/v2"
+    INDEED_API_KEY: str | None = None
+    # Applicants requested per page and pages fetched concurrently per job
+    INDEED_PAGE_SIZE: int = 100
+    INDEED_MAX_CONCURRENCY: int = 4
+    # Seconds ingested applicants / cached employer job listings stay fresh
+    INDEED_CANDIDATES_TTL_SECONDS: int = 300
+    INDEED_JOBS_CACHE_TTL_SECONDS: int = 300
+
+    # Outbound HTTP (shared client used by the Graph and Indeed integrations)
+    HTTP_CONNECT_TIMEOUT: float = 5
+    HTTP_READ_TIMEOUT: float = 30
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 20
+    HTTP_RETRIES: int = 3
 
 
 settings = Settings()
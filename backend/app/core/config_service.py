@@ -0,0 +1,204 @@
+"""In-process snapshot of the ``config`` table.
+
+Every worker keeps the whole key/value table in memory and serves lookups by
+path from a dict. The snapshot is replaced (never mutated) on refresh, so
+readers need no locking.
+
+Changes made through the config API send ``NOTIFY config_changed`` inside the
+writing transaction; each worker holds one dedicated LISTEN connection
+(outside the pool) and reloads as soon as the notification arrives. As a
+fallback (non-Postgres databases, lost listener connection, writes made
+outside the API) a cheap fingerprint query (row count + latest updated_at)
+is polled and triggers a reload when it changes: every CONFIG_POLL_SECONDS
+without a listener, every CONFIG_POLL_SECONDS_LISTENING with one. A change
+whose notification is lost (e.g. on a half-open listener connection that
+still looks alive) therefore reaches every worker within
+CONFIG_POLL_SECONDS_LISTENING seconds at worst.
+"""
+
+import json
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+import asyncio
+from sqlalchemy import func, select, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, async_engine
+from app.models.config import Config
+from app.utils.logging_utils import setup_logger
+
+logger = setup_logger(__name__)
+
+T = TypeVar("T")
+
+NOTIFY_CHANNEL = "config_changed"
+# Fingerprint poll interval without / with a working LISTEN connection
+CONFIG_POLL_SECONDS = 1.0
+CONFIG_POLL_SECONDS_LISTENING = 5.0
+# Give up on connecting the LISTEN connection (and poll) after this long
+CONFIG_LISTEN_CONNECT_TIMEOUT = 5.0
+
+_TRUE = {"1", "true", "yes", "on"}
+_FALSE = {"0", "false", "no", "off"}
+
+
+def parse_bool(value: str) -> bool:
+    lowered = value.strip().lower()
+    if lowered in _TRUE:
+        return True
+    if lowered in _FALSE:
+        return False
+    raise ValueError(f"Not a boolean: {value!r}")
+
+
+class ConfigService:
+    def __init__(self):
+        self._values: Dict[str, str] = {}
+        self._fingerprint: Optional[Tuple[Any, Any]] = None
+        self._changed = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._listener = None
+        self.loaded = False
+
+    # -- lookups -----------------------------------------------------------
+
+    def get(self, path: str, default: Optional[str] = None) -> Optional[str]:
+        return self._values.get(path, default)
+
+    def get_typed(self, path: str, cast: Callable[[str], T], default: T) -> T:
+        """Return ``cast(value)`` or ``default`` if missing or unparsable."""
+        raw = self._values.get(path)
+        if raw is None:
+            return default
+        try:
+            return cast(raw)
+        except (TypeError, ValueError):
+            logger.warning("Config %s=%r is not a valid %s", path, raw, cast.__name__)
+            return default
+
+    def get_int(self, path: str, default: int = 0) -> int:
+        return self.get_typed(path, int, default)
+
+    def get_float(self, path: str, default: float = 0.0) -> float:
+        return self.get_typed(path, float, default)
+
+    def get_bool(self, path: str, default: bool = False) -> bool:
+        return self.get_typed(path, parse_bool, default)
+
+    def get_json(self, path: str, default: Any = None) -> Any:
+        return self.get_typed(path, json.loads, default)
+
+    def snapshot(self) -> Dict[str, str]:
+        return dict(self._values)
+
+    # -- loading -----------------------------------------------------------
+
+    async def _read_fingerprint(self, db: AsyncSession) -> Tuple[Any, Any]:
+        row = (
+            await db.execute(select(func.count(), func.max(Config.updated_at)))
+        ).one()
+        return tuple(row)
+
+    async def reload(self) -> None:
+        async with AsyncSessionLocal() as db:
+            fingerprint = await self._read_fingerprint(db)
+            rows = await db.execute(select(Config.path, Config.value))
+            self._values = {path: value for path, value in rows}
+            self._fingerprint = fingerprint
+            self.loaded = True
+
+    async def refresh_if_changed(self) -> bool:
+        async with AsyncSessionLocal() as db:
+            fingerprint = await self._read_fingerprint(db)
+        if fingerprint == self._fingerprint:
+            return False
+        await self.reload()
+        return True
+
+    # -- change propagation ------------------------------------------------
+
+    async def notify_change(self, db: AsyncSession, path: str) -> None:
+        """Queue a NOTIFY in ``db``'s transaction (delivered on commit)."""
+        if db.get_bind().dialect.name == "postgresql":
+            await db.execute(
+                text("SELECT pg_notify(:channel, :path)"),
+                {"channel": NOTIFY_CHANNEL, "path": path},
+            )
+
+    def invalidate(self) -> None:
+        """Reload this worker's snapshot on the next loop iteration."""
+        self._changed.set()
+
+    async def _ensure_listener(self) -> None:
+        if async_engine.dialect.name != "postgresql":
+            return
+        if self._listener is not None and not self._listener.is_closed():
+            return
+        import asyncpg
+
+        dsn = (
+            make_url(settings.ASYNC_DB_URL or settings.DB_URL)
+            .set(drivername="postgresql")
+            .render_as_string(hide_password=False)
+        )
+        try:
+            self._listener = await asyncio.wait_for(
+                asyncpg.connect(dsn), CONFIG_LISTEN_CONNECT_TIMEOUT
+            )
+            await self._listener.add_listener(
+                NOTIFY_CHANNEL, lambda *args: self._changed.set()
+            )
+            # Anything missed while disconnected is picked up by this reload
+            self._changed.set()
+        except Exception:
+            logger.exception("Config LISTEN connection failed; polling instead")
+            self._listener = None
+
+    async def _run(self) -> None:
+        while True:
+            await self._ensure_listener()
+            listening = self._listener is not None
+            interval = (
+                CONFIG_POLL_SECONDS_LISTENING if listening else CONFIG_POLL_SECONDS
+            )
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+            notified = self._changed.is_set()
+            self._changed.clear()
+            try:
+                if notified:
+                    await self.reload()
+                else:
+                    await self.refresh_if_changed()
+            except Exception:
+                logger.exception("Config refresh failed")
+
+    async def start(self) -> None:
+        try:
+            await self.reload()
+        except Exception:
+            logger.exception("Initial config load failed")
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._listener is not None:
+            await self._listener.close()
+            self._listener = None
+
+
+config_service = ConfigService()
+
+
+def get_config_service() -> ConfigService:
+    return config_service
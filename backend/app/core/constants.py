@@ -11,9 +11,31 @@ ALLOWED_HEADERS = [
     "Origin",
     "Access-Control-Request-Method",
     "Access-Control-Request-Headers",
+    "X-Request-ID",
 ]
 
+EXPOSED_HEADERS = ["X-Request-ID"]
+
+# Rows validated and inserted per transaction by the bulk import endpoint
+BULK_IMPORT_CHUNK_SIZE = 1000
+# Physical lines one CSV record may span before an open quote is reported as
+# unterminated and parsing resumes on the record's second line
+BULK_IMPORT_MAX_RECORD_LINES = 1000
+# Rows fetched per server-side cursor round trip by the export endpoints
+EXPORT_BATCH_SIZE = 1000
+
 LOG_TO_FILE = True
 LOG_LEVEL = "INFO"
 LOG_FILE_NAME = "system.log"
 ERROR_LOG_FILE_NAME = "errors.log"
+# Bounded in-memory queue between loggers and the writer thread
+LOG_QUEUE_SIZE = 10_000
+# Extra slots only WARNING and above may use, so a flood of INFO records
+# cannot crowd out the errors that explain it
+LOG_QUEUE_RESERVED = 256
+# "drop" discards a record that finds the queue full; "block" waits up to
+# LOG_QUEUE_BLOCK_SECONDS for room first
+LOG_QUEUE_POLICY = "drop"
+LOG_QUEUE_BLOCK_SECONDS = 0.1
+# Records written per batch before the streams are flushed
+LOG_BATCH_SIZE = 256
@@ -1,13 +1,154 @@
+from typing import Tuple
+
+import orjson
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from app.core.config import settings
+from app.core.pool_metrics import install_idle_pre_ping, instrumented_pool_class
+
+# Async drivers used when ASYNC_DB_URL is not set explicitly
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Swap the sync driver in ``url`` for its asyncio counterpart."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database '{backend}'")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(
+        hide_password=False
+    )
+
+
+# Connections a worker holds outside its pools: the config LISTEN connection
+CONNECTIONS_OUTSIDE_POOLS = 1
+# Pools a worker keeps on the primary (sync and async engine)
+PRIMARY_POOLS = 2
+
+
+def pool_limits() -> Tuple[int, int]:
+    """``(pool_size, max_overflow)`` for each of this worker's pools.
+
+    Without DB_MAX_CONNECTIONS this is DB_POOL_SIZE and DB_MAX_OVERFLOW. With
+    it, each of the WEB_CONCURRENCY workers gets an equal share, and the
+    primary, which holds the most per worker, has to fit in it:
+
+        per_pool = (DB_MAX_CONNECTIONS // WEB_CONCURRENCY - 1) // 2
+
+    Overflow is cut first, then the pool size. Each replica pool is on a
+    server of its own and uses the same sizes, so it fits as well.
+    """
+    size, overflow = settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW
+    if settings.DB_MAX_CONNECTIONS <= 0:
+        return size, overflow
+    share = settings.DB_MAX_CONNECTIONS // max(settings.WEB_CONCURRENCY, 1)
+    per_pool = (share - CONNECTIONS_OUTSIDE_POOLS) // PRIMARY_POOLS
+    if per_pool < 1:
+        raise ValueError(
+            f"DB_MAX_CONNECTIONS={settings.DB_MAX_CONNECTIONS} is too small for "
+            f"{settings.WEB_CONCURRENCY} workers; each needs at least "
+            f"{PRIMARY_POOLS + CONNECTIONS_OUTSIDE_POOLS} connections"
+        )
+    size = min(size, per_pool)
+    return size, min(overflow, per_pool - size)
+
+
+def engine_options() -> dict:
+    """Keyword arguments shared by every engine: pool sizing, pre-ping and
+    JSON decoding."""
+    pool_size, max_overflow = pool_limits()
+    return {
+        # JSON columns are decoded on every row read; orjson is several
+        # times faster than the stdlib default
+        "json_deserializer": orjson.loads,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING == "always",
+    }
+
+
+def configure_engine(engine):
+    if settings.DB_POOL_PRE_PING == "idle":
+        install_idle_pre_ping(engine, settings.DB_POOL_PRE_PING_IDLE_SECONDS)
+    return engine
 
-engine = create_engine(settings.DB_URL, pool_pre_ping=True)
+
+engine = configure_engine(
+    create_engine(
+        settings.DB_URL,
+        poolclass=instrumented_pool_class(QueuePool, "primary"),
+        **engine_options(),
+    )
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+async_engine = create_async_engine(
+    settings.ASYNC_DB_URL or to_async_url(settings.DB_URL),
+    poolclass=instrumented_pool_class(AsyncAdaptedQueuePool, "primary_async"),
+    **engine_options(),
+)
+configure_engine(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+
+def create_replica_engine(index: int, url: str) -> AsyncEngine:
+    replica = create_async_engine(
+        to_async_url(url),
+        poolclass=instrumented_pool_class(
+            AsyncAdaptedQueuePool, f"replica_{index}_async"
+        ),
+        **engine_options(),
+    )
+    configure_engine(replica.sync_engine)
+    return replica
+
+
+# Read replicas (DB_REPLICA_URLS), used through app.core.replicas
+replica_engines = [
+    create_replica_engine(index, url)
+    for index, url in enumerate(settings.DB_REPLICA_URLS)
+]
+
+
+def get_pools() -> dict:
+    """Pools reported by the internal metrics endpoint, keyed by metrics name."""
+    pools = {"primary": engine.pool, "primary_async": async_engine.pool}
+    for index, replica in enumerate(replica_engines):
+        pools[f"replica_{index}_async"] = replica.pool
+    return pools
+
+
+def dispose_engines_after_fork() -> None:
+    """Drop pooled connections inherited from the parent process.
+
+    Call in each worker right after fork (the app may have been imported,
+    and may have connected, before forking). ``close=False`` leaves the
+    parent's sockets alone and just gives this process fresh, empty pools.
+    """
+    engine.dispose(close=False)
+    async_engine.sync_engine.dispose(close=False)
+    for replica in replica_engines:
+        replica.sync_engine.dispose(close=False)
+
 
 def get_db():
     db = SessionLocal()
@@ -15,3 +156,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,124 @@
+"""Connection pool instrumentation.
+
+Pools built by ``instrumented_pool_class`` time every checkout and count how
+often a caller found no idle connection and had to open one or wait for one
+to be returned. ``snapshot`` combines those counters with the pool's live
+size/checked-out/overflow figures for the internal metrics endpoint.
+"""
+
+import time
+from typing import Any, Dict, List, Type
+
+import threading
+from bisect import bisect_left
+from sqlalchemy import event, exc
+from sqlalchemy.pool import Pool
+
+# Upper bounds (ms) of the checkout latency histogram buckets
+LATENCY_BUCKETS_MS = [0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000]
+
+
+class PoolMetrics:
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.latency_total_ms = 0.0
+        self.latency_max_ms = 0.0
+        self.histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def observe(self, elapsed_ms: float, waited: bool) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.waits += waited
+            self.latency_total_ms += elapsed_ms
+            self.latency_max_ms = max(self.latency_max_ms, elapsed_ms)
+            self.histogram[bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+
+    def observe_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self, pool: Pool) -> Dict[str, Any]:
+        with self._lock:
+            counts = list(self.histogram)
+            stats = {
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "checkout_ms_avg": (
+                    self.latency_total_ms / self.checkouts if self.checkouts else 0.0
+                ),
+                "checkout_ms_max": self.latency_max_ms,
+            }
+        labels = [f"le_{b}" for b in LATENCY_BUCKETS_MS] + ["le_inf"]
+        stats["checkout_ms_histogram"] = dict(zip(labels, counts))
+        # Live figures are only available on queue-based pools
+        for attr in ("size", "checkedin", "checkedout", "overflow"):
+            fn = getattr(pool, attr, None)
+            stats[attr] = fn() if callable(fn) else None
+        stats["status"] = pool.status()
+        return stats
+
+
+registry: Dict[str, PoolMetrics] = {}
+
+
+def instrumented_pool_class(base: Type[Pool], name: str) -> Type[Pool]:
+    """Return a subclass of ``base`` that records checkouts under ``name``.
+
+    A subclass (rather than a wrapper on one pool instance) survives
+    ``engine.dispose()``, which recreates the pool from its class.
+    """
+    metrics = registry.setdefault(name, PoolMetrics(name))
+
+    def connect(self):
+        checkedin = getattr(self, "checkedin", None)
+        waited = callable(checkedin) and checkedin() == 0
+        start = time.perf_counter()
+        try:
+            conn = base.connect(self)
+        except exc.TimeoutError:
+            metrics.observe_timeout()
+            raise
+        metrics.observe((time.perf_counter() - start) * 1000, waited)
+        return conn
+
+    return type(f"Instrumented{base.__name__}", (base,), {"connect": connect})
+
+
+def install_idle_pre_ping(engine: Any, idle_seconds: float) -> None:
+    """Ping connections on checkout only if they sat idle for ``idle_seconds``.
+
+    A cheaper alternative to ``pool_pre_ping`` which pings on every checkout:
+    busy connections are reused without the extra round trip, while ones that
+    may have been dropped by a firewall or failover are still validated.
+    """
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("SELECT 1")
+        except Exception:
+            # The pool discards this connection and retries with a fresh one
+            raise exc.DisconnectionError()
+        finally:
+            cursor.close()
+
+
+def all_snapshots(pools: Dict[str, Pool]) -> List[Dict[str, Any]]:
+    return [
+        {"pool": name, **registry[name].snapshot(pool)}
+        for name, pool in pools.items()
+        if name in registry
+    ]
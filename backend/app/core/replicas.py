@@ -0,0 +1,249 @@
+"""Read-replica routing for read-only endpoints.
+
+Endpoints opt in by taking their session from ``get_read_db`` (or a session
+factory from ``get_read_sessionmaker`` for streamed exports) instead of
+``get_async_db``. Each such request goes to the next healthy replica in
+round-robin order, or to the primary when:
+
+- no replicas are configured (DB_REPLICA_URLS) or none is healthy;
+- the caller wrote recently (read-your-writes, below).
+
+Health: a background task runs ``SELECT 1`` on every replica each
+DB_REPLICA_CHECK_SECONDS. A replica that fails the check, or whose
+connection drops mid-request, is skipped until a check succeeds again.
+
+Read-your-writes: replicas lag the primary, so a user who just saved a
+candidate could list candidates and not see it. ``ReadYourWritesMiddleware``
+notes every request with a writing method. For DB_READ_YOUR_WRITES_SECONDS
+afterwards, that user's reads go to the primary. The user is remembered in
+this worker by id and in the browser by a short-lived cookie, which covers
+the next request landing on another worker.
+
+Endpoints behind ``cached(...)`` keep reading the primary. Their ETag uses
+the primary's table versions, and a lagging replica would store an old body
+under the new ETag.
+"""
+
+import time
+from typing import Dict, List, Optional
+
+import asyncio
+from dataclasses import dataclass
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, replica_engines
+from app.core.request_context import current_request
+from app.utils.logging_utils import setup_logger
+
+logger = setup_logger(__name__)
+
+READ_PRIMARY_COOKIE = "read_primary_until"
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+# Prune expired read-your-writes entries once this many users are tracked
+RECENT_WRITERS_PRUNE_AT = 1024
+
+
+@dataclass
+class Replica:
+    name: str
+    engine: AsyncEngine
+    sessionmaker: async_sessionmaker
+    healthy: bool = True
+    last_error: Optional[str] = None
+    reads: int = 0
+
+
+class ReplicaRouter:
+    def __init__(self, engines: List[AsyncEngine], read_your_writes_seconds: float):
+        self.replicas = [
+            Replica(
+                name=engine.url.render_as_string(hide_password=True),
+                engine=engine,
+                sessionmaker=async_sessionmaker(
+                    engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+                ),
+            )
+            for engine in engines
+        ]
+        for replica in self.replicas:
+            self._watch_disconnects(replica)
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self._next = 0
+        # user id -> monotonic deadline of their read-your-writes window
+        self._recent_writers: Dict[int, float] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.primary_reads = 0
+        self.pinned_reads = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    # -- routing -----------------------------------------------------------
+
+    def pick(self) -> Optional[Replica]:
+        """Next healthy replica in round-robin order, or None."""
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[self._next]
+            self._next = (self._next + 1) % len(self.replicas)
+            if replica.healthy:
+                return replica
+        return None
+
+    def note_write(self, user_id: Optional[int]) -> None:
+        if user_id is None:
+            return
+        now = time.monotonic()
+        if len(self._recent_writers) >= RECENT_WRITERS_PRUNE_AT:
+            self._recent_writers = {
+                uid: until for uid, until in self._recent_writers.items() if until > now
+            }
+        self._recent_writers[user_id] = now + self.read_your_writes_seconds
+
+    def wrote_recently(self, request: Request) -> bool:
+        ctx = current_request.get()
+        if ctx is not None and ctx.user_id is not None:
+            until = self._recent_writers.get(ctx.user_id)
+            if until is not None and until > time.monotonic():
+                return True
+        try:
+            return float(request.cookies.get(READ_PRIMARY_COOKIE, 0)) > time.time()
+        except ValueError:
+            return False
+
+    def sessionmaker_for(self, request: Request) -> async_sessionmaker:
+        if not self.enabled:
+            return AsyncSessionLocal
+        if self.wrote_recently(request):
+            self.pinned_reads += 1
+            return AsyncSessionLocal
+        replica = self.pick()
+        if replica is None:
+            # Every replica is down
+            self.primary_reads += 1
+            return AsyncSessionLocal
+        replica.reads += 1
+        return replica.sessionmaker
+
+    # -- health ------------------------------------------------------------
+
+    def mark(self, replica: Replica, healthy: bool, error: Optional[str]) -> None:
+        if replica.healthy and not healthy:
+            logger.warning("Read replica %s unavailable: %s", replica.name, error)
+        elif healthy and not replica.healthy:
+            logger.info("Read replica %s back in rotation", replica.name)
+        replica.healthy = healthy
+        replica.last_error = error
+
+    def _watch_disconnects(self, replica: Replica) -> None:
+        @event.listens_for(replica.engine.sync_engine, "handle_error")
+        def _handle_error(exception_context):
+            if exception_context.is_disconnect:
+                self.mark(replica, False, str(exception_context.original_exception))
+
+    async def check(self, replica: Replica) -> None:
+        async def ping() -> None:
+            async with replica.engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+
+        try:
+            await asyncio.wait_for(ping(), settings.DB_REPLICA_CHECK_TIMEOUT)
+        except Exception as exc:
+            self.mark(replica, False, repr(exc))
+        else:
+            self.mark(replica, True, None)
+
+    async def check_all(self) -> None:
+        await asyncio.gather(*(self.check(replica) for replica in self.replicas))
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.DB_REPLICA_CHECK_SECONDS)
+            try:
+                await self.check_all()
+            except Exception:
+                logger.exception("Replica health check failed")
+
+    async def start(self) -> None:
+        if not self.enabled:
+            return
+        await self.check_all()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "replicas": [
+                {
+                    "name": replica.name,
+                    "healthy": replica.healthy,
+                    "last_error": replica.last_error,
+                    "reads": replica.reads,
+                }
+                for replica in self.replicas
+            ],
+            "primary_reads": self.primary_reads,
+            "read_your_writes_reads": self.pinned_reads,
+            "read_your_writes_seconds": self.read_your_writes_seconds,
+        }
+
+
+replica_router = ReplicaRouter(replica_engines, settings.DB_READ_YOUR_WRITES_SECONDS)
+
+
+def get_read_sessionmaker(request: Request) -> async_sessionmaker:
+    """Session factory for a read-only request: a replica's or the primary's."""
+    return replica_router.sessionmaker_for(request)
+
+
+async def get_read_db(request: Request):
+    """Like ``get_async_db``, routed by ``replica_router``. Reads only."""
+    async with get_read_sessionmaker(request)() as db:
+        yield db
+
+
+class ReadYourWritesMiddleware:
+    """Start the caller's read-your-writes window on every writing request.
+
+    Must run inside LoggingMiddleware, whose request context carries the user
+    id that auth recorded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] in SAFE_METHODS
+            or not replica_router.enabled
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                ctx = current_request.get()
+                replica_router.note_write(ctx.user_id if ctx is not None else None)
+                seconds = replica_router.read_your_writes_seconds
+                MutableHeaders(scope=message).append(
+                    "Set-Cookie",
+                    f"{READ_PRIMARY_COOKIE}={time.time() + seconds:.3f}; "
+                    f"Max-Age={int(seconds) + 1}; Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
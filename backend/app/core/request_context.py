@@ -0,0 +1,70 @@
+"""Per-request context shared by the access log, auth and database hooks.
+
+The logging middleware puts a mutable ``RequestContext`` in a ContextVar
+before calling the app. Tasks and worker threads spawned while handling the
+request copy the ContextVar and so see the same object, which lets deep code
+record facts about the request that the middleware reports at the end:
+
+- ``get_current_claims`` records the user id.
+- Engine-level cursor events add up DB time and statement count.
+"""
+
+import time
+from typing import Optional
+
+import re
+from contextvars import ContextVar
+from dataclasses import dataclass
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+REQUEST_ID_HEADER = "X-Request-ID"
+# Client-supplied request ids are echoed only if they look like an id
+_REQUEST_ID = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+
+@dataclass
+class RequestContext:
+    request_id: str
+    user_id: Optional[int] = None
+    db_time: float = 0.0
+    db_queries: int = 0
+
+
+current_request: ContextVar[Optional[RequestContext]] = ContextVar(
+    "current_request", default=None
+)
+
+
+def valid_request_id(value: Optional[str]) -> bool:
+    return bool(value and _REQUEST_ID.match(value))
+
+
+def set_request_user(user_id: int) -> None:
+    ctx = current_request.get()
+    if ctx is not None:
+        ctx.user_id = user_id
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_request.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    ctx = current_request.get()
+    started = conn.info.get("query_started")
+    if ctx is None or not started:
+        return
+    ctx.db_time += time.perf_counter() - started.pop()
+    ctx.db_queries += 1
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # Failed statements never reach after_cursor_execute
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
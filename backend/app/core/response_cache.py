@@ -0,0 +1,300 @@
+"""Conditional GETs and a per-worker body cache for read endpoints.
+
+Cached endpoints declare which tables their payload is built from with the
+``cached(...)`` dependency. The ETag is a hash of the request path, its query
+string, the current version of each of those tables and the build id
+(APP_BUILD_ID, or a digest of the app's source), so it can be computed and
+compared against ``If-None-Match`` without running the endpoint's query, and
+a deploy that changes what an endpoint returns invalidates the old ETags.
+
+Versions live in the ``table_versions`` table. Write handlers call
+``response_cache.bump(db, table)`` before committing. That increments the
+counter in the same transaction, so readers never see new rows under an old
+version. Each worker keeps a snapshot of all counters in memory:
+
+- It applies its own bumps as soon as the transaction commits.
+- It polls the table every CACHE_POLL_SECONDS to pick up other workers' bumps.
+
+A write made on another worker therefore reaches this one's ETags within
+one poll interval. Writes that bypass the API (scripts, manual SQL) are not
+seen until a handler bumps the table.
+
+Serialised 200 bodies are also kept in a bounded LRU keyed by ETag
+(RESPONSE_CACHE_MAX_ENTRIES, 0 disables it), so clients without a matching
+ETag still skip the query and serialisation. The version is read before
+the endpoint queries, so a stored body is never older than its ETag.
+
+``cached`` cuts the endpoint short with a 304 in both cases, after the auth
+dependencies have run. For a stored body, ``ResponseCacheMiddleware`` sends
+a 200 with that body in place of the 304.
+"""
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import asyncio
+import hashlib
+from fastapi import HTTPException, Request
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from urllib.parse import urlencode
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.table_version import TableVersion
+from app.utils.helper import get_current_time
+from app.utils.logging_utils import setup_logger
+from app.utils.upsert import dialect_insert
+
+logger = setup_logger(__name__)
+
+CACHE_POLL_SECONDS = 1.0
+# Larger bodies are served normally but not kept in the LRU
+CACHE_MAX_BODY_BYTES = 1 << 20
+# Clients may keep the body but must revalidate before reusing it
+CACHE_CONTROL = "private, no-cache"
+
+_ETAG_STATE_KEY = "response_cache_etag"
+_PENDING_KEY = "table_versions"
+
+
+_HIT_STATE_KEY = "response_cache_hit"
+
+
+def source_digest() -> str:
+    """Digest of every module in the ``app`` package."""
+    root = Path(__file__).resolve().parents[1]
+    digest = hashlib.blake2b(digest_size=8)
+    for path in sorted(root.rglob("*.py")):
+        digest.update(path.relative_to(root).as_posix().encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+BUILD_ID = settings.APP_BUILD_ID or source_digest()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._versions: Dict[str, int] = {}
+        self._bodies: "OrderedDict[str, Tuple[bytes, str]]" = OrderedDict()
+        self._task: Optional[asyncio.Task] = None
+        self.loaded = False
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    # -- versions ----------------------------------------------------------
+
+    async def reload(self) -> None:
+        async with AsyncSessionLocal() as db:
+            rows = await db.execute(select(TableVersion.name, TableVersion.version))
+            self._versions = {name: version for name, version in rows}
+        self.loaded = True
+
+    def apply(self, versions: Dict[str, int]) -> None:
+        """Fold in versions committed by this worker."""
+        for name, version in versions.items():
+            if version > self._versions.get(name, 0):
+                self._versions[name] = version
+
+    async def bump(self, db: AsyncSession, *tables: str) -> None:
+        """Increment the versions of ``tables`` in ``db``'s transaction."""
+        table = TableVersion.__table__
+        pending = db.sync_session.info.setdefault(_PENDING_KEY, {})
+        for name in tables:
+            stmt = dialect_insert(db.get_bind().dialect.name, table).values(
+                name=name, version=1, updated_at=get_current_time()
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["name"],
+                set_={
+                    "version": table.c.version + 1,
+                    "updated_at": stmt.excluded.updated_at,
+                },
+            ).returning(table.c.version)
+            pending[name] = await db.scalar(stmt)
+
+    def etag(self, request: Request, tables: Tuple[str, ...]) -> Optional[str]:
+        """Strong ETag for ``request`` at the current table versions, or None
+        while versions are unknown (caching is then skipped)."""
+        if not self.loaded:
+            return None
+        query = urlencode(sorted(request.query_params.multi_items()))
+        versions = ",".join(f"{name}={self._versions.get(name, 0)}" for name in tables)
+        key = f"{BUILD_ID}|{request.url.path}?{query}|{versions}"
+        return '"' + hashlib.blake2b(key.encode(), digest_size=16).hexdigest() + '"'
+
+    # -- serialised bodies -------------------------------------------------
+
+    def get(self, etag: str) -> Optional[Tuple[bytes, str]]:
+        entry = self._bodies.get(etag)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._bodies.move_to_end(etag)
+        self.hits += 1
+        return entry
+
+    def put(self, etag: str, body: bytes, media_type: str) -> None:
+        if self.max_entries <= 0 or len(body) > CACHE_MAX_BODY_BYTES:
+            return
+        self._bodies[etag] = (body, media_type)
+        self._bodies.move_to_end(etag)
+        while len(self._bodies) > self.max_entries:
+            self._bodies.popitem(last=False)
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self.loaded,
+            "versions": dict(self._versions),
+            "entries": len(self._bodies),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+        }
+
+    # -- background refresh ------------------------------------------------
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(CACHE_POLL_SECONDS)
+            try:
+                await self.reload()
+            except Exception:
+                logger.exception("Table version refresh failed")
+
+    async def start(self) -> None:
+        try:
+            await self.reload()
+        except Exception:
+            logger.exception("Initial table version load failed")
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+response_cache = ResponseCache(settings.RESPONSE_CACHE_MAX_ENTRIES)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        response_cache.apply(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def cached(*tables: str):
+    """Dependency making a GET endpoint conditional on the versions of ``tables``.
+
+    Answers 304 when ``If-None-Match`` carries the current ETag, serves the
+    stored body when this worker has one, and otherwise lets the endpoint run
+    and tags its response. Place it after auth dependencies.
+    """
+
+    async def dependency(request: Request) -> None:
+        etag = response_cache.etag(request, tables)
+        if etag is None:
+            return
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            response_cache.not_modified += 1
+            raise HTTPException(status_code=304, headers=headers)
+        entry = response_cache.get(etag)
+        if entry is not None:
+            # ResponseCacheMiddleware sends the stored body instead
+            request.state.response_cache_hit = entry
+            raise HTTPException(status_code=304, headers=headers)
+        # ResponseCacheMiddleware adds the headers (endpoints may return their
+        # own Response, which ignores dependency-set headers) and stores the body
+        request.state.response_cache_etag = etag
+
+    return dependency
+
+
+class ResponseCacheMiddleware:
+    """Add ETag headers to 200 responses tagged by ``cached`` and store their
+    bodies in the LRU; answer LRU hits from the stored body."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        state = scope.setdefault("state", {})
+        etag: Optional[str] = None
+        media_type = "application/json"
+        chunks = []
+        size = 0
+
+        hit: Optional[Tuple[bytes, str]] = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal etag, media_type, size, hit
+            if hit is not None:
+                # The 304 ``cached`` raised for a hit; send the stored body
+                if message["type"] == "http.response.body":
+                    await send({"type": "http.response.body", "body": hit[0]})
+                return
+            if message["type"] == "http.response.start":
+                hit = state.get(_HIT_STATE_KEY)
+                if hit is not None:
+                    body, media_type = hit
+                    headers = MutableHeaders(scope=message)
+                    headers["Content-Type"] = media_type
+                    headers["Content-Length"] = str(len(body))
+                    await send({**message, "status": 200})
+                    return
+                if message["status"] == 200:
+                    etag = state.get(_ETAG_STATE_KEY)
+                if etag is not None:
+                    headers = MutableHeaders(scope=message)
+                    headers["ETag"] = etag
+                    headers["Cache-Control"] = CACHE_CONTROL
+                for name, value in message.get("headers", []):
+                    if name == b"content-type":
+                        media_type = value.decode("latin-1")
+            elif message["type"] == "http.response.body" and etag is not None:
+                body = message.get("body", b"")
+                size += len(body)
+                if size > CACHE_MAX_BODY_BYTES:
+                    etag = None
+                    chunks.clear()
+                else:
+                    chunks.append(body)
+                    if not message.get("more_body", False):
+                        response_cache.put(etag, b"".join(chunks), media_type)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
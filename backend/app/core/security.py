@@ -1,6 +1,8 @@
 from datetime import timedelta
-from typing import Optional
+from typing import Any, Callable, Dict, Optional, TypeVar
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from passlib.exc import MissingBackendError, UnknownHashError
@@ -13,6 +15,90 @@ from app.utils.helper import get_current_time
 pwd_context = CryptContext(
     schemes=["argon2", "bcrypt_sha256"],
     deprecated="auto",
+    argon2__rounds=settings.ARGON2_TIME_COST,
+    argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+    argon2__parallelism=settings.ARGON2_PARALLELISM,
+)
+# Used when the argon2 backend is missing or a stored hash predates it
+legacy_pwd_context = CryptContext(
+    schemes=["bcrypt", "bcrypt_sha256"], deprecated="auto"
+)
+
+T = TypeVar("T")
+
+
+class PasswordHashingBusy(Exception):
+    """No hashing slot became free within PASSWORD_HASH_QUEUE_TIMEOUT."""
+
+
+class PasswordHasher:
+    """Runs password hashing on a small dedicated thread pool.
+
+    argon2 releases the GIL, so a few threads give real parallelism, while
+    the fixed pool size caps the CPU and memory a burst of logins can take
+    from the rest of the worker. Callers wait for a free slot for at most
+    ``queue_timeout`` seconds, and at most ``max_waiting`` of them may wait
+    at once. Beyond either limit the call fails fast with
+    PasswordHashingBusy instead of piling up.
+    """
+
+    def __init__(self, workers: int, max_waiting: int, queue_timeout: float):
+        self.workers = workers
+        self.max_waiting = max_waiting
+        self.queue_timeout = queue_timeout
+        self._reset()
+
+    def _reset(self) -> None:
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="password-hash"
+        )
+        self._slots: Dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+        self.waiting = 0
+        self.rejected = 0
+
+    def after_fork(self) -> None:
+        """Give a forked worker its own threads; the parent's don't survive fork."""
+        self._reset()
+
+    def _slots_for_loop(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        slots = self._slots.get(loop)
+        if slots is None:
+            slots = self._slots[loop] = asyncio.Semaphore(self.workers)
+        return slots
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        slots = self._slots_for_loop()
+        if slots.locked() and self.waiting >= self.max_waiting:
+            self.rejected += 1
+            raise PasswordHashingBusy()
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise PasswordHashingBusy()
+        finally:
+            self.waiting -= 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, fn, *args
+            )
+        finally:
+            slots.release()
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "waiting": self.waiting,
+            "rejected": self.rejected,
+        }
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_waiting=settings.PASSWORD_HASH_MAX_WAITING,
+    queue_timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT,
 )
 
 
@@ -39,11 +125,8 @@ def verify_password(plain_password, hashed_password):
     try:
         return pwd_context.verify(plain_password, hashed_password)
     except (UnknownHashError, MissingBackendError):
-        legacy_ctx = CryptContext(
-            schemes=["bcrypt", "bcrypt_sha256"], deprecated="auto"
-        )
         try:
-            return legacy_ctx.verify(plain_password, hashed_password)
+            return legacy_pwd_context.verify(plain_password, hashed_password)
         except Exception:
             return False
     except Exception:
@@ -59,10 +142,17 @@ def get_password_hash(password):
     try:
         return pwd_context.hash(password)
     except (MissingBackendError, Exception):
-        legacy_ctx = CryptContext(
-            schemes=["bcrypt", "bcrypt_sha256"], deprecated="auto"
-        )
-        return legacy_ctx.hash(password)
+        return legacy_pwd_context.hash(password)
+
+
+async def verify_password_async(plain_password, hashed_password) -> bool:
+    """``verify_password`` on the bounded hashing pool (see PasswordHasher)."""
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password) -> str:
+    """``get_password_hash`` on the bounded hashing pool (see PasswordHasher)."""
+    return await password_hasher.run(get_password_hash, password)
 
 
 def needs_rehash(hashed_password: str) -> bool:
@@ -0,0 +1,57 @@
+"""Short-TTL, per-process cache of authenticated user snapshots.
+
+Lets ``get_current_claims`` authorise requests without a database round
+trip. Entries expire after ``AUTH_USER_CACHE_TTL_SECONDS`` and are dropped
+explicitly whenever a user is modified, so role or activation changes take
+effect within one TTL window on other workers and immediately on this one.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import threading
+
+from app.core.config import settings
+from app.schemas.user import CurrentUser
+
+
+class UserCache:
+    def __init__(self, ttl_seconds: float, max_entries: int = 10_000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, Tuple[float, CurrentUser]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Optional[CurrentUser]:
+        if self.ttl_seconds <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at < time.monotonic():
+                del self._entries[user_id]
+                return None
+            return user
+
+    def set(self, user: CurrentUser) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[user.id] = (time.monotonic() + self.ttl_seconds, user)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(settings.AUTH_USER_CACHE_TTL_SECONDS)
@@ -1,5 +1,6 @@
 import logging
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse
@@ -7,18 +8,42 @@ from fastapi.templating import Jinja2Templates
 
 from app.api import api_router
 from app.core.config import settings
-from app.core.constants import ALLOWED_HEADERS, ALLOWED_METHODS
+from app.core.config_service import config_service
+from app.core.constants import ALLOWED_HEADERS, ALLOWED_METHODS, EXPOSED_HEADERS
+from app.core.replicas import ReadYourWritesMiddleware, replica_router
+from app.core.response_cache import ResponseCacheMiddleware, response_cache
 from app.middleware.logging_middleware import LoggingMiddleware
+from app.utils.dashboard_stats import dashboard_stats
+from app.utils.http_client import http_client
 from app.utils.logging_utils import setup_logger
+from app.utils.mail_sync import mailbox_sync
 
 # Initialize application-wide logging
 logger = setup_logger("app")
 # Ensure uvicorn access logs use our configuration
 logging.getLogger("uvicorn.access").handlers = logger.handlers
 
-app = FastAPI(title="HireHub Backend", version="1.0.0")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await config_service.start()
+    await response_cache.start()
+    await replica_router.start()
+    await dashboard_stats.start()
+    await mailbox_sync.start()
+    yield
+    await mailbox_sync.stop()
+    await dashboard_stats.stop()
+    await replica_router.stop()
+    await response_cache.stop()
+    await config_service.stop()
+    await http_client.aclose()
 
+
+app = FastAPI(title="HireHub Backend", version="1.0.0", lifespan=lifespan)
+
+app.add_middleware(ResponseCacheMiddleware)
+app.add_middleware(ReadYourWritesMiddleware)
 app.add_middleware(LoggingMiddleware)
 
 # CORS Configuration
@@ -28,6 +53,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=ALLOWED_METHODS,
     allow_headers=ALLOWED_HEADERS,
+    expose_headers=EXPOSED_HEADERS,
 )
 
 templates = Jinja2Templates(directory="app/templates")
@@ -1,39 +1,164 @@
+import json
 import time
-from typing import Awaitable, Callable
+import uuid
+from typing import Any, Dict, Optional
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import JSONResponse, Response
+import random
+import traceback
+from fastapi.routing import iter_route_contexts
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.core.config import settings
+from app.core.request_context import (
+    REQUEST_ID_HEADER,
+    RequestContext,
+    current_request,
+    valid_request_id,
+)
+from app.utils.helper import get_current_time
 from app.utils.logging_utils import setup_logger
 
 logger = setup_logger("uvicorn_access")
 
+# Full path template by id() of the route objects seen in ``scope["route"]``
+# (routes live as long as the app; they are not hashable themselves)
+_route_templates: Dict[int, str] = {}
 
-class LoggingMiddleware(BaseHTTPMiddleware):  # type: ignore[misc]
-    # Annotate `call_next` as a callable function that returns an Awaitable[Response]
-    async def dispatch(
-        self, request: Request, call_next: Callable[[Request], Awaitable[Response]]
-    ) -> Response:
-        start_time = time.time()
-        try:
-            response = await call_next(request)
-        except Exception:
-            process_time = (time.time() - start_time) * 1000
-            logger.exception(
-                f"{request.method} {request.url.path} → 500 ({process_time:.2f} ms)"
-            )
-            # Return JSON error (CORS headers are applied by outer middleware)
-            return JSONResponse({"detail": "Internal Server Error"}, status_code=500)
 
-        process_time = (time.time() - start_time) * 1000
+def should_log(status: int, duration_ms: float) -> bool:
+    """Errors and slow requests are always logged; the rest are sampled."""
+    if status >= 500 or duration_ms >= settings.ACCESS_LOG_SLOW_MS:
+        return True
+    rate = settings.ACCESS_LOG_SAMPLE_RATE
+    return rate >= 1 or random.random() < rate
+
+
+def route_template(scope: Scope) -> Optional[str]:
+    """The matched route's full path template, e.g. ``/api/v1/jobposts/{id}``.
+
+    ``scope["route"].path`` is relative to the router the route was declared
+    on, so the prefixes it was included under are looked up from the app's
+    route tree (rebuilt whenever an unknown route shows up).
+    """
+    route = scope.get("route")
+    if route is None:
+        return None
+    template = _route_templates.get(id(route))
+    if template is None:
+        app = scope.get("app")
+        for context in iter_route_contexts(getattr(app, "routes", [])):
+            if context.path:
+                _route_templates.setdefault(id(context.original_route), context.path)
+        template = _route_templates.setdefault(id(route), getattr(route, "path", ""))
+    return scope.get("root_path", "").rstrip("/") + template
+
+
+def access_record(
+    scope: Scope,
+    ctx: RequestContext,
+    status: int,
+    duration_ms: float,
+    size: int,
+) -> Dict[str, Any]:
+    client = scope.get("client")
+    return {
+        "ts": get_current_time().isoformat(),
+        "type": "access",
+        "request_id": ctx.request_id,
+        "method": scope["method"],
+        "path": scope["path"],
+        "route": route_template(scope),
+        "status": status,
+        "duration_ms": round(duration_ms, 2),
+        "db_ms": round(ctx.db_time * 1000, 2),
+        "db_queries": ctx.db_queries,
+        "user_id": ctx.user_id,
+        "bytes": size,
+        "client": client[0] if client else None,
+    }
+
+
+def log_access(record: Dict[str, Any], error: str | None = None) -> None:
+    if error:
+        record["error"] = error
+    line = json.dumps(record, separators=(",", ":"), default=str)
+    if record["status"] >= 500:
+        logger.error(line, extra={"structured": True})
+    else:
+        logger.info(line, extra={"structured": True})
+
 
-        # Log the request details and processing time
-        logger.info(
-            f"{request.method} {request.url.path} "
-            f"→ {response.status_code} "
-            f"({process_time:.2f} ms)"
-        )
+def _request_id(scope: Scope) -> str:
+    wanted = REQUEST_ID_HEADER.lower().encode()
+    for name, value in scope["headers"]:
+        if name == wanted:
+            incoming = value.decode("latin-1")
+            if valid_request_id(incoming):
+                return incoming
+            break
+    return uuid.uuid4().hex
 
-        # Return the response
-        return response
+
+class LoggingMiddleware:
+    """Emit one JSON access record per request and turn crashes into 500s.
+
+    Plain ASGI middleware: it wraps ``send`` instead of buffering the response
+    through BaseHTTPMiddleware, so streaming bodies and background tasks pass
+    through untouched. The request id is taken from X-Request-ID when the
+    client sends a sane one, generated otherwise, and echoed in the response.
+    The record is written once the app has finished sending, so streamed
+    responses report their full size and duration. See ``should_log`` for
+    sampling.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        ctx = RequestContext(request_id=_request_id(scope))
+        token = current_request.set(ctx)
+        start_time = time.perf_counter()
+        status = 500
+        size = 0
+        started = False
+        error: Optional[str] = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, size, started
+            if message["type"] == "http.response.start":
+                started = True
+                status = message["status"]
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = ctx.request_id
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            error = traceback.format_exc()
+            if started:
+                # Too late for an error response; let the server drop the connection
+                raise
+            # Return JSON error (CORS headers are applied by outer middleware)
+            response = JSONResponse(
+                {"detail": "Internal Server Error"},
+                status_code=500,
+                headers={REQUEST_ID_HEADER: ctx.request_id},
+            )
+            status = 500
+            size = len(response.body)
+            await response(scope, receive, send)
+        finally:
+            current_request.reset(token)
+            process_time = (time.perf_counter() - start_time) * 1000
+            if error or should_log(status, process_time):
+                log_access(
+                    access_record(scope, ctx, status, process_time, size), error=error
+                )
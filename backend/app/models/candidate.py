@@ -2,17 +2,20 @@ import enum
 from sqlalchemy import (
     Boolean,
     Column,
-    DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
     Text,
+    func,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 
 from app.core.database import Base
+from app.models.types import UTCDateTime
 from app.utils.helper import get_current_time
 
 
@@ -31,7 +34,7 @@ class Candidate(Base):
     current_location = Column(String)
     email = Column(String, index=True)
     contact_number = Column(String)
-    slot_availability = Column(DateTime)
+    slot_availability = Column(UTCDateTime)
     rate_card_hourly = Column(Numeric)
     experience_years = Column(Numeric)
     visa_type = Column(Enum(VisaType))
@@ -40,6 +43,18 @@ class Candidate(Base):
     notice_period_days = Column(Integer)
     cv_file_url = Column(String)
     remarks = Column(Text)
-    created_at = Column(DateTime, default=get_current_time())
+    created_at = Column(UTCDateTime, default=get_current_time, nullable=False)
+    # Maintained by database triggers from name, skills, location and remarks
+    # (see the candidate search migration); never written by the application.
+    search_vector = deferred(Column(TSVECTOR().with_variant(Text(), "sqlite")))
     job_post = relationship("JobPost", back_populates="candidates")
     skills = relationship("CandidateSkill", back_populates="candidate")
+    __table_args__ = (
+        Index("ix_candidates_created_at_id", "created_at", "id"),
+        Index("ix_candidates_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_candidates_experience_years", "experience_years"),
+        Index("ix_candidates_rate_card_hourly", "rate_card_hourly"),
+        Index("ix_candidates_visa_type", "visa_type"),
+        # Email de-duplication (Indeed ingestion) is case-insensitive
+        Index("ix_candidates_email_lower", func.lower(email)),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, String
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, func
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
@@ -9,5 +9,10 @@ class CandidateSkill(Base):
     id = Column(Integer, primary_key=True, index=True)
     skill_name = Column(String)
     score = Column(Integer)
-    candidate_id = Column(ForeignKey("candidates.id"))
+    candidate_id = Column(ForeignKey("candidates.id"), index=True)
     candidate = relationship("Candidate", back_populates="skills")
+    __table_args__ = (
+        Index("ix_candidate_skills_skill_name_score", "skill_name", "score"),
+        # Case-insensitive skill filters in candidate search
+        Index("ix_candidate_skills_lower_skill_name", func.lower(skill_name)),
+    )
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, DateTime, Integer, String, UniqueConstraint
+from sqlalchemy import Column, Integer, String, UniqueConstraint
 
 from app.core.database import Base
+from app.models.types import UTCDateTime
 from app.utils.helper import get_current_time
 
 
@@ -9,5 +10,7 @@ class Config(Base):
     config_id = Column(Integer, primary_key=True, autoincrement=True)
     path = Column(String, nullable=False, unique=True)
     value = Column(String, nullable=False)
-    updated_at = Column(DateTime, default=get_current_time, onupdate=get_current_time)
+    updated_at = Column(
+        UTCDateTime, default=get_current_time, onupdate=get_current_time
+    )
     __table_args__ = (UniqueConstraint("path", name="uq_config_path"),)
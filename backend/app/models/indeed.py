@@ -0,0 +1,37 @@
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, UniqueConstraint
+
+from app.core.database import Base
+from app.models.types import UTCDateTime
+from app.utils.helper import get_current_time
+
+
+class IndeedApplication(Base):
+    """Links an ingested candidate to the Indeed job they applied to."""
+
+    __tablename__ = "indeed_applications"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    job_id = Column(String, nullable=False)
+    candidate_id = Column(ForeignKey("candidates.id"), nullable=False, index=True)
+    # Indeed's own applicant id
+    external_id = Column(String)
+    applied_at = Column(UTCDateTime)
+    updated_at = Column(
+        UTCDateTime, default=get_current_time, onupdate=get_current_time
+    )
+    __table_args__ = (
+        UniqueConstraint(
+            "job_id", "candidate_id", name="uq_indeed_applications_job_candidate"
+        ),
+    )
+
+
+class IndeedPage(Base):
+    """Conditional-request state of one page of a job's Indeed applicants."""
+
+    __tablename__ = "indeed_pages"
+    job_id = Column(String, primary_key=True)
+    page = Column(Integer, primary_key=True)
+    etag = Column(String)
+    item_count = Column(Integer)
+    total_pages = Column(Integer)
+    checked_at = Column(UTCDateTime)
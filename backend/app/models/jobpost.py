@@ -1,10 +1,12 @@
 import uuid
 
 import enum
-from sqlalchemy import JSON, Column, DateTime, Enum, Integer, String, Text
+from sqlalchemy import JSON, Column, Enum, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
+from app.models.types import UTCDateTime
 from app.utils.helper import get_current_time
 
 
@@ -14,6 +16,10 @@ class EmploymentType(str, enum.Enum):
     contract = "contract"
 
 
+# JSONB on Postgres (indexable, binary storage); plain JSON elsewhere
+JSONDocument = JSON().with_variant(JSONB(), "postgresql")
+
+
 class JobPost(Base):
     __tablename__ = "job_posts"
     id = Column(Integer, primary_key=True, autoincrement=True, index=True)
@@ -24,10 +30,22 @@ class JobPost(Base):
     employment_type = Column(Enum(EmploymentType))
     department = Column(String)
     position_summary = Column(Text)
-    key_responsibilities = Column(JSON)
-    required_qualifications = Column(JSON)
-    preferred_qualifications = Column(JSON)
-    addons = Column(JSON, nullable=True)
+    key_responsibilities = Column(JSONDocument)
+    required_qualifications = Column(JSONDocument)
+    preferred_qualifications = Column(JSONDocument)
+    addons = Column(JSONDocument, nullable=True)
     why_join_us = Column(Text)
-    created_at = Column(DateTime, default=get_current_time())
+    created_at = Column(UTCDateTime, default=get_current_time, nullable=False)
+    # {"required": [...], "preferred": [...]} normalised skill terms of the
+    # qualifications, set by the API on every write (see utils.job_search)
+    skill_terms = Column(JSONDocument)
     candidates = relationship("Candidate", back_populates="job_post")
+    __table_args__ = (
+        Index("ix_job_posts_created_at_id", "created_at", "id"),
+        Index(
+            "ix_job_posts_skill_terms",
+            "skill_terms",
+            postgresql_using="gin",
+            postgresql_ops={"skill_terms": "jsonb_path_ops"},
+        ),
+    )
@@ -0,0 +1,46 @@
+from sqlalchemy import Column, Index, Integer, String, Text, UniqueConstraint
+
+from app.core.database import Base
+from app.models.types import UTCDateTime
+from app.utils.helper import get_current_time
+
+
+class MailMessage(Base):
+    """Local copy of Inbox message metadata, maintained by the Graph delta sync."""
+
+    __tablename__ = "mail_messages"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    mailbox = Column(String, nullable=False)
+    message_id = Column(String, nullable=False)
+    subject = Column(String)
+    from_name = Column(String)
+    # Lower-cased so sender filters are exact index lookups
+    from_address = Column(String)
+    received_at = Column(UTCDateTime)
+    body_preview = Column(Text)
+    synced_at = Column(UTCDateTime, default=get_current_time, onupdate=get_current_time)
+    __table_args__ = (
+        UniqueConstraint("mailbox", "message_id", name="uq_mail_messages_message"),
+        Index("ix_mail_messages_mailbox_received", "mailbox", "received_at"),
+        Index(
+            "ix_mail_messages_mailbox_from_received",
+            "mailbox",
+            "from_address",
+            "received_at",
+        ),
+    )
+
+
+class MailSyncState(Base):
+    """Graph delta checkpoint per mailbox.
+
+    ``next_link`` is set while a sync round is still paging (so an interrupted
+    round resumes where it stopped); ``delta_link`` is the token for the next
+    round once the previous one has completed.
+    """
+
+    __tablename__ = "mail_sync_state"
+    mailbox = Column(String, primary_key=True)
+    delta_link = Column(Text)
+    next_link = Column(Text)
+    synced_at = Column(UTCDateTime)
@@ -0,0 +1,17 @@
+from sqlalchemy import BigInteger, Column, String
+
+from app.core.database import Base
+from app.models.types import UTCDateTime
+from app.utils.helper import get_current_time
+
+
+class TableVersion(Base):
+    """Change counter per table, bumped in the same transaction as each write
+    made through the API. Read endpoints derive their ETags from it."""
+
+    __tablename__ = "table_versions"
+    name = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(
+        UTCDateTime, default=get_current_time, onupdate=get_current_time
+    )
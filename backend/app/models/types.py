@@ -0,0 +1,20 @@
+from datetime import timezone
+
+from sqlalchemy import DateTime
+from sqlalchemy.types import TypeDecorator
+
+
+class UTCDateTime(TypeDecorator):
+    """Naive ``TIMESTAMP`` column that accepts timezone-aware datetimes.
+
+    Aware values are converted to UTC and stripped of tzinfo before binding;
+    asyncpg refuses to bind aware datetimes to ``timestamp without time zone``.
+    """
+
+    impl = DateTime
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
@@ -1,7 +1,8 @@
 import enum
-from sqlalchemy import Boolean, Column, DateTime, Enum, Integer, String
+from sqlalchemy import Boolean, Column, Enum, Integer, String
 
 from app.core.database import Base
+from app.models.types import UTCDateTime
 from app.utils.helper import get_current_time
 
 
@@ -18,4 +19,4 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     is_active = Column(Boolean, default=True)
     role = Column(Enum(UserRole), default=UserRole.user)
-    created_at = Column(DateTime, default=get_current_time)
+    created_at = Column(UTCDateTime, default=get_current_time)
@@ -1,10 +1,13 @@
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
 from enum import Enum
 from pydantic import BaseModel, EmailStr
 
+from app.schemas.candidateskill import CandidateSkillBase, CandidateSkillOut
+from app.schemas.jobpost import JobPostSummary
+
 
 class VisaType(str, Enum):
     h1b = "h1b"
@@ -37,3 +40,66 @@ class CandidateCreate(CandidateBase):
 class CandidateOut(CandidateBase):
     id: int
     created_at: datetime
+    # Candidates ingested from Indeed only carry what the applicant supplied
+    job_post_id: Optional[int] = None
+    name: Optional[str] = None
+    current_location: Optional[str] = None
+    contact_number: Optional[str] = None
+    slot_availability: Optional[datetime] = None
+    rate_card_hourly: Optional[float] = None
+    experience_years: Optional[float] = None
+    visa_type: Optional[VisaType] = None
+    willing_to_relocate: Optional[bool] = None
+    overall_gpt_score: Optional[float] = None
+    notice_period_days: Optional[int] = None
+    cv_file_url: Optional[str] = None
+
+
+class CandidateDetailOut(CandidateOut):
+    skills: List[CandidateSkillOut] = []
+    job_post: Optional[JobPostSummary] = None
+
+
+class CandidateImportRow(CandidateCreate):
+    skills: List[CandidateSkillBase] = []
+
+
+class ImportRowError(BaseModel):
+    row: int
+    errors: List[str]
+
+
+class CandidateImportResult(BaseModel):
+    inserted: int
+    failed: int
+    errors: List[ImportRowError]
+
+
+class CandidateSearchResult(BaseModel):
+    total: int
+    items: List[CandidateOut]
+    facets: Dict[str, Dict[str, int]] = {}
+
+
+class CandidateMatchOut(BaseModel):
+    candidate: CandidateOut
+    score: float
+    matched_skills: List[str]
+
+
+class JobMatchResult(BaseModel):
+    job_post_id: int
+    # Indexed skills recognised in the job's qualifications, with their weight
+    skills: Dict[str, float]
+    matches: List[CandidateMatchOut]
+
+
+class JobPostMatchOut(BaseModel):
+    job_post: JobPostSummary
+    score: float
+    matched_skills: List[str]
+
+
+class CandidateJobsResult(BaseModel):
+    candidate_id: int
+    matches: List[JobPostMatchOut]
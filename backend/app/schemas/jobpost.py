@@ -33,3 +33,11 @@ class JobPostCreate(JobPostBase):
 class JobPostOut(JobPostBase):
     id: int
     created_at: datetime
+
+
+class JobPostSummary(BaseModel):
+    id: int
+    title: str
+    position: Optional[str] = None
+    location: Optional[str] = None
+    employment_type: Optional[EmploymentType] = None
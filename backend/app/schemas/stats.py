@@ -0,0 +1,48 @@
+from datetime import date, datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from app.schemas.candidate import VisaType
+
+
+class DashboardTotals(BaseModel):
+    candidates: int
+    job_posts: int
+    avg_rate_card_hourly: Optional[float] = None
+    avg_experience_years: Optional[float] = None
+
+
+class JobPostStats(BaseModel):
+    job_post_id: Optional[int] = None
+    title: Optional[str] = None
+    candidates: int
+    avg_rate_card_hourly: Optional[float] = None
+
+
+class VisaTypeStats(BaseModel):
+    visa_type: Optional[VisaType] = None
+    candidates: int
+    avg_rate_card_hourly: Optional[float] = None
+
+
+class SkillStats(BaseModel):
+    skill_name: str
+    candidates: int
+    avg_score: Optional[float] = None
+
+
+class DailyCount(BaseModel):
+    day: date
+    candidates: int
+
+
+class DashboardStatsOut(BaseModel):
+    # When the aggregates were last recomputed; counts may lag writes until then
+    refreshed_at: Optional[datetime] = None
+    totals: DashboardTotals
+    by_job_post: List[JobPostStats]
+    by_visa_type: List[VisaTypeStats]
+    top_skills: List[SkillStats]
+    # Candidates created per day (UTC), oldest first, zero-filled
+    pipeline: List[DailyCount]
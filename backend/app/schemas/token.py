@@ -12,4 +12,5 @@ class Token(BaseModel):
 class TokenPayload(BaseModel):
     sub: str
     role: str
+    is_active: bool = True
     exp: int
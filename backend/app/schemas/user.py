@@ -24,3 +24,11 @@ class UserCreate(UserBase):
 class UserOut(UserBase):
     id: int
     created_at: datetime
+
+
+class CurrentUser(BaseModel):
+    """Authenticated principal resolved from verified token claims."""
+
+    id: int
+    role: UserRole
+    is_active: bool = True
@@ -0,0 +1,215 @@
+"""Incremental parsing of bulk import payloads.
+
+Records are yielded one at a time with their 1-based position in the input,
+so NDJSON and CSV uploads are validated and inserted while the body is still
+streaming in rather than after buffering the whole request.
+"""
+
+import json
+from collections import deque
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import csv
+from fastapi import HTTPException, Request
+
+from app.core.constants import BULK_IMPORT_MAX_RECORD_LINES
+
+JSON_TYPES = ("application/json",)
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+CSV_TYPES = ("text/csv", "application/csv")
+
+
+def decode_line(line: bytes, line_no: int) -> Tuple[str, Optional[ValueError]]:
+    """Decode one physical line. Invalid UTF-8 is replaced (so CSV quoting
+    can still be tracked) and reported as the returned error."""
+    try:
+        return line.decode("utf-8-sig").rstrip("\r"), None
+    except UnicodeDecodeError as e:
+        text = line.decode("utf-8-sig", errors="replace").rstrip("\r")
+        return text, ValueError(f"line {line_no}: not valid UTF-8 ({e.reason})")
+
+
+async def iter_lines(
+    request: Request,
+) -> AsyncIterator[Tuple[int, str, Optional[ValueError]]]:
+    """Yield ``(line_number, text, decode_error)`` per physical line of the body.
+
+    Splitting on the raw newline byte is safe: it never occurs inside a
+    multi-byte UTF-8 sequence.
+    """
+    buffer = b""
+    line_no = 0
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_no += 1
+            yield (line_no, *decode_line(line, line_no))
+    if buffer:
+        line_no += 1
+        yield (line_no, *decode_line(buffer, line_no))
+
+
+Line = Tuple[int, str, Optional[ValueError]]
+Record = Tuple[int, List[str], Optional[ValueError]]
+
+
+def quote_open_after(text: str, quoted: bool) -> bool:
+    """Whether a quoted field is still open at the end of ``text``, given
+    whether one was open at its start.
+
+    Follows the csv module's default dialect: a quote opens a field only as
+    its first character (``Jo O"Brien`` is plain text) and a doubled quote
+    inside a quoted field is literal.
+    """
+    if '"' not in text:
+        return quoted
+    at_field_start = not quoted
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if quoted and char == '"':
+            if text[i + 1 : i + 2] == '"':
+                i += 2
+                continue
+            quoted = False
+        elif char == '"' and at_field_start:
+            quoted = True
+        at_field_start = char == "," and not quoted
+        i += 1
+    return quoted
+
+
+class CsvRecordSplitter:
+    """Group physical lines into CSV records and parse each one on its own.
+
+    Quoted fields may span lines (the CSV export writes multi-line remarks
+    that way). A record that does not parse is reported against its first
+    line. If it spans several lines, the quote that opened it was probably
+    stray, so splitting resumes on its second line and the rows it swallowed
+    are kept. The same happens to a quote left open for more than
+    BULK_IMPORT_MAX_RECORD_LINES lines or until the end of the input.
+    """
+
+    def __init__(self, max_lines: int = BULK_IMPORT_MAX_RECORD_LINES):
+        self.max_lines = max_lines
+        self.pending: List[Line] = []
+        self.quoted = False
+
+    def _reject(self, queue: deque, reason: str) -> Record:
+        """Report the pending record and requeue all but its first line."""
+        start = self.pending[0][0]
+        queue.extendleft(reversed(self.pending[1:]))
+        self.pending, self.quoted = [], False
+        return start, [], ValueError(f"line {start}: {reason}")
+
+    def feed(self, lines: Iterable[Line]) -> Iterator[Record]:
+        queue = deque(lines)
+        while queue:
+            line = queue.popleft()
+            if not self.pending and not line[1].strip():
+                continue
+            self.pending.append(line)
+            self.quoted = quote_open_after(line[1], self.quoted)
+            if self.quoted:
+                if len(self.pending) > self.max_lines:
+                    yield self._reject(queue, "unterminated quoted field")
+                continue
+            text = "\n".join(t for _, t, _ in self.pending)
+            try:
+                values = next(csv.reader([text], strict=True))
+            except csv.Error as e:
+                yield self._reject(queue, str(e))
+                continue
+            start = self.pending[0][0]
+            error = next((e for _, _, e in self.pending if e is not None), None)
+            self.pending = []
+            yield start, values, error
+
+    def finish(self) -> Iterator[Record]:
+        while self.pending:
+            queue: deque = deque()
+            yield self._reject(queue, "unterminated quoted field")
+            yield from self.feed(queue)
+
+
+async def iter_csv_records(request: Request) -> AsyncIterator[Record]:
+    """Yield ``(first_line_number, values, error)`` per CSV record."""
+    splitter = CsvRecordSplitter()
+    async for line in iter_lines(request):
+        for record in splitter.feed([line]):
+            yield record
+    for record in splitter.finish():
+        yield record
+
+
+def parse_csv_skills(value: str) -> list:
+    """Parse a CSV ``skills`` cell of the form ``python:8;sql:6``."""
+    skills = []
+    for item in value.split(";"):
+        if not item.strip():
+            continue
+        name, _, score = item.rpartition(":")
+        skills.append({"skill_name": name.strip(), "score": score.strip()})
+    return skills
+
+
+async def iter_import_records(
+    request: Request,
+) -> AsyncIterator[Tuple[int, Dict[str, Any] | Exception]]:
+    """Yield ``(row_number, record)`` pairs from a JSON, NDJSON or CSV body.
+
+    A record that cannot be decoded is yielded as the exception instead so the
+    caller can report it against its row and carry on with the rest.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+
+    if content_type in JSON_TYPES:
+        try:
+            records = json.loads(await request.body())
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Malformed JSON body")
+        if not isinstance(records, list):
+            raise HTTPException(status_code=400, detail="Expected a JSON array")
+        for row, record in enumerate(records, start=1):
+            yield row, record
+
+    elif content_type in NDJSON_TYPES:
+        row = 0
+        async for _, line, error in iter_lines(request):
+            if not line.strip():
+                continue
+            row += 1
+            if error is not None:
+                yield row, error
+                continue
+            try:
+                yield row, json.loads(line)
+            except ValueError as e:
+                yield row, e
+
+    elif content_type in CSV_TYPES:
+        header = None
+        row = 0
+        async for line_no, values, error in iter_csv_records(request):
+            if header is None:
+                if error is not None:
+                    raise HTTPException(status_code=400, detail=f"Header {error}")
+                header = [h.strip() for h in values]
+                continue
+            row += 1
+            if error is not None:
+                yield row, error
+                continue
+            record: Dict[str, Any] = {
+                k: v for k, v in zip(header, values) if v.strip() != ""
+            }
+            if "skills" in record:
+                record["skills"] = parse_csv_skills(record["skills"])
+            yield row, record
+
+    else:
+        raise HTTPException(
+            status_code=415,
+            detail="Use application/json, application/x-ndjson or text/csv",
+        )
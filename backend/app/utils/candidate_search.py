@@ -0,0 +1,144 @@
+"""Filter and facet building for candidate search.
+
+On Postgres free text is matched against the trigger-maintained
+``candidates.search_vector`` (GIN indexed) and ranked with ``ts_rank_cd``;
+other dialects fall back to case-insensitive LIKE so the endpoint still works
+against SQLite in development. Range filters map onto the btree indexes on
+experience_years, rate_card_hourly and visa_type; skill names are compared
+lower-cased through ``ix_candidate_skills_lower_skill_name``.
+
+Facets cost one GROUP BY per dimension over the whole filtered set, plus a
+semi-join into candidate_skills for the skills facet. EXPLAIN shows every
+facet query re-evaluating the filters (the skills subquery included) and
+sorting into a temporary B-tree; without a selective filter that is a full
+scan of candidates each time. ``benchmarks/candidate_search.py`` measured
+faceted searches at 3-5x the latency of plain ones, so the search endpoint
+only computes them on request.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import enum
+from sqlalchemy import case, distinct, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.candidate import Candidate
+from app.models.candidateskill import CandidateSkill
+
+# Upper bound of each experience facet bucket in years (last bucket is open)
+EXPERIENCE_BUCKETS = [2, 5, 10]
+# Number of skill names reported in the skills facet
+SKILL_FACET_SIZE = 20
+
+
+def text_condition(dialect: str, q: str) -> Tuple[Any, Optional[Any]]:
+    """Return the WHERE clause for ``q`` and a rank expression (Postgres only)."""
+    if dialect == "postgresql":
+        query = func.websearch_to_tsquery("english", q)
+        return (
+            Candidate.search_vector.op("@@")(query),
+            func.ts_rank_cd(Candidate.search_vector, query),
+        )
+    pattern = f"%{q}%"
+    skill_match = select(CandidateSkill.candidate_id).where(
+        CandidateSkill.skill_name.ilike(pattern)
+    )
+    return (
+        or_(
+            Candidate.name.ilike(pattern),
+            Candidate.current_location.ilike(pattern),
+            Candidate.remarks.ilike(pattern),
+            Candidate.id.in_(skill_match),
+        ),
+        None,
+    )
+
+
+def build_filters(
+    *,
+    skills: Optional[List[str]] = None,
+    visa_types: Optional[List[Any]] = None,
+    min_experience: Optional[float] = None,
+    max_experience: Optional[float] = None,
+    min_rate: Optional[float] = None,
+    max_rate: Optional[float] = None,
+    willing_to_relocate: Optional[bool] = None,
+    job_post_id: Optional[int] = None,
+) -> List[Any]:
+    conditions: List[Any] = []
+    if skills:
+        # Candidates having every requested skill, ignoring case
+        wanted = {name.strip().lower() for name in skills if name.strip()}
+        skill_name = func.lower(CandidateSkill.skill_name)
+        if wanted:
+            conditions.append(
+                Candidate.id.in_(
+                    select(CandidateSkill.candidate_id)
+                    .where(skill_name.in_(wanted))
+                    .group_by(CandidateSkill.candidate_id)
+                    .having(func.count(distinct(skill_name)) == len(wanted))
+                )
+            )
+    if visa_types:
+        conditions.append(Candidate.visa_type.in_(visa_types))
+    if min_experience is not None:
+        conditions.append(Candidate.experience_years >= min_experience)
+    if max_experience is not None:
+        conditions.append(Candidate.experience_years <= max_experience)
+    if min_rate is not None:
+        conditions.append(Candidate.rate_card_hourly >= min_rate)
+    if max_rate is not None:
+        conditions.append(Candidate.rate_card_hourly <= max_rate)
+    if willing_to_relocate is not None:
+        conditions.append(Candidate.willing_to_relocate == willing_to_relocate)
+    if job_post_id is not None:
+        conditions.append(Candidate.job_post_id == job_post_id)
+    return conditions
+
+
+def _facet_key(value: Any) -> str:
+    if value is None:
+        return "unknown"
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, bool):
+        return str(value).lower()
+    return str(value)
+
+
+def _experience_bucket():
+    whens = []
+    lower = 0
+    for upper in EXPERIENCE_BUCKETS:
+        whens.append((Candidate.experience_years < upper, f"{lower}-{upper}"))
+        lower = upper
+    return case(*whens, else_=f"{lower}+")
+
+
+async def facet_counts(db: AsyncSession, conditions: List[Any]) -> Dict[str, Dict]:
+    """Count matching candidates per visa type, relocation, experience and skill."""
+    matching = select(Candidate.id).where(*conditions).scalar_subquery()
+    facets: Dict[str, Dict[str, int]] = {}
+
+    for name, expr in (
+        ("visa_type", Candidate.visa_type),
+        ("willing_to_relocate", Candidate.willing_to_relocate),
+        ("experience_years", _experience_bucket()),
+    ):
+        rows = await db.execute(
+            select(expr, func.count()).where(*conditions).group_by(expr)
+        )
+        facets[name] = {_facet_key(value): count for value, count in rows}
+
+    # Lower-cased to match the keys the skills filter accepts
+    skill_name = func.lower(CandidateSkill.skill_name)
+    skill_count = func.count(distinct(CandidateSkill.candidate_id))
+    rows = await db.execute(
+        select(skill_name, skill_count)
+        .where(CandidateSkill.candidate_id.in_(matching))
+        .group_by(skill_name)
+        .order_by(skill_count.desc())
+        .limit(SKILL_FACET_SIZE)
+    )
+    facets["skills"] = {_facet_key(value): count for value, count in rows}
+    return facets
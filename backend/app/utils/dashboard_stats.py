@@ -0,0 +1,252 @@
+"""Precomputed aggregates behind the dashboard stats endpoint.
+
+On Postgres the aggregates are materialized views (see the dashboard stats
+migration), each with a unique index so it can be refreshed CONCURRENTLY.
+Readers keep seeing the previous contents while a refresh runs. The widgets
+read a few dozen precomputed rows, so a page load costs the same with ten
+candidates or ten million.
+
+Every worker checks every STATS_CHECK_SECONDS whether the views are older
+than DASHBOARD_STATS_REFRESH_SECONDS. A transaction-level advisory lock lets
+a single worker run each refresh. A refresh bumps the ``dashboard_stats``
+table version: its ``updated_at`` is the time reported to clients, and the
+bump turns over the endpoint's ETag.
+
+Other dialects (SQLite in development) have no materialized views. The same
+queries run live as subqueries, and the version is still bumped on schedule,
+so responses are cached for at most one refresh interval on every dialect.
+"""
+
+from datetime import timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import asyncio
+import zlib
+from sqlalchemy import Date, Integer, Numeric, String, column, func, select, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.response_cache import response_cache
+from app.models.candidate import Candidate
+from app.models.candidateskill import CandidateSkill
+from app.models.jobpost import JobPost
+from app.models.table_version import TableVersion
+from app.utils.helper import get_current_time
+from app.utils.logging_utils import setup_logger
+
+logger = setup_logger(__name__)
+
+# table_versions key: bumped on every refresh, used by the endpoint's ETag
+STATS_TABLE = "dashboard_stats"
+STATS_CHECK_SECONDS = 5.0
+_LOCK_KEY = zlib.crc32(STATS_TABLE.encode())
+
+# Live definitions of the materialized views. Keep them in step with the SQL
+# in the dashboard stats migration.
+_DAY = func.date(Candidate.created_at, type_=Date)
+LIVE_QUERIES = {
+    "stats_candidates_by_job_post": select(
+        Candidate.job_post_id,
+        func.count().label("candidates"),
+        func.count(Candidate.rate_card_hourly).label("rated"),
+        func.sum(Candidate.rate_card_hourly).label("rate_sum"),
+    ).group_by(Candidate.job_post_id),
+    "stats_candidates_by_visa_type": select(
+        Candidate.visa_type,
+        func.count().label("candidates"),
+        func.count(Candidate.rate_card_hourly).label("rated"),
+        func.sum(Candidate.rate_card_hourly).label("rate_sum"),
+        func.count(Candidate.experience_years).label("experienced"),
+        func.sum(Candidate.experience_years).label("experience_sum"),
+    ).group_by(Candidate.visa_type),
+    "stats_candidate_skills": select(
+        func.lower(CandidateSkill.skill_name).label("skill_name"),
+        func.count(CandidateSkill.candidate_id.distinct()).label("candidates"),
+        func.avg(CandidateSkill.score).label("avg_score"),
+    )
+    .where(CandidateSkill.skill_name.is_not(None))
+    .group_by(func.lower(CandidateSkill.skill_name)),
+    "stats_candidates_daily": select(
+        _DAY.label("day"), func.count().label("candidates")
+    ).group_by(_DAY),
+}
+
+MATERIALIZED_VIEWS = {
+    "stats_candidates_by_job_post": table(
+        "stats_candidates_by_job_post",
+        column("job_post_id", Integer),
+        column("candidates", Integer),
+        column("rated", Integer),
+        column("rate_sum", Numeric),
+    ),
+    "stats_candidates_by_visa_type": table(
+        "stats_candidates_by_visa_type",
+        column("visa_type", String),
+        column("candidates", Integer),
+        column("rated", Integer),
+        column("rate_sum", Numeric),
+        column("experienced", Integer),
+        column("experience_sum", Numeric),
+    ),
+    "stats_candidate_skills": table(
+        "stats_candidate_skills",
+        column("skill_name", String),
+        column("candidates", Integer),
+        column("avg_score", Numeric),
+    ),
+    "stats_candidates_daily": table(
+        "stats_candidates_daily",
+        column("day", Date),
+        column("candidates", Integer),
+    ),
+}
+
+
+def stats_source(dialect: str, name: str) -> Any:
+    """The materialized view ``name`` on Postgres, its live query elsewhere."""
+    if dialect == "postgresql":
+        return MATERIALIZED_VIEWS[name]
+    return LIVE_QUERIES[name].subquery(name)
+
+
+def _ratio(total: Any, count: Any) -> Optional[float]:
+    return float(total) / count if count else None
+
+
+async def dashboard_summary(
+    db: AsyncSession, *, days: int, top_job_posts: int, top_skills: int
+) -> Dict[str, Any]:
+    dialect = db.get_bind().dialect.name
+
+    visa = stats_source(dialect, "stats_candidates_by_visa_type")
+    by_visa_type = []
+    totals = {"candidates": 0, "rated": 0, "rate_sum": 0, "exp": 0, "exp_sum": 0}
+    for row in await db.execute(select(visa).order_by(visa.c.candidates.desc())):
+        by_visa_type.append(
+            {
+                "visa_type": row.visa_type,
+                "candidates": row.candidates,
+                "avg_rate_card_hourly": _ratio(row.rate_sum, row.rated),
+            }
+        )
+        totals["candidates"] += row.candidates
+        totals["rated"] += row.rated
+        totals["rate_sum"] += row.rate_sum or 0
+        totals["exp"] += row.experienced
+        totals["exp_sum"] += row.experience_sum or 0
+
+    jobs = stats_source(dialect, "stats_candidates_by_job_post")
+    by_job_post = [
+        {
+            "job_post_id": row.job_post_id,
+            "title": row.title,
+            "candidates": row.candidates,
+            "avg_rate_card_hourly": _ratio(row.rate_sum, row.rated),
+        }
+        for row in await db.execute(
+            select(jobs, JobPost.title)
+            .outerjoin(JobPost, JobPost.id == jobs.c.job_post_id)
+            .order_by(jobs.c.candidates.desc(), jobs.c.job_post_id)
+            .limit(top_job_posts)
+        )
+    ]
+
+    skills = stats_source(dialect, "stats_candidate_skills")
+    skill_rows = await db.execute(
+        select(skills)
+        .order_by(skills.c.candidates.desc(), skills.c.skill_name)
+        .limit(top_skills)
+    )
+    top = [
+        {
+            "skill_name": row.skill_name,
+            "candidates": row.candidates,
+            "avg_score": float(row.avg_score) if row.avg_score is not None else None,
+        }
+        for row in skill_rows
+    ]
+
+    daily = stats_source(dialect, "stats_candidates_daily")
+    today = get_current_time().date()
+    since = today - timedelta(days=days - 1)
+    counts = {
+        row.day: row.candidates
+        for row in await db.execute(select(daily).where(daily.c.day >= since))
+    }
+    pipeline = [
+        {"day": day, "candidates": counts.get(day, 0)}
+        for day in (since + timedelta(days=i) for i in range(days))
+    ]
+
+    refreshed_at = await db.scalar(
+        select(TableVersion.updated_at).where(TableVersion.name == STATS_TABLE)
+    )
+    return {
+        "refreshed_at": refreshed_at,
+        "totals": {
+            "candidates": totals["candidates"],
+            "job_posts": await db.scalar(select(func.count()).select_from(JobPost)),
+            "avg_rate_card_hourly": _ratio(totals["rate_sum"], totals["rated"]),
+            "avg_experience_years": _ratio(totals["exp_sum"], totals["exp"]),
+        },
+        "by_job_post": by_job_post,
+        "by_visa_type": by_visa_type,
+        "top_skills": top,
+        "pipeline": pipeline,
+    }
+
+
+class DashboardStats:
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+
+    async def refresh(self, force: bool = False) -> bool:
+        """Refresh the aggregates if they are due (or ``force``); True if run."""
+        async with AsyncSessionLocal() as db:
+            postgres = db.get_bind().dialect.name == "postgresql"
+            if postgres:
+                acquired = await db.scalar(
+                    select(func.pg_try_advisory_xact_lock(_LOCK_KEY))
+                )
+                if not acquired:
+                    return False
+            refreshed_at = await db.scalar(
+                select(TableVersion.updated_at).where(TableVersion.name == STATS_TABLE)
+            )
+            if not force and refreshed_at is not None:
+                age = get_current_time() - refreshed_at.replace(tzinfo=timezone.utc)
+                if age.total_seconds() < settings.DASHBOARD_STATS_REFRESH_SECONDS:
+                    return False
+            if postgres:
+                for view in MATERIALIZED_VIEWS:
+                    await db.execute(
+                        text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view}")
+                    )
+            await response_cache.bump(db, STATS_TABLE)
+            await db.commit()
+            return True
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Dashboard stats refresh failed")
+            await asyncio.sleep(STATS_CHECK_SECONDS)
+
+    async def start(self) -> None:
+        if settings.DASHBOARD_STATS_REFRESH_SECONDS > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+dashboard_stats = DashboardStats()
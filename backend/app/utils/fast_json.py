@@ -0,0 +1,65 @@
+"""orjson fast path for list endpoints that return trusted database rows.
+
+The default path loads ORM entities, validates each one against the
+``response_model`` (from attributes) and serialises the validated models.
+For rows that came straight out of our own tables, that validation buys
+nothing. The fast path instead:
+
+- selects only the columns the response model exposes (``output_columns``),
+  as plain row mappings with no identity map or attribute instrumentation;
+- writes them with orjson into a ``FastJSONResponse``, which FastAPI sends
+  as-is, skipping ``response_model`` validation.
+
+The output is byte-identical to what the response model would produce for
+these column types: Decimals become floats, enums their values, and
+datetimes are ISO 8601 (UTC ones ending in ``Z``). Only use it where every
+exposed field maps 1:1 to a column with no computed or nested fields. Keep
+``response_model`` on the route for the OpenAPI schema.
+``benchmarks/list_serialization.py`` measures the gain.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, List, Type
+
+import orjson
+from decimal import Decimal
+from pydantic import BaseModel
+from sqlalchemy import Column, Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.responses import JSONResponse
+
+ORJSON_OPTIONS = orjson.OPT_UTC_Z
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+@lru_cache(maxsize=None)
+def output_columns(schema: Type[BaseModel], model: Any) -> List[Column]:
+    """Columns of ``model``'s table that ``schema`` exposes, in schema order."""
+    columns = model.__table__.columns
+    missing = [name for name in schema.model_fields if name not in columns]
+    if missing:
+        raise ValueError(
+            f"{schema.__name__} fields {missing} are not columns of {model.__name__}"
+        )
+    return [columns[name] for name in schema.model_fields]
+
+
+async def fetch_rows(db: AsyncSession, stmt: Select) -> List[Dict[str, Any]]:
+    """Run a column select and return its rows as plain dicts."""
+    result = await db.execute(stmt)
+    keys = list(result.keys())
+    return [dict(zip(keys, row)) for row in result.all()]
@@ -0,0 +1,163 @@
+"""Shared async HTTP transport for third-party integrations.
+
+A single ``httpx.AsyncClient`` per worker keeps TLS connections alive and
+pooled across requests (HTTP/2 when the ``h2`` package is installed), with
+explicit connect/read timeouts so a slow upstream cannot hang a worker, a
+per-host concurrency cap, and retries with full-jitter exponential backoff
+that honour ``Retry-After`` on 429/503 responses.
+
+Integrations take their base URLs from settings, so the whole stack can be
+pointed at a local stub server in tests.
+"""
+
+import time
+from typing import Any, Dict, Optional
+
+import asyncio
+import httpx
+import random
+from email.utils import parsedate_to_datetime
+
+from app.core.config import settings
+from app.utils.logging_utils import setup_logger
+
+logger = setup_logger(__name__)
+
+try:  # HTTP/2 needs the optional h2 dependency (httpx[http2])
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Return the delay in seconds from a Retry-After header, if any."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class HttpClient:
+    def __init__(
+        self,
+        *,
+        connect_timeout: float = settings.HTTP_CONNECT_TIMEOUT,
+        read_timeout: float = settings.HTTP_READ_TIMEOUT,
+        max_connections: int = settings.HTTP_MAX_CONNECTIONS,
+        max_connections_per_host: int = settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+        retries: int = settings.HTTP_RETRIES,
+        backoff_base: float = 0.25,
+        backoff_max: float = 8.0,
+        max_retry_after: float = 30.0,
+    ):
+        self.timeout = httpx.Timeout(
+            read_timeout, connect=connect_timeout, pool=connect_timeout
+        )
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        )
+        self.max_connections_per_host = max_connections_per_host
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_retry_after = max_retry_after
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Connections belong to the loop that opened them; rebuild if it changed
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE, timeout=self.timeout, limits=self.limits
+            )
+            self._loop = loop
+            self._host_slots = {}
+        return self._client
+
+    def _slots(self, host: str) -> asyncio.Semaphore:
+        slots = self._host_slots.get(host)
+        if slots is None:
+            slots = self._host_slots[host] = asyncio.Semaphore(
+                self.max_connections_per_host
+            )
+        return slots
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+    async def request(
+        self, method: str, url: str, *, retry: Optional[bool] = None, **kwargs: Any
+    ) -> httpx.Response:
+        """Send a request, retrying transport errors and retryable statuses.
+
+        Only idempotent methods are retried unless ``retry=True`` is passed.
+        The final response is returned whatever its status; callers check it.
+        """
+        method = method.upper()
+        client = self.client
+        retryable = retry if retry is not None else method in IDEMPOTENT_METHODS
+        attempts = 1 + self.retries if retryable else 1
+        host = httpx.URL(url).host
+        for attempt in range(attempts):
+            last = attempt == attempts - 1
+            try:
+                async with self._slots(host):
+                    response = await client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                if last:
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(
+                    "%s %s failed (%s); retrying in %.2fs", method, url, e, delay
+                )
+            else:
+                if response.status_code not in RETRY_STATUSES or last:
+                    return response
+                delay = parse_retry_after(response.headers.get("Retry-After"))
+                if delay is None:
+                    delay = self._backoff(attempt)
+                elif delay > self.max_retry_after:
+                    return response
+                logger.warning(
+                    "%s %s returned %s; retrying in %.2fs",
+                    method,
+                    url,
+                    response.status_code,
+                    delay,
+                )
+                await response.aclose()
+            await asyncio.sleep(delay)
+        raise AssertionError("unreachable")
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+http_client = HttpClient()
+
+
+def get_http_client() -> HttpClient:
+    return http_client
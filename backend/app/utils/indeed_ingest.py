@@ -0,0 +1,441 @@
+"""Indeed applicant ingestion and job-listing cache.
+
+A job's applicants are paged from ``GET /jobs/{job_id}/candidates`` with
+``page`` and ``limit`` parameters. The first page reports ``total_pages`` (or
+``total``), so the remaining pages are fetched concurrently, at most
+INDEED_MAX_CONCURRENCY at a time. Each page is requested with the ETag saved
+from the last run (If-None-Match); a 304 means the page is unchanged and its
+applicants are skipped.
+
+Applicants from changed pages are upserted into ``candidates``. They are
+matched case-insensitively by email, and only the fields Indeed supplies are
+overwritten. Each one is then linked to the job through
+``indeed_applications``. All writes for a run share one transaction. On
+Postgres, runs hold a transaction-level advisory lock so concurrent runs
+cannot insert the same email twice.
+
+Recruiter views are served from those tables. Indeed is contacted again only
+once a job's data is older than INDEED_CANDIDATES_TTL_SECONDS. Employer job
+listings are cached in process for INDEED_JOBS_CACHE_TTL_SECONDS and
+revalidated with their ETag when the entry expires.
+"""
+
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import asyncio
+from dataclasses import dataclass, field
+from pydantic import EmailStr, TypeAdapter, ValidationError
+from sqlalchemy import Row, bindparam, delete, func, insert, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.candidate import Candidate
+from app.models.indeed import IndeedApplication, IndeedPage
+from app.utils.helper import get_current_time
+from app.utils.http_client import HttpClient
+from app.utils.logging_utils import setup_logger
+from app.utils.upsert import upsert_stmt
+
+logger = setup_logger(__name__)
+
+# Transaction-level advisory lock key shared by all ingestion runs
+INGEST_LOCK_KEY = 0x1DEED
+# Rows per IN (...) lookup / multi-row statement
+WRITE_CHUNK_SIZE = 1000
+
+# Candidate columns refreshed from Indeed on re-ingestion (when supplied)
+UPDATED_FIELDS = ("name", "cv_file_url", "contact_number", "current_location")
+
+_email = TypeAdapter(EmailStr)
+
+
+class IndeedError(RuntimeError):
+    """Indeed answered with an unexpected status."""
+
+
+@dataclass
+class PageResult:
+    page: int
+    etag: Optional[str]
+    item_count: int
+    total_pages: Optional[int]
+    # None when the page was unchanged (304)
+    candidates: Optional[List[Dict[str, Any]]] = None
+
+
+@dataclass
+class IngestStats:
+    pages: int = 0
+    pages_unchanged: int = 0
+    fetched: int = 0
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+def _auth_headers() -> Dict[str, str]:
+    return {"Authorization": f"Bearer {settings.INDEED_API_KEY}"}
+
+
+def parse_indeed_datetime(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def _total_pages(body: Dict[str, Any], page_size: int) -> Optional[int]:
+    if body.get("total_pages") is not None:
+        return int(body["total_pages"])
+    if body.get("total") is not None:
+        return max(1, -(-int(body["total"]) // page_size))
+    return None
+
+
+async def fetch_page(
+    http: HttpClient,
+    job_id: str,
+    page: int,
+    page_size: int,
+    known: Optional[Row],
+) -> PageResult:
+    headers = _auth_headers()
+    if known is not None and known.etag:
+        headers["If-None-Match"] = known.etag
+    response = await http.get(
+        f"{settings.INDEED_API_BASE}/jobs/{job_id}/candidates",
+        headers=headers,
+        params={"page": page, "limit": page_size},
+    )
+    if response.status_code == 304 and known is not None:
+        return PageResult(
+            page=page,
+            etag=known.etag,
+            item_count=known.item_count or 0,
+            total_pages=known.total_pages,
+        )
+    if response.status_code != 200:
+        raise IndeedError(
+            f"Indeed returned {response.status_code} for job {job_id} page {page}"
+        )
+    body = response.json()
+    candidates = body.get("candidates", [])
+    return PageResult(
+        page=page,
+        etag=response.headers.get("ETag"),
+        item_count=len(candidates),
+        total_pages=_total_pages(body, page_size),
+        candidates=candidates,
+    )
+
+
+async def fetch_job_pages(
+    http: HttpClient, job_id: str, known: Dict[int, Row]
+) -> List[PageResult]:
+    """Fetch every applicant page of ``job_id``, conditionally where possible."""
+    page_size = settings.INDEED_PAGE_SIZE
+    first = await fetch_page(http, job_id, 1, page_size, known.get(1))
+    results = [first]
+    if first.total_pages is not None:
+        slots = asyncio.Semaphore(settings.INDEED_MAX_CONCURRENCY)
+
+        async def bounded(page: int) -> PageResult:
+            async with slots:
+                return await fetch_page(http, job_id, page, page_size, known.get(page))
+
+        results += await asyncio.gather(
+            *(bounded(page) for page in range(2, first.total_pages + 1))
+        )
+        return results
+    # No page count from upstream: walk pages until a short one
+    page = first
+    while page.item_count >= page_size:
+        page = await fetch_page(
+            http, job_id, page.page + 1, page_size, known.get(page.page + 1)
+        )
+        results.append(page)
+    return results
+
+
+def applicant_fields(
+    record: Dict[str, Any], job_post_id: Optional[int]
+) -> Dict[str, Any]:
+    """Candidate columns supplied by an Indeed applicant record."""
+    return {
+        "name": record.get("name"),
+        "cv_file_url": record.get("resume_url"),
+        "contact_number": record.get("phone"),
+        "current_location": record.get("location"),
+        "job_post_id": job_post_id,
+    }
+
+
+async def _upsert_candidates(
+    db: AsyncSession,
+    applicants: Dict[str, Dict[str, Any]],
+    job_post_id: Optional[int],
+    stats: IngestStats,
+) -> Dict[str, int]:
+    """Insert or update one candidate per email; return email -> candidate id."""
+    emails = list(applicants)
+    ids: Dict[str, int] = {}
+    for start in range(0, len(emails), WRITE_CHUNK_SIZE):
+        chunk = emails[start : start + WRITE_CHUNK_SIZE]
+        rows = await db.execute(
+            select(func.lower(Candidate.email), func.min(Candidate.id))
+            .where(func.lower(Candidate.email).in_(chunk))
+            .group_by(func.lower(Candidate.email))
+        )
+        ids.update({email: candidate_id for email, candidate_id in rows})
+
+    table = Candidate.__table__
+    updates = [
+        {
+            f"b_{key}": value
+            for key, value in applicant_fields(applicants[email], job_post_id).items()
+        }
+        | {"b_id": ids[email]}
+        for email in emails
+        if email in ids
+    ]
+    if updates:
+        # Only overwrite what Indeed supplied; keep the existing job post
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .values(
+                {
+                    column: func.coalesce(bindparam(f"b_{column}"), table.c[column])
+                    for column in UPDATED_FIELDS
+                }
+                | {
+                    "job_post_id": func.coalesce(
+                        table.c.job_post_id, bindparam("b_job_post_id")
+                    )
+                }
+            )
+        )
+        conn = await db.connection()
+        for start in range(0, len(updates), WRITE_CHUNK_SIZE):
+            await conn.execute(stmt, updates[start : start + WRITE_CHUNK_SIZE])
+        stats.updated += len(updates)
+
+    new = [email for email in emails if email not in ids]
+    for start in range(0, len(new), WRITE_CHUNK_SIZE):
+        chunk = new[start : start + WRITE_CHUNK_SIZE]
+        inserted = (
+            await db.scalars(
+                insert(Candidate).returning(Candidate.id, sort_by_parameter_order=True),
+                [
+                    {"email": email, **applicant_fields(applicants[email], job_post_id)}
+                    for email in chunk
+                ],
+            )
+        ).all()
+        ids.update(zip(chunk, inserted))
+        stats.inserted += len(inserted)
+    return ids
+
+
+async def ingest_job(
+    db: AsyncSession,
+    http: HttpClient,
+    job_id: str,
+    job_post_id: Optional[int] = None,
+) -> IngestStats:
+    """Pull ``job_id``'s applicants from Indeed into candidates."""
+    stats = IngestStats()
+    rows = await db.execute(
+        select(
+            IndeedPage.page,
+            IndeedPage.etag,
+            IndeedPage.item_count,
+            IndeedPage.total_pages,
+        ).where(IndeedPage.job_id == job_id)
+    )
+    known = {row.page: row for row in rows}
+    # Release the read transaction while talking to Indeed
+    await db.rollback()
+    pages = await fetch_job_pages(http, job_id, known)
+
+    applicants: Dict[str, Dict[str, Any]] = {}
+    for page in pages:
+        stats.pages += 1
+        if page.candidates is None:
+            stats.pages_unchanged += 1
+            continue
+        for record in page.candidates:
+            stats.fetched += 1
+            try:
+                email = _email.validate_python(record.get("email")).lower()
+            except ValidationError:
+                stats.skipped += 1
+                stats.errors.append(
+                    f"page {page.page}: applicant {record.get('id')} has no valid email"
+                )
+                continue
+            applicants[email] = record
+
+    if db.get_bind().dialect.name == "postgresql":
+        await db.execute(
+            text("SELECT pg_advisory_xact_lock(:key)"), {"key": INGEST_LOCK_KEY}
+        )
+    now = get_current_time()
+    if applicants:
+        ids = await _upsert_candidates(db, applicants, job_post_id, stats)
+        links = [
+            {
+                "job_id": job_id,
+                "candidate_id": ids[email],
+                "external_id": record.get("id"),
+                "applied_at": parse_indeed_datetime(record.get("applied_at")),
+                "updated_at": now,
+            }
+            for email, record in applicants.items()
+        ]
+        dialect = db.get_bind().dialect.name
+        for start in range(0, len(links), WRITE_CHUNK_SIZE):
+            await db.execute(
+                upsert_stmt(
+                    dialect,
+                    IndeedApplication.__table__,
+                    links[start : start + WRITE_CHUNK_SIZE],
+                    ["job_id", "candidate_id"],
+                )
+            )
+
+    await db.execute(
+        upsert_stmt(
+            db.get_bind().dialect.name,
+            IndeedPage.__table__,
+            [
+                {
+                    "job_id": job_id,
+                    "page": page.page,
+                    "etag": page.etag,
+                    "item_count": page.item_count,
+                    "total_pages": page.total_pages,
+                    "checked_at": now,
+                }
+                for page in pages
+            ],
+            ["job_id", "page"],
+        )
+    )
+    await db.execute(
+        delete(IndeedPage).where(
+            IndeedPage.job_id == job_id, IndeedPage.page > len(pages)
+        )
+    )
+    await db.commit()
+    logger.info(
+        "Indeed job %s: %d pages (%d unchanged), %d inserted, %d updated",
+        job_id,
+        stats.pages,
+        stats.pages_unchanged,
+        stats.inserted,
+        stats.updated,
+    )
+    return stats
+
+
+class JobIngestor:
+    """Serialises ingestion per job within a worker and tracks freshness."""
+
+    def __init__(self):
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def last_checked(self, db: AsyncSession, job_id: str) -> Optional[datetime]:
+        return await db.scalar(
+            select(IndeedPage.checked_at).where(
+                IndeedPage.job_id == job_id, IndeedPage.page == 1
+            )
+        )
+
+    async def is_fresh(self, db: AsyncSession, job_id: str) -> bool:
+        checked = await self.last_checked(db, job_id)
+        if checked is None:
+            return False
+        age = get_current_time().replace(tzinfo=None) - checked
+        return age < timedelta(seconds=settings.INDEED_CANDIDATES_TTL_SECONDS)
+
+    async def ensure_fresh(
+        self,
+        db: AsyncSession,
+        http: HttpClient,
+        job_id: str,
+        job_post_id: Optional[int] = None,
+        force: bool = False,
+    ) -> Optional[IngestStats]:
+        """Ingest ``job_id`` unless it was checked within the TTL.
+
+        Concurrent callers for the same job wait for one run instead of each
+        contacting Indeed.
+        """
+        if not force and await self.is_fresh(db, job_id):
+            return None
+        async with self._locks.setdefault(job_id, asyncio.Lock()):
+            if not force and await self.is_fresh(db, job_id):
+                return None
+            return await ingest_job(db, http, job_id, job_post_id)
+
+
+job_ingestor = JobIngestor()
+
+
+class JobListingCache:
+    """Per-process TTL cache of employer job listings, revalidated by ETag."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 1_000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # employer_id -> (expires_at, etag, jobs)
+        self._entries: "OrderedDict[str, Tuple[float, Optional[str], List[dict]]]" = (
+            OrderedDict()
+        )
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def _store(self, employer_id: str, etag: Optional[str], jobs: List[dict]) -> None:
+        self._entries[employer_id] = (time.monotonic() + self.ttl_seconds, etag, jobs)
+        self._entries.move_to_end(employer_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get(self, http: HttpClient, employer_id: str) -> List[dict]:
+        entry = self._entries.get(employer_id)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[2]
+        async with self._locks.setdefault(employer_id, asyncio.Lock()):
+            entry = self._entries.get(employer_id)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[2]
+            headers = _auth_headers()
+            if entry is not None and entry[1]:
+                headers["If-None-Match"] = entry[1]
+            response = await http.get(
+                f"{settings.INDEED_API_BASE}/employer/jobs",
+                headers=headers,
+                params={"employer_id": employer_id},
+            )
+            if response.status_code == 304 and entry is not None:
+                self._store(employer_id, entry[1], entry[2])
+                return entry[2]
+            if response.status_code != 200:
+                raise IndeedError(
+                    f"Indeed returned {response.status_code} for employer {employer_id}"
+                )
+            jobs = response.json().get("jobs", [])
+            self._store(employer_id, response.headers.get("ETag"), jobs)
+            return jobs
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+job_listing_cache = JobListingCache(settings.INDEED_JOBS_CACHE_TTL_SECONDS)
@@ -0,0 +1,114 @@
+"""Skill-term filters over job posts.
+
+Every job post stores ``skill_terms``, the normalised 1-3 word runs of its
+qualification text split by scope:
+
+    {"required": ["go", "kubernetes", ...], "preferred": [...]}
+
+These are the same terms the candidate matcher looks skills up by (see
+``matching.qualification_terms``). On Postgres the column is JSONB with a
+``jsonb_path_ops`` GIN index, so "jobs requiring Kubernetes" becomes the
+containment test ``skill_terms @> '{"required": ["kubernetes"]}'``, answered
+from the index. Other dialects fall back to ``json_each`` so the filters still
+work against SQLite in development.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, or_, select, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.jobpost import JobPost
+from app.utils.matching import (
+    PREFERRED_WEIGHT,
+    REQUIRED_WEIGHT,
+    normalize_skill,
+    qualification_terms,
+)
+
+REQUIRED = "required"
+PREFERRED = "preferred"
+
+
+def job_skill_terms(required: Any, preferred: Any) -> Dict[str, List[str]]:
+    """The ``skill_terms`` value for a job post's qualifications."""
+    return {
+        REQUIRED: sorted(qualification_terms(required)),
+        PREFERRED: sorted(qualification_terms(preferred)),
+    }
+
+
+def term_condition(dialect: str, scope: str, term: str) -> Any:
+    """Job posts whose ``scope`` qualifications contain the normalised ``term``."""
+    if dialect == "postgresql":
+        return JobPost.skill_terms.op("@>")(type_coerce({scope: [term]}, JSONB))
+    terms = func.json_each(JobPost.skill_terms, f"$.{scope}").table_valued("value")
+    return select(1).select_from(terms).where(terms.c.value == term).exists()
+
+
+def any_term_condition(dialect: str, terms: Iterable[str]) -> Any:
+    """Job posts naming any of ``terms`` in required or preferred qualifications."""
+    return or_(
+        *(
+            term_condition(dialect, scope, term)
+            for term in terms
+            for scope in (REQUIRED, PREFERRED)
+        )
+    )
+
+
+def build_job_filters(
+    dialect: str,
+    *,
+    requires: Optional[List[str]] = None,
+    mentions: Optional[List[str]] = None,
+) -> List[Any]:
+    """``requires``: every term is a required qualification. ``mentions``:
+    every term appears in required or preferred qualifications."""
+    conditions: List[Any] = []
+    for term in filter(None, map(normalize_skill, requires or [])):
+        conditions.append(term_condition(dialect, REQUIRED, term))
+    for term in filter(None, map(normalize_skill, mentions or [])):
+        conditions.append(any_term_condition(dialect, [term]))
+    return conditions
+
+
+async def jobs_for_skills(
+    db: AsyncSession, skills: Dict[str, float], k: int
+) -> List[Tuple[Any, float, List[str]]]:
+    """Top ``k`` job posts for a set of scored skills, as ``(row, score, matched)``.
+
+    Candidate jobs come from one containment query (a GIN bitmap OR on
+    Postgres) over the normalised skill names. Each skill then adds
+    ``weight * score``, where the weight is REQUIRED_WEIGHT or
+    PREFERRED_WEIGHT depending on where the job names it.
+    """
+    if not skills:
+        return []
+    stmt = select(
+        JobPost.id,
+        JobPost.title,
+        JobPost.position,
+        JobPost.location,
+        JobPost.employment_type,
+        JobPost.skill_terms,
+    ).where(any_term_condition(db.get_bind().dialect.name, skills))
+    ranked = []
+    for row in await db.execute(stmt):
+        terms = row.skill_terms or {}
+        required = set(terms.get(REQUIRED, ()))
+        preferred = set(terms.get(PREFERRED, ()))
+        score = 0.0
+        matched = []
+        for skill, skill_score in skills.items():
+            if skill in required:
+                score += REQUIRED_WEIGHT * skill_score
+            elif skill in preferred:
+                score += PREFERRED_WEIGHT * skill_score
+            else:
+                continue
+            matched.append(skill)
+        ranked.append((row, score, matched))
+    ranked.sort(key=lambda item: (-item[1], item[0].id))
+    return ranked[:k]
@@ -1,63 +1,311 @@
+"""Process-wide logging setup.
+
+Loggers created by ``setup_logger`` never write to the console or to disk
+themselves. They share one ``QueueHandler`` that drops records onto a bounded
+in-memory queue. A single background ``QueueListener`` thread drains that
+queue in batches of up to LOG_BATCH_SIZE records and writes them to the real
+handlers (console, system.log, errors.log). The streams are flushed once per
+batch, so a slow disk or a midnight rollover never blocks the event loop.
+
+When the queue is full, LOG_QUEUE_POLICY decides what happens:
+
+- ``"drop"`` discards the record. Logging never waits.
+- ``"block"`` waits up to LOG_QUEUE_BLOCK_SECONDS for room, then discards it.
+
+Records below WARNING count as full LOG_QUEUE_RESERVED slots early, which
+keeps room for warnings and errors during a burst. Dropped records are
+counted per level (see ``log_queue_stats``). The listener also reports the
+number dropped since its last report through the log itself.
+
+The queue handler sits on the top-level logger of each name passed to
+``setup_logger`` (``app`` for ``app.api.candidates``), and module loggers
+propagate to it. The top-level logger itself does not propagate: a handler
+on the root logger (``logging.basicConfig``, which any module-level
+``logging.info`` call runs implicitly) would otherwise write every record a
+second time, synchronously, on the request path.
+"""
+
 import logging
-from logging.handlers import TimedRotatingFileHandler
+import os
+from collections import Counter
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
 from pathlib import Path
+from typing import Dict, List, Optional
+
+import atexit
+import queue
+import threading
 
 from app.core.constants import (
     ERROR_LOG_FILE_NAME,
+    LOG_BATCH_SIZE,
     LOG_FILE_NAME,
     LOG_LEVEL,
+    LOG_QUEUE_BLOCK_SECONDS,
+    LOG_QUEUE_POLICY,
+    LOG_QUEUE_RESERVED,
+    LOG_QUEUE_SIZE,
     LOG_TO_FILE,
 )
 
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(message)s"
 
-def setup_logger(name: str = "app") -> logging.Logger:
-    log_level = LOG_LEVEL
-    numeric_level = getattr(logging, log_level, logging.INFO)
 
-    logger = logging.getLogger(name)
-    logger.setLevel(numeric_level)
-
-    if logger.hasHandlers():
-        return logger
-
-    formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
-
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(numeric_level)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-
-    if LOG_TO_FILE is True:
-        log_dir = Path("logs")
-        log_dir.mkdir(parents=True, exist_ok=True)
-
-        # Read file names from env or use defaults
-        main_log_name = LOG_FILE_NAME
-        error_log_name = ERROR_LOG_FILE_NAME
-
-        # Main log file handler
-        file_handler = TimedRotatingFileHandler(
-            filename=log_dir / main_log_name,
-            when="midnight",
-            interval=1,
-            backupCount=7,
-            utc=True,
+class LineFormatter(logging.Formatter):
+    """LOG_FORMAT, except records logged with ``extra={"structured": True}``
+    (already complete lines such as JSON access records) are written as-is."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        if getattr(record, "structured", False):
+            return record.getMessage()
+        return super().format(record)
+
+
+class _BatchFlushMixin:
+    """Defer stream flushes to the listener, which flushes once per batch."""
+
+    def flush(self) -> None:
+        pass
+
+    def flush_batch(self) -> None:
+        super().flush()
+
+
+class BatchStreamHandler(_BatchFlushMixin, logging.StreamHandler):
+    pass
+
+
+class BatchTimedRotatingFileHandler(_BatchFlushMixin, TimedRotatingFileHandler):
+    def close(self) -> None:
+        self.flush_batch()
+        super().close()
+
+
+class BoundedQueueHandler(QueueHandler):
+    """QueueHandler that applies the full-queue policy and counts drops."""
+
+    def __init__(
+        self,
+        log_queue: queue.Queue,
+        policy: str,
+        block_seconds: float,
+        reserved: int = 0,
+    ):
+        super().__init__(log_queue)
+        self.policy = policy
+        self.block_seconds = block_seconds
+        self.reserved = reserved
+        self.dropped: Counter = Counter()
+        self._dropped_lock = threading.Lock()
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            if (
+                record.levelno < logging.WARNING
+                and self.queue.qsize() >= self.queue.maxsize - self.reserved
+            ):
+                raise queue.Full
+            if self.policy == "block":
+                self.queue.put(record, timeout=self.block_seconds)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped[record.levelname] += 1
+
+    def take_dropped(self, since: Dict[str, int]) -> int:
+        """Drops recorded since the ``since`` snapshot (updated in place)."""
+        with self._dropped_lock:
+            current = dict(self.dropped)
+        new = sum(current.values()) - sum(since.values())
+        since.clear()
+        since.update(current)
+        return new
+
+
+class BatchQueueListener(QueueListener):
+    """QueueListener that handles records in batches and flushes per batch."""
+
+    def __init__(self, log_queue, *handlers, batch_size: int, source=None):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.batch_size = batch_size
+        self.source: Optional[BoundedQueueHandler] = source
+        self._reported: Dict[str, int] = {}
+
+    def _flush(self) -> None:
+        for handler in self.handlers:
+            flush = getattr(handler, "flush_batch", handler.flush)
+            try:
+                flush()
+            except Exception:
+                handler.handleError(None)
+
+    def _report_drops(self) -> None:
+        if self.source is None:
+            return
+        dropped = self.source.take_dropped(self._reported)
+        if dropped:
+            self.handle(
+                logging.makeLogRecord(
+                    {
+                        "name": "app.logging",
+                        "levelno": logging.WARNING,
+                        "levelname": "WARNING",
+                        "msg": f"Log queue full: dropped {dropped} records",
+                    }
+                )
+            )
+
+    def enqueue_sentinel(self) -> None:
+        # Wait for room rather than failing when the queue is full at shutdown
+        self.queue.put(self._sentinel)
+
+    def _monitor(self) -> None:
+        q = self.queue
+        stop = False
+        while not stop:
+            batch: List[logging.LogRecord] = [self.dequeue(True)]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.dequeue(False))
+                except queue.Empty:
+                    break
+            for record in batch:
+                if record is self._sentinel:
+                    stop = True
+                else:
+                    self.handle(record)
+                q.task_done()
+            self._report_drops()
+            self._flush()
+
+
+class _Pipeline:
+    def __init__(self):
+        self.level = getattr(logging, LOG_LEVEL, logging.INFO)
+        self.sinks = self._build_sinks()
+        self.handler = BoundedQueueHandler(
+            self._new_queue(),
+            LOG_QUEUE_POLICY,
+            LOG_QUEUE_BLOCK_SECONDS,
+            LOG_QUEUE_RESERVED,
         )
-        file_handler.setLevel(numeric_level)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-
-        # Error-only file handler
-        error_handler = TimedRotatingFileHandler(
-            filename=log_dir / error_log_name,
-            when="midnight",
-            interval=1,
-            backupCount=14,
-            utc=True,
+        self.handler.setLevel(self.level)
+        self.listener: Optional[BatchQueueListener] = None
+        self.start()
+
+    @staticmethod
+    def _new_queue() -> queue.Queue:
+        return queue.Queue(maxsize=LOG_QUEUE_SIZE + LOG_QUEUE_RESERVED)
+
+    def _build_sinks(self) -> List[logging.Handler]:
+        formatter = LineFormatter(LOG_FORMAT)
+
+        # Console handler
+        console_handler = BatchStreamHandler()
+        console_handler.setLevel(self.level)
+        console_handler.setFormatter(formatter)
+        sinks: List[logging.Handler] = [console_handler]
+
+        if LOG_TO_FILE is True:
+            log_dir = Path("logs")
+            log_dir.mkdir(parents=True, exist_ok=True)
+
+            # Main log file handler
+            file_handler = BatchTimedRotatingFileHandler(
+                filename=log_dir / LOG_FILE_NAME,
+                when="midnight",
+                interval=1,
+                backupCount=7,
+                utc=True,
+            )
+            file_handler.setLevel(self.level)
+            file_handler.setFormatter(formatter)
+            sinks.append(file_handler)
+
+            # Error-only file handler
+            error_handler = BatchTimedRotatingFileHandler(
+                filename=log_dir / ERROR_LOG_FILE_NAME,
+                when="midnight",
+                interval=1,
+                backupCount=14,
+                utc=True,
+            )
+            error_handler.setLevel(logging.ERROR)
+            error_handler.setFormatter(formatter)
+            sinks.append(error_handler)
+        return sinks
+
+    def start(self) -> None:
+        self.listener = BatchQueueListener(
+            self.handler.queue,
+            *self.sinks,
+            batch_size=LOG_BATCH_SIZE,
+            source=self.handler,
         )
-        error_handler.setLevel(logging.ERROR)
-        error_handler.setFormatter(formatter)
-        logger.addHandler(error_handler)
+        self.listener.start()
+        self.pid = os.getpid()
+
+    def stop(self) -> None:
+        """Drain the queue and stop the listener thread."""
+        if self.listener is not None and self.pid == os.getpid():
+            self.listener.stop()
+            self.listener = None
+
+    def after_fork(self) -> None:
+        # The listener thread does not survive fork; give the child its own
+        # (empty) queue and listener. Sink locks are re-initialised by logging.
+        self.handler.queue = self._new_queue()
+        self.handler.dropped = Counter()
+        self.handler._dropped_lock = threading.Lock()
+        self.start()
+
+
+_pipeline: Optional[_Pipeline] = None
+_pipeline_lock = threading.Lock()
+
+
+def _get_pipeline() -> _Pipeline:
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                _pipeline = _Pipeline()
+                atexit.register(_pipeline.stop)
+                if hasattr(os, "register_at_fork"):
+                    os.register_at_fork(after_in_child=_pipeline.after_fork)
+    return _pipeline
+
+
+def log_queue_stats() -> dict:
+    """Queue depth and dropped-record counters for this process."""
+    pipeline = _get_pipeline()
+    handler = pipeline.handler
+    return {
+        "policy": handler.policy,
+        "capacity": handler.queue.maxsize,
+        "queued": handler.queue.qsize(),
+        "dropped": dict(handler.dropped),
+        "dropped_total": sum(handler.dropped.values()),
+    }
+
+
+def flush_logs() -> None:
+    """Block until every record queued so far has been written."""
+    _get_pipeline().handler.queue.join()
+
+
+def setup_logger(name: str = "app") -> logging.Logger:
+    pipeline = _get_pipeline()
+
+    logger = logging.getLogger(name)
+    logger.setLevel(pipeline.level)
 
+    # One handler per top-level logger; module loggers propagate to it, and
+    # it stops there so root handlers never write the same record again
+    top = logging.getLogger(name.partition(".")[0])
+    if pipeline.handler not in top.handlers:
+        top.setLevel(pipeline.level)
+        top.addHandler(pipeline.handler)
+        top.propagate = False
     return logger
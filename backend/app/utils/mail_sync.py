@@ -0,0 +1,271 @@
+"""Local mirror of Outlook Inboxes kept current with Graph delta queries.
+
+Each mailbox gets an initial round of ``messages/delta`` (bounded to the last
+MAIL_SYNC_LOOKBACK_DAYS), after which only the changes since the saved delta
+link are fetched every MAIL_SYNC_INTERVAL_SECONDS. Message metadata lands in
+the indexed ``mail_messages`` table, so the mail API filters by subject and
+sender locally instead of calling Graph per request.
+
+Only AZURE_MAILBOX and the mailboxes listed in MAIL_SYNC_MAILBOXES are
+synced; the API refuses any other mailbox.
+
+No database connection is held while Graph is paged. Each page is written in
+its own short transaction together with the link to continue from, so an
+interrupted round resumes rather than restarting, and a mailbox's state row
+only appears once its first page has arrived. That transaction also checks
+that the saved link is still the one the page was fetched from: if another
+worker has moved the mailbox on meanwhile, the page is discarded and this
+round ends. If Graph expires the delta state, the mailbox is resynced from
+scratch and rows not seen in the fresh round are swept.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import asyncio
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.core.config import settings
+from app.core.database import async_engine
+from app.models.mail import MailMessage, MailSyncState
+from app.utils.helper import get_current_time
+from app.utils.logging_utils import setup_logger
+from app.utils.outlook_client import DeltaExpired, get_outlook_client
+from app.utils.upsert import dialect_insert, upsert_stmt
+
+logger = setup_logger(__name__)
+
+
+def parse_graph_datetime(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def message_row(mailbox: str, message: Dict[str, Any], now: datetime) -> dict:
+    sender = (message.get("from") or {}).get("emailAddress") or {}
+    return {
+        "mailbox": mailbox,
+        "message_id": message["id"],
+        "subject": message.get("subject"),
+        "from_name": sender.get("name"),
+        "from_address": (sender.get("address") or "").lower() or None,
+        "received_at": parse_graph_datetime(message.get("receivedDateTime")),
+        "body_preview": message.get("bodyPreview"),
+        "synced_at": now,
+    }
+
+
+def sync_mailboxes() -> List[str]:
+    """AZURE_MAILBOX followed by MAIL_SYNC_MAILBOXES, without duplicates."""
+    mailboxes = [settings.AZURE_MAILBOX] + list(settings.MAIL_SYNC_MAILBOXES)
+    return list(dict.fromkeys(m for m in mailboxes if m))
+
+
+class MailboxSync:
+    def __init__(self):
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return settings.MAIL_SYNC_INTERVAL_SECONDS > 0 and all(
+            [
+                settings.AZURE_TENANT_ID,
+                settings.AZURE_CLIENT_ID,
+                settings.AZURE_CLIENT_SECRET,
+            ]
+        )
+
+    def allowed(self, mailbox: str) -> bool:
+        return mailbox in sync_mailboxes()
+
+    async def sync(self, mailbox: str, wait: bool = False) -> int:
+        """Run one delta round for ``mailbox`` and return the changes applied.
+
+        Rounds for the same mailbox in this worker run one at a time. Without
+        ``wait``, returns 0 immediately if one is already running; with it,
+        waits for that round and then runs an (incremental, usually empty)
+        round of its own.
+        """
+        lock = self._locks.setdefault(mailbox, asyncio.Lock())
+        if lock.locked() and not wait:
+            return 0
+        async with lock:
+            async with async_engine.connect() as conn:
+                state = (
+                    await conn.execute(
+                        select(MailSyncState.next_link, MailSyncState.delta_link).where(
+                            MailSyncState.mailbox == mailbox
+                        )
+                    )
+                ).first()
+            saved = None if state is None else (state.next_link, state.delta_link)
+            link = None if state is None else state.next_link or state.delta_link
+            try:
+                return await self._run_round(mailbox, saved, link)
+            except DeltaExpired:
+                logger.warning("Delta state for %s expired; resyncing", mailbox)
+                return await self._run_round(mailbox, saved, None)
+
+    async def _save_state(
+        self,
+        conn: AsyncConnection,
+        mailbox: str,
+        saved: Optional[Tuple[Optional[str], Optional[str]]],
+        values: Dict[str, Any],
+    ) -> bool:
+        """Store the links for ``mailbox`` if they are still ``saved``.
+
+        ``saved`` is the ``(next_link, delta_link)`` pair this round last read
+        or wrote, or None if the mailbox had no state yet. Returns False when
+        another worker has changed the state since.
+        """
+        if saved is None:
+            stmt = dialect_insert(conn.dialect.name, MailSyncState.__table__)
+            result = await conn.execute(
+                stmt.values(mailbox=mailbox, **values).on_conflict_do_nothing()
+            )
+            return result.rowcount == 1
+        next_link, delta_link = saved
+        result = await conn.execute(
+            update(MailSyncState)
+            .where(
+                MailSyncState.mailbox == mailbox,
+                MailSyncState.next_link.is_not_distinct_from(next_link),
+                MailSyncState.delta_link.is_not_distinct_from(delta_link),
+            )
+            .values(**values)
+        )
+        return result.rowcount == 1
+
+    async def _run_round(
+        self,
+        mailbox: str,
+        saved: Optional[Tuple[Optional[str], Optional[str]]],
+        link: Optional[str],
+    ) -> int:
+        started = get_current_time()
+        since = None
+        if settings.MAIL_SYNC_LOOKBACK_DAYS:
+            since = started - timedelta(days=settings.MAIL_SYNC_LOOKBACK_DAYS)
+        applied = 0
+        client = get_outlook_client()
+        async for messages, next_link, delta_link in client.iter_message_delta(
+            mailbox, link=link, since=since
+        ):
+            values: Dict[str, Any] = {"next_link": next_link}
+            if delta_link:
+                values.update(delta_link=delta_link, synced_at=get_current_time())
+            async with async_engine.begin() as conn:
+                current = await self._save_state(conn, mailbox, saved, values)
+                if current:
+                    applied += await self._apply(conn, mailbox, messages)
+                if current and delta_link and link is None:
+                    # Fresh full round: anything not re-sent is gone (or too old)
+                    result = await conn.execute(
+                        delete(MailMessage).where(
+                            MailMessage.mailbox == mailbox,
+                            MailMessage.synced_at < started,
+                        )
+                    )
+                    applied += result.rowcount
+            if not current:
+                logger.info("%s was synced by another worker meanwhile", mailbox)
+                break
+            if delta_link:
+                saved = (next_link, delta_link)
+            else:
+                saved = (next_link, saved[1] if saved else None)
+        if applied:
+            logger.info("Synced %d message changes for %s", applied, mailbox)
+        return applied
+
+    async def _apply(
+        self, conn: AsyncConnection, mailbox: str, messages: List[Dict[str, Any]]
+    ) -> int:
+        now = get_current_time()
+        removed = set()
+        rows: Dict[str, dict] = {}
+        for message in messages:
+            if "@removed" in message:
+                removed.add(message["id"])
+                rows.pop(message["id"], None)
+            else:
+                removed.discard(message["id"])
+                rows[message["id"]] = message_row(mailbox, message, now)
+        if removed:
+            await conn.execute(
+                delete(MailMessage).where(
+                    MailMessage.mailbox == mailbox,
+                    MailMessage.message_id.in_(removed),
+                )
+            )
+        if rows:
+            await conn.execute(
+                upsert_stmt(
+                    conn.dialect.name,
+                    MailMessage.__table__,
+                    list(rows.values()),
+                    ["mailbox", "message_id"],
+                )
+            )
+        return len(removed) + len(rows)
+
+    async def is_synced(self, db: AsyncSession, mailbox: str) -> bool:
+        """Whether ``mailbox`` has completed at least one sync round."""
+        delta_link = await db.scalar(
+            select(MailSyncState.delta_link).where(MailSyncState.mailbox == mailbox)
+        )
+        return delta_link is not None
+
+    async def _run(self) -> None:
+        while True:
+            for mailbox in sync_mailboxes():
+                try:
+                    await self.sync(mailbox)
+                except Exception:
+                    logger.exception("Mailbox sync failed for %s", mailbox)
+            await asyncio.sleep(settings.MAIL_SYNC_INTERVAL_SECONDS)
+
+    async def start(self) -> None:
+        if not self.enabled:
+            logger.info("Mailbox sync disabled (no Azure credentials or interval 0)")
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+mailbox_sync = MailboxSync()
+
+
+async def search_messages(
+    db: AsyncSession,
+    mailbox: str,
+    limit: int,
+    subject_contains: Optional[str] = None,
+    from_address: Optional[str] = None,
+) -> List[MailMessage]:
+    """Newest-first messages of ``mailbox`` from the local mirror."""
+    stmt = select(MailMessage).where(MailMessage.mailbox == mailbox)
+    if subject_contains:
+        escaped = (
+            subject_contains.replace("\\", "\\\\")
+            .replace("%", "\\%")
+            .replace("_", "\\_")
+        )
+        stmt = stmt.where(MailMessage.subject.ilike(f"%{escaped}%", escape="\\"))
+    if from_address:
+        stmt = stmt.where(MailMessage.from_address == from_address.lower())
+    stmt = stmt.order_by(MailMessage.received_at.desc(), MailMessage.id.desc())
+    stmt = stmt.limit(limit)
+    return list((await db.scalars(stmt)).all())
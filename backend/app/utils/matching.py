@@ -0,0 +1,342 @@
+"""Candidate-to-job ranking over an in-memory sparse skill matrix.
+
+Each worker keeps the candidate x skill score matrix in coordinate form
+(three parallel NumPy arrays: candidate row, skill column, score). Ranking a
+job is then a single vectorised pass over the non-zeros: skills named in the
+job's qualifications get a weight, every entry contributes
+``weight[skill] * score`` to its candidate via ``np.bincount``, and
+``np.argpartition`` picks the top K without sorting the whole population.
+
+candidate_skills rows are only ever appended through the API, so the matrix
+is maintained incrementally by loading rows with an id above the highest one
+already indexed. Ids are handed out when rows are inserted, not when they
+commit, so a row can become visible after a higher id was already indexed:
+every id skipped below the watermark is remembered for the next
+MATCH_INDEX_LATE_ROW_WINDOW ids and fetched again on each load until it shows
+up. Loads always read the primary, so replica lag cannot open such gaps. A
+full rebuild every MATCH_INDEX_REBUILD_SECONDS picks up anything changed out
+of band (edited scores, deleted rows, new GPT scores) or committed later
+still.
+The rebuild runs as a background task into a fresh index that replaces the
+old one when complete, and row conversion always runs in a worker thread,
+so neither blocks the event loop or the requests ranking meanwhile.
+"""
+
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import asyncio
+import numpy as np
+import re
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import AsyncSessionLocal
+from app.models.candidate import Candidate
+from app.models.candidateskill import CandidateSkill
+from app.utils.logging_utils import setup_logger
+
+logger = setup_logger(__name__)
+
+# Weight of a skill named in required vs preferred qualifications
+REQUIRED_WEIGHT = 1.0
+PREFERRED_WEIGHT = 0.5
+# Multiplicative boost per unit of overall_gpt_score
+GPT_BOOST = 0.25
+# Seconds between full rebuilds of the matrix
+MATCH_INDEX_REBUILD_SECONDS = 300
+# Ids this far below the highest indexed one are still watched for late commits
+MATCH_INDEX_LATE_ROW_WINDOW = 10_000
+# Longest skill name, in words, looked up in qualification text
+MAX_SKILL_WORDS = 3
+
+_WORD = re.compile(r"[a-z0-9+#.]+")
+
+
+def normalize_skill(name: str) -> str:
+    words = (w.strip(".") for w in _WORD.findall(name.lower()))
+    return " ".join(w for w in words if w)
+
+
+def iter_text(value: Any) -> Iterable[str]:
+    """Yield every string inside an arbitrarily nested JSON value."""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for v in value.values():
+            yield from iter_text(v)
+    elif isinstance(value, (list, tuple)):
+        for v in value:
+            yield from iter_text(v)
+
+
+def qualification_terms(value: Any) -> Set[str]:
+    """Every run of 1 to MAX_SKILL_WORDS normalised words in qualification text."""
+    terms: Set[str] = set()
+    for text in iter_text(value):
+        words = normalize_skill(text).split()
+        for size in range(1, MAX_SKILL_WORDS + 1):
+            for i in range(len(words) - size + 1):
+                terms.add(" ".join(words[i : i + size]))
+    return terms
+
+
+def id_ranges(ids: Iterable[int]) -> List[Tuple[int, int]]:
+    """Collapse ids into sorted, inclusive ``(first, last)`` runs."""
+    ranges: List[Tuple[int, int]] = []
+    for i in sorted(ids):
+        if ranges and ranges[-1][1] == i - 1:
+            ranges[-1] = (ranges[-1][0], i)
+        else:
+            ranges.append((i, i))
+    return ranges
+
+
+class SkillIndex:
+    """One generation of the matrix. Ranking reads it on the event loop; it is
+    only ever changed there too, by ``SkillBatch.apply``."""
+
+    def __init__(self):
+        self.skill_ids: Dict[str, int] = {}
+        self.skill_names: List[str] = []
+        self.row_of: Dict[int, int] = {}
+        self.candidate_ids = np.empty(0, dtype=np.int64)
+        self.gpt_scores = np.empty(0, dtype=np.float64)
+        self.rows = np.empty(0, dtype=np.int32)
+        self.cols = np.empty(0, dtype=np.int32)
+        self.scores = np.empty(0, dtype=np.float32)
+        self.last_skill_row_id = 0
+        # Ids within MATCH_INDEX_LATE_ROW_WINDOW of last_skill_row_id not seen yet
+        self.missing_row_ids: Set[int] = set()
+
+    @property
+    def nnz(self) -> int:
+        return int(self.rows.size)
+
+    def job_weights(
+        self, required: Any, preferred: Any
+    ) -> Tuple[np.ndarray, Dict[str, float]]:
+        """Map qualification text onto indexed skills and return column weights."""
+        weights = np.zeros(len(self.skill_names), dtype=np.float32)
+        matched: Dict[str, float] = {}
+        for value, weight in (
+            (preferred, PREFERRED_WEIGHT),
+            (required, REQUIRED_WEIGHT),
+        ):
+            for term in qualification_terms(value):
+                skill_id = self.skill_ids.get(term)
+                if skill_id is not None:
+                    weights[skill_id] = max(weights[skill_id], weight)
+                    matched[self.skill_names[skill_id]] = float(weights[skill_id])
+        return weights, matched
+
+    def rank(self, weights: np.ndarray, k: int) -> List[Tuple[int, float, List[str]]]:
+        """Return ``(candidate_id, score, matched_skills)`` for the top ``k``."""
+        if not self.nnz or not weights.any():
+            return []
+        contrib = weights[self.cols] * self.scores
+        totals = np.bincount(
+            self.rows, weights=contrib, minlength=self.candidate_ids.size
+        )
+        totals *= 1 + GPT_BOOST * self.gpt_scores
+        positive = np.flatnonzero(totals > 0)
+        if positive.size > k:
+            positive = positive[np.argpartition(-totals[positive], k - 1)[:k]]
+        top = positive[np.argsort(-totals[positive], kind="stable")]
+
+        in_top = np.zeros(self.candidate_ids.size, dtype=bool)
+        in_top[top] = True
+        hits = in_top[self.rows] & (contrib > 0)
+        matched: Dict[int, List[str]] = {int(r): [] for r in top}
+        for row, col in zip(self.rows[hits], self.cols[hits]):
+            matched[int(row)].append(self.skill_names[col])
+        return [
+            (int(self.candidate_ids[r]), float(totals[r]), matched[int(r)]) for r in top
+        ]
+
+
+class SkillBatch:
+    """Rows to be added to a ``SkillIndex``, prepared off the event loop.
+
+    ``add`` and ``finish`` run in a worker thread and only read the index.
+    New skills and candidates are numbered after the index's own, rows are
+    kept as per-partition chunks and concatenated once by ``finish``.
+    ``apply`` then publishes everything on the event loop with plain
+    assignments, so a ranking never sees a half-updated index.
+    """
+
+    def __init__(self, index: SkillIndex):
+        self.index = index
+        self.new_skills: Dict[str, int] = {}
+        self.new_rows: Dict[int, int] = {}
+        self.new_gpt: List[float] = []
+        self.chunks: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        self.last_skill_row_id = index.last_skill_row_id
+        self.missing_row_ids = set(index.missing_row_ids)
+        self.arrays: Tuple[np.ndarray, ...] = ()
+
+    def _skill_id(self, name: str) -> int:
+        skill_id = self.index.skill_ids.get(name)
+        if skill_id is None:
+            skill_id = self.new_skills.get(name)
+        if skill_id is None:
+            skill_id = self.new_skills[name] = len(self.index.skill_names) + len(
+                self.new_skills
+            )
+        return skill_id
+
+    def _row(self, candidate_id: int, gpt: Any) -> int:
+        row = self.index.row_of.get(candidate_id)
+        if row is None:
+            row = self.new_rows.get(candidate_id)
+        if row is None:
+            row = self.new_rows[candidate_id] = len(self.index.row_of) + len(
+                self.new_rows
+            )
+            self.new_gpt.append(float(gpt or 0))
+        return row
+
+    def add(self, batch: List[Tuple[int, int, str, Any, Any]]) -> None:
+        rows, cols, scores = [], [], []
+        for row_id, candidate_id, skill_name, score, gpt in batch:
+            if row_id > self.last_skill_row_id:
+                # Rows arrive in id order; remember the ids skipped over
+                skipped_from = max(
+                    self.last_skill_row_id + 1, row_id - MATCH_INDEX_LATE_ROW_WINDOW
+                )
+                self.missing_row_ids.update(range(skipped_from, row_id))
+                self.last_skill_row_id = row_id
+            else:
+                self.missing_row_ids.discard(row_id)
+            name = normalize_skill(skill_name or "")
+            if candidate_id is None or not name:
+                continue
+            rows.append(self._row(candidate_id, gpt))
+            cols.append(self._skill_id(name))
+            scores.append(float(score or 0))
+        if len(self.missing_row_ids) > MATCH_INDEX_LATE_ROW_WINDOW:
+            self._forget_old_gaps()
+        if rows:
+            self.chunks.append(
+                (
+                    np.asarray(rows, np.int32),
+                    np.asarray(cols, np.int32),
+                    np.asarray(scores, np.float32),
+                )
+            )
+
+    def _forget_old_gaps(self) -> None:
+        oldest = self.last_skill_row_id - MATCH_INDEX_LATE_ROW_WINDOW
+        self.missing_row_ids = {i for i in self.missing_row_ids if i > oldest}
+
+    def finish(self) -> None:
+        index = self.index
+        self._forget_old_gaps()
+        self.arrays = (
+            np.concatenate([index.candidate_ids, list(self.new_rows)]).astype(np.int64),
+            np.concatenate([index.gpt_scores, self.new_gpt]),
+            np.concatenate([index.rows] + [c[0] for c in self.chunks]),
+            np.concatenate([index.cols] + [c[1] for c in self.chunks]),
+            np.concatenate([index.scores] + [c[2] for c in self.chunks]),
+        )
+
+    def apply(self) -> None:
+        index = self.index
+        names = sorted(self.new_skills, key=self.new_skills.__getitem__)
+        index.skill_names.extend(names)
+        index.skill_ids.update(self.new_skills)
+        index.row_of.update(self.new_rows)
+        (
+            index.candidate_ids,
+            index.gpt_scores,
+            index.rows,
+            index.cols,
+            index.scores,
+        ) = self.arrays
+        index.last_skill_row_id = self.last_skill_row_id
+        index.missing_row_ids = self.missing_row_ids
+
+
+class SkillMatrix:
+    def __init__(self):
+        self.index = SkillIndex()
+        # Serialises incremental loads; ranking itself never waits on it
+        self._lock = asyncio.Lock()
+        self._rebuild: Optional[asyncio.Task] = None
+        self.built_at = time.monotonic()
+
+    async def _load(self, db: AsyncSession, index: SkillIndex) -> SkillBatch:
+        """Read skill rows ``index`` has not seen into a finished batch."""
+        batch = SkillBatch(index)
+        unseen = or_(
+            CandidateSkill.id > index.last_skill_row_id,
+            *(
+                CandidateSkill.id.between(first, last)
+                for first, last in id_ranges(index.missing_row_ids)
+            ),
+        )
+        stmt = (
+            select(
+                CandidateSkill.id,
+                CandidateSkill.candidate_id,
+                CandidateSkill.skill_name,
+                CandidateSkill.score,
+                Candidate.overall_gpt_score,
+            )
+            .join(Candidate, Candidate.id == CandidateSkill.candidate_id)
+            .where(unseen)
+            .order_by(CandidateSkill.id)
+            .execution_options(yield_per=50_000)
+        )
+        result = await db.stream(stmt)
+        async for partition in result.partitions():
+            await asyncio.to_thread(batch.add, partition)
+        await asyncio.to_thread(batch.finish)
+        return batch
+
+    async def _rebuild_index(self) -> None:
+        try:
+            index = SkillIndex()
+            async with AsyncSessionLocal() as db:
+                batch = await self._load(db, index)
+            batch.apply()
+            self.index = index
+            logger.info("Rebuilt skill matrix: %d entries", index.nnz)
+        except Exception:
+            logger.exception("Skill matrix rebuild failed")
+        finally:
+            self._rebuild = None
+
+    async def refresh(self) -> SkillIndex:
+        """Load skill rows committed since the last refresh and return the index.
+
+        Reads the primary, like the rebuild: a replica's rows may trail the
+        ids already indexed. Every MATCH_INDEX_REBUILD_SECONDS a full rebuild
+        is started in the background; requests keep ranking against the
+        current index until the new one is swapped in.
+        """
+        if (
+            self._rebuild is None
+            and time.monotonic() - self.built_at > MATCH_INDEX_REBUILD_SECONDS
+        ):
+            self.built_at = time.monotonic()
+            self._rebuild = asyncio.create_task(self._rebuild_index())
+        async with self._lock:
+            index = self.index
+            async with AsyncSessionLocal() as db:
+                batch = await self._load(db, index)
+            # A rebuild swapped in meanwhile supersedes these rows
+            if index is self.index:
+                batch.apply()
+        return self.index
+
+
+skill_matrix = SkillMatrix()
+
+
+async def rank_candidates(
+    required: Any, preferred: Any, k: int
+) -> Tuple[List[Tuple[int, float, List[str]]], Dict[str, float]]:
+    index = await skill_matrix.refresh()
+    weights, job_skills = index.job_weights(required, preferred)
+    return index.rank(weights, k), job_skills
@@ -9,23 +9,135 @@ Notes:
 - Requires the application to be registered in Azure AD with the Mail.Read
   application permission (Application type) and admin consent granted.
 - Uses client credentials (client id + secret + tenant id).
+- Access tokens are cached process-wide per tenant/client (see TokenCache), so
+  the Azure AD round trip happens roughly once per token lifetime rather than
+  on every call.
+- HTTP goes through the shared async client in app.utils.http_client
+  (pooled keep-alive connections, timeouts, retries).
+- ``iter_message_delta`` pages through the Graph messages/delta query; the
+  mailbox sync in app.utils.mail_sync uses it to keep a local copy of the
+  Inbox that the API serves from.
 """
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+import time
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
 
-import requests
+import asyncio
+import httpx
+from dataclasses import dataclass
 
 from app.core.config import settings
+from app.utils.http_client import HttpClient, get_http_client
 from app.utils.logging_utils import setup_logger
 
 logger = setup_logger(__name__)
 
+# Refresh a cached token this many seconds before it expires
+TOKEN_REFRESH_MARGIN_SECONDS = 300
+# Message properties requested from Graph
+MESSAGE_FIELDS = "id,subject,from,receivedDateTime,bodyPreview"
+# Messages per delta page (Prefer: odata.maxpagesize)
+DELTA_PAGE_SIZE = 200
+
+
+@dataclass
+class CachedToken:
+    access_token: str
+    refresh_at: float
+    expires_at: float
+
+
+class TokenCache:
+    """Per-process access-token cache with single-flight refresh.
+
+    Tokens are reused until ``refresh_at`` (expires_in minus a safety margin).
+    Between ``refresh_at`` and ``expires_at`` one caller refreshes while the
+    others keep using the still-valid token; once a token has expired, callers
+    queue on the per-key lock and share the result of a single fetch.
+    """
+
+    def __init__(self, margin_seconds: float = TOKEN_REFRESH_MARGIN_SECONDS):
+        self.margin_seconds = margin_seconds
+        self._tokens: Dict[Tuple[str, str], CachedToken] = {}
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+
+    def _lock_for(self, key: Tuple[str, str]) -> asyncio.Lock:
+        return self._locks.setdefault(key, asyncio.Lock())
+
+    async def get(
+        self,
+        key: Tuple[str, str],
+        fetch: Callable[[], Awaitable[Optional[Tuple[str, int]]]],
+    ) -> Optional[str]:
+        """Return a valid token for ``key``, calling ``fetch`` when needed.
+
+        ``fetch`` returns ``(access_token, expires_in_seconds)`` or None.
+        """
+        cached = self._tokens.get(key)
+        now = time.monotonic()
+        if cached and now < cached.refresh_at:
+            return cached.access_token
+
+        lock = self._lock_for(key)
+        still_valid = cached is not None and now < cached.expires_at
+        if still_valid and lock.locked():
+            # Someone else is already refreshing; the current token still works
+            return cached.access_token
+        async with lock:
+            cached = self._tokens.get(key)
+            now = time.monotonic()
+            if cached and now < cached.refresh_at:
+                return cached.access_token
+            result = await fetch()
+            if result is None:
+                if cached and now < cached.expires_at:
+                    return cached.access_token
+                return None
+            access_token, expires_in = result
+            margin = min(self.margin_seconds, expires_in / 2)
+            self._tokens[key] = CachedToken(
+                access_token=access_token,
+                refresh_at=now + expires_in - margin,
+                expires_at=now + expires_in,
+            )
+            return access_token
+
+    def invalidate(self, key: Tuple[str, str]) -> None:
+        self._tokens.pop(key, None)
+
+
+token_cache = TokenCache()
+
+
+class DeltaExpired(RuntimeError):
+    """Graph rejected a saved delta/next link (410 Gone); resync from scratch."""
+
+
+def resolve_mailbox(mailbox: Optional[str]) -> str:
+    mailbox = mailbox or settings.AZURE_MAILBOX
+    if not mailbox:
+        # If no mailbox is specified, use the /me endpoint (not valid for app-only tokens).
+        # For app-only tokens you must specify a user id or userPrincipalName: /users/{id|userPrincipalName}
+        raise ValueError(
+            "Mailbox must be provided when using app-only tokens. Set AZURE_MAILBOX or pass mailbox parameter."
+        )
+    return mailbox
+
 
 class OutlookClient:
-    TOKEN_URL = "https://login.microsoftonline.com/{tenant}/oauth2/v2.0/token"
-    GRAPH_BASE = "https://graph.microsoft.com/v1.0"
+    TOKEN_PATH = "/{tenant}/oauth2/v2.0/token"
 
     def __init__(
         self,
@@ -33,24 +145,38 @@ class OutlookClient:
         tenant_id: Optional[str] = None,
         client_id: Optional[str] = None,
         client_secret: Optional[str] = None,
+        http: Optional[HttpClient] = None,
+        login_base: Optional[str] = None,
+        graph_base: Optional[str] = None,
     ):
+        self.http = http or get_http_client()
+        self.login_base = login_base or settings.AZURE_LOGIN_BASE
+        self.graph_base = graph_base or settings.GRAPH_API_BASE
         self.tenant_id = tenant_id or settings.AZURE_TENANT_ID
         self.client_id = client_id or settings.AZURE_CLIENT_ID
         self.client_secret = client_secret or settings.AZURE_CLIENT_SECRET
         if not all([self.tenant_id, self.client_id, self.client_secret]):
             logger.warning("Azure AD credentials are not fully configured in settings")
 
-    def _get_token(self) -> Optional[str]:
+    @property
+    def _token_key(self) -> Tuple[str, str]:
+        return (self.tenant_id, self.client_id)
+
+    async def _get_token(self) -> Optional[str]:
         if not all([self.tenant_id, self.client_id, self.client_secret]):
             return None
-        url = self.TOKEN_URL.format(tenant=self.tenant_id)
+        return await token_cache.get(self._token_key, self._fetch_token)
+
+    async def _fetch_token(self) -> Optional[Tuple[str, int]]:
+        url = self.login_base + self.TOKEN_PATH.format(tenant=self.tenant_id)
         data = {
             "client_id": self.client_id,
             "scope": "https://graph.microsoft.com/.default",
             "client_secret": self.client_secret,
             "grant_type": "client_credentials",
         }
-        resp = requests.post(url, data=data)
+        # Client-credential grants are safe to repeat
+        resp = await self.http.post(url, data=data, retry=True)
         if resp.status_code != 200:
             logger.error(
                 "Failed to obtain token from Azure AD: status=%s, response=%s, data=%s",
@@ -61,10 +187,38 @@ class OutlookClient:
                 },  # Log data without secret
             )
             return None
-        token = resp.json().get("access_token")
-        return token
+        body = resp.json()
+        token = body.get("access_token")
+        if not token:
+            return None
+        return token, int(body.get("expires_in", 3600))
 
-    def get_recent_messages(
+    async def _graph_get(
+        self,
+        url: str,
+        params: Optional[Dict[str, str]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> httpx.Response:
+        token = await self._get_token()
+        if token is None:
+            raise RuntimeError("Unable to get access token for Microsoft Graph")
+        headers = {
+            **(headers or {}),
+            "Authorization": f"Bearer {token}",
+            "Accept": "application/json",
+        }
+        resp = await self.http.get(url, headers=headers, params=params)
+        if resp.status_code == 401:
+            # Token revoked or rotated early: drop it and retry once
+            token_cache.invalidate(self._token_key)
+            token = await self._get_token()
+            if token is None:
+                raise RuntimeError("Unable to get access token for Microsoft Graph")
+            headers["Authorization"] = f"Bearer {token}"
+            resp = await self.http.get(url, headers=headers, params=params)
+        return resp
+
+    async def get_recent_messages(
         self,
         mailbox: Optional[str] = None,
         top: int = 10,
@@ -75,27 +229,12 @@ class OutlookClient:
 
         Returns a list of messages with keys: id, subject, from, receivedDateTime, bodyPreview
         """
-        token = self._get_token()
-        if token is None:
-            raise RuntimeError("Unable to get access token for Microsoft Graph")
-
-        mailbox = mailbox or settings.AZURE_MAILBOX
-        if not mailbox:
-            # If no mailbox is specified, use the /me endpoint (not valid for app-only tokens).
-            # For app-only tokens you must specify a user id or userPrincipalName: /users/{id|userPrincipalName}
-            raise ValueError(
-                "Mailbox must be provided when using app-only tokens. Set AZURE_MAILBOX or pass mailbox parameter."
-            )
-
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Accept": "application/json",
-        }
+        mailbox = resolve_mailbox(mailbox)
 
         # Build query parameters
         params = {
             "$top": str(top),
-            "$select": "id,subject,from,receivedDateTime,bodyPreview",
+            "$select": MESSAGE_FIELDS,
         }
 
         # OData filter construction (server-side filtering limited for body/subject contains)
@@ -110,8 +249,8 @@ class OutlookClient:
         if filters:
             params["$filter"] = " and ".join(filters)
 
-        url = f"{self.GRAPH_BASE}/users/{mailbox}/mailFolders/Inbox/messages"
-        resp = requests.get(url, headers=headers, params=params)
+        url = f"{self.graph_base}/users/{mailbox}/mailFolders/Inbox/messages"
+        resp = await self._graph_get(url, params=params)
         if resp.status_code != 200:
             logger.error(
                 "Graph messages request failed: status=%s, url=%s, params=%s, response=%s",
@@ -128,6 +267,51 @@ class OutlookClient:
         messages = data.get("value", [])
         return messages
 
+    async def iter_message_delta(
+        self,
+        mailbox: str,
+        link: Optional[str] = None,
+        since: Optional[datetime] = None,
+        page_size: int = DELTA_PAGE_SIZE,
+    ) -> AsyncIterator[Tuple[List[Dict[str, Any]], Optional[str], Optional[str]]]:
+        """Page through Inbox changes with the Graph ``messages/delta`` query.
+
+        Starts from ``link`` (a saved nextLink or deltaLink) or, without one,
+        from a full initial round limited to messages received after ``since``.
+        Yields ``(messages, next_link, delta_link)`` per page; exactly one of
+        the links is set, and ``delta_link`` only on the last page. Removed
+        messages carry an ``@removed`` key. Raises DeltaExpired when Graph no
+        longer accepts ``link`` and the caller must start over.
+        """
+        params: Optional[Dict[str, str]] = None
+        if link is None:
+            link = f"{self.graph_base}/users/{mailbox}/mailFolders/Inbox/messages/delta"
+            params = {"$select": MESSAGE_FIELDS}
+            if since is not None:
+                params["$filter"] = (
+                    f"receivedDateTime ge {since.strftime('%Y-%m-%dT%H:%M:%SZ')}"
+                )
+        headers = {"Prefer": f"odata.maxpagesize={page_size}"}
+        while link:
+            resp = await self._graph_get(link, params=params, headers=headers)
+            if resp.status_code == 410:
+                raise DeltaExpired(f"Delta state expired for mailbox {mailbox}")
+            if resp.status_code != 200:
+                logger.error(
+                    "Graph delta request failed: status=%s, mailbox=%s, response=%s",
+                    resp.status_code,
+                    mailbox,
+                    resp.text,
+                )
+                raise RuntimeError(
+                    f"Graph API error: {resp.status_code} - {resp.text[:200]}"
+                )
+            data = resp.json()
+            # Follow-up links already embed the query
+            params = None
+            link = data.get("@odata.nextLink")
+            yield data.get("value", []), link, data.get("@odata.deltaLink")
+
 
 def get_outlook_client() -> OutlookClient:
     return OutlookClient()
@@ -0,0 +1,80 @@
+"""Keyset (cursor) pagination helpers.
+
+Cursors are opaque, URL-safe tokens encoding the ``(created_at, id)`` of the
+last row of a page. The next page is fetched with a row-value comparison on
+that pair, which Postgres resolves with an index range scan instead of
+walking and discarding ``OFFSET`` rows. ``created_at`` is NOT NULL on every
+paginated table; a NULL would never compare below the cursor.
+"""
+
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import base64
+from fastapi import HTTPException
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.utils.fast_json import fetch_rows
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    payload = [created_at.isoformat(), row_id]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor produced by ``encode_cursor``.
+
+    Raises a 400 HTTPException for malformed or tampered cursors.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _keyset_stmt(stmt: Select, model: Any, cursor: Optional[str], limit: int):
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        stmt = stmt.where(
+            tuple_(model.created_at, model.id) < tuple_(created_at, row_id)
+        )
+    return stmt.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+
+
+async def keyset_paginate(
+    db: AsyncSession, stmt: Select, model: Any, cursor: Optional[str], limit: int
+) -> Tuple[List[Any], Optional[str]]:
+    """Return one page of ``stmt`` newest-first and the cursor for the next page.
+
+    ``model`` must expose ``created_at`` and ``id`` columns. One extra row is
+    fetched to tell whether another page exists without a COUNT query.
+    """
+    stmt = _keyset_stmt(stmt, model, cursor, limit)
+    rows = list((await db.scalars(stmt)).all())
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last.created_at, last.id)
+
+
+async def keyset_paginate_rows(
+    db: AsyncSession, stmt: Select, model: Any, cursor: Optional[str], limit: int
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """``keyset_paginate`` for a column select, returning rows as dicts.
+
+    ``stmt`` must select ``created_at`` and ``id`` among its columns.
+    """
+    stmt = _keyset_stmt(stmt, model, cursor, limit)
+    rows = await fetch_rows(db, stmt)
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last["created_at"], last["id"])
@@ -0,0 +1,38 @@
+"""Dialect-aware ``INSERT ... ON CONFLICT DO UPDATE``."""
+
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy import Table
+from sqlalchemy.dialects import postgresql, sqlite
+
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def dialect_insert(dialect: str, table: Table):
+    """The ``insert()`` construct with ON CONFLICT support for ``dialect``."""
+    if dialect not in _INSERTS:
+        raise ValueError(f"Upsert is not supported on '{dialect}'")
+    return _INSERTS[dialect](table)
+
+
+def upsert_stmt(
+    dialect: str,
+    table: Table,
+    rows: List[Dict[str, Any]],
+    index_elements: Iterable[str],
+):
+    """Insert ``rows``, overwriting the non-key columns of conflicting rows.
+
+    ``index_elements`` must match a unique constraint. Rows within one
+    statement must not share a key (Postgres refuses to update a row twice).
+    """
+    keys = set(index_elements)
+    stmt = dialect_insert(dialect, table).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=list(keys),
+        set_={
+            name: stmt.excluded[name]
+            for name in rows[0]
+            if name not in keys and name != "id"
+        },
+    )
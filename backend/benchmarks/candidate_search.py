@@ -0,0 +1,120 @@
+"""Latency of /candidates/search with and without facets.
+
+Seeds a throwaway SQLite database with candidates and mixed-case skills,
+prints the query plans of the skills filter and of each facet query, then
+times raw ASGI calls (no server, no sockets) against the search endpoint for
+a narrow and a broad filter, each with ``facets=false`` (the default) and
+``facets=true``. Run from backend/:
+
+    python -m benchmarks.candidate_search [requests]
+"""
+
+import os
+import sys
+import time
+from datetime import timedelta
+
+import asyncio
+import tempfile
+
+_db_dir = tempfile.mkdtemp(prefix="search_bench_")
+os.environ["DB_URL"] = f"sqlite:///{_db_dir}/bench.db"
+
+from fastapi import FastAPI  # noqa: E402
+from sqlalchemy import func, select, text  # noqa: E402
+
+from app.api import candidate  # noqa: E402
+from app.core.database import Base, SessionLocal, engine  # noqa: E402
+from app.models.candidate import Candidate  # noqa: E402
+from app.models.candidateskill import CandidateSkill  # noqa: E402
+from app.utils.candidate_search import _experience_bucket, build_filters  # noqa: E402
+from app.utils.helper import get_current_time  # noqa: E402
+from benchmarks.list_serialization import call  # noqa: E402
+
+SKILLS = ["Python", "SQL", "go", "Rust", "AWS", "Docker", "react", "Java"]
+
+QUERIES = {
+    "narrow": "skills=python&skills=rust&min_experience=10&visa_type=h1b",
+    "broad": "skills=python",
+}
+
+
+def seed(candidates: int = 20_000) -> None:
+    Base.metadata.create_all(engine)
+    now = get_current_time()
+    with SessionLocal() as db:
+        for i in range(candidates):
+            db.add(
+                Candidate(
+                    name=f"Candidate {i}",
+                    current_location="New York",
+                    email=f"candidate{i}@example.com",
+                    contact_number="555-0100",
+                    slot_availability=now + timedelta(days=i % 30),
+                    rate_card_hourly=50 + i % 40,
+                    experience_years=i % 15,
+                    visa_type=("h1b", "l1", "f1", "other")[i % 4],
+                    willing_to_relocate=bool(i % 2),
+                    overall_gpt_score=0.5,
+                    notice_period_days=30,
+                    cv_file_url=f"https://cv.example.com/{i}.pdf",
+                    remarks="Strong backend profile",
+                    created_at=now - timedelta(seconds=i),
+                    skills=[
+                        CandidateSkill(skill_name=name, score=1 + (i + j) % 10)
+                        for j, name in enumerate(SKILLS)
+                        if (i >> j) & 1
+                    ],
+                )
+            )
+        db.commit()
+
+
+def explain() -> None:
+    conditions = build_filters(skills=["python"])
+    matching = select(Candidate.id).where(*conditions).scalar_subquery()
+    statements = {
+        "filter": select(Candidate.id).where(*conditions),
+        "visa_type facet": select(Candidate.visa_type, func.count())
+        .where(*conditions)
+        .group_by(Candidate.visa_type),
+        "experience facet": select(_experience_bucket(), func.count())
+        .where(*conditions)
+        .group_by(_experience_bucket()),
+        "skills facet": select(func.lower(CandidateSkill.skill_name), func.count())
+        .where(CandidateSkill.candidate_id.in_(matching))
+        .group_by(func.lower(CandidateSkill.skill_name)),
+    }
+    with engine.connect() as conn:
+        for name, stmt in statements.items():
+            sql = stmt.compile(engine, compile_kwargs={"literal_binds": True})
+            print(f"-- {name}")
+            for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")):
+                print(f"   {row[-1]}")
+
+
+async def measure(app, query: str, requests: int) -> float:
+    for _ in range(min(requests, 10)):
+        await call(app, "/candidates/search", query)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await call(app, "/candidates/search", query)
+    return (time.perf_counter() - start) / requests * 1000
+
+
+async def main(requests: int) -> None:
+    seed()
+    explain()
+    app = FastAPI()
+    app.include_router(candidate.router, prefix="/candidates")
+    for name, query in QUERIES.items():
+        plain = await measure(app, query, requests)
+        faceted = await measure(app, f"{query}&facets=true", requests)
+        print(
+            f"{name:<8} facets=false {plain:7.2f} ms   "
+            f"facets=true {faceted:7.2f} ms   x{faceted / plain:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 50))
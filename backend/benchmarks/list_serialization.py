@@ -0,0 +1,205 @@
+"""Rows/sec of the list endpoints: ORM + response_model vs the orjson fast path.
+
+Seeds a throwaway SQLite database with job posts carrying JSON-heavy
+qualification lists and candidates, then drives raw ASGI calls (no server,
+no sockets) against:
+
+- ``orm``: the previous implementation, which loads ORM entities and lets
+  FastAPI validate and serialise them through ``response_model``;
+- ``fast``: the current endpoints, which select only the output columns and
+  write them with orjson (``app.utils.fast_json``).
+
+Before timing, it checks that both variants return byte-identical bodies.
+Run from backend/:
+
+    python -m benchmarks.list_serialization [requests]
+"""
+
+import os
+import sys
+import time
+from datetime import timedelta
+from typing import List, Optional
+
+import asyncio
+import tempfile
+
+_db_dir = tempfile.mkdtemp(prefix="list_bench_")
+os.environ["DB_URL"] = f"sqlite:///{_db_dir}/bench.db"
+os.environ["RESPONSE_CACHE_MAX_ENTRIES"] = "0"
+
+from fastapi import Depends, FastAPI, Query  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+
+from app.api import candidate, jobpost  # noqa: E402
+from app.core.database import Base, SessionLocal, engine, get_async_db  # noqa: E402
+from app.models.candidate import Candidate  # noqa: E402
+from app.models.jobpost import JobPost  # noqa: E402
+from app.schemas.candidate import CandidateOut  # noqa: E402
+from app.schemas.jobpost import JobPostOut  # noqa: E402
+from app.schemas.pagination import Page  # noqa: E402
+from app.utils.helper import get_current_time  # noqa: E402
+from app.utils.pagination import keyset_paginate  # noqa: E402
+
+PAGE = 100
+
+
+def seed(job_posts: int = 200, candidates: int = 1000) -> None:
+    Base.metadata.create_all(engine)
+    now = get_current_time()
+    skills = [f"skill-{i}" for i in range(40)]
+    with SessionLocal() as db:
+        for i in range(job_posts):
+            db.add(
+                JobPost(
+                    title=f"Engineer {i}",
+                    company_intro="We build things. " * 20,
+                    position="Engineer",
+                    location="Remote",
+                    employment_type="full_time",
+                    department="Platform",
+                    position_summary="Own services end to end. " * 10,
+                    key_responsibilities=[f"Responsibility {j}" for j in range(25)],
+                    required_qualifications=skills[:20],
+                    preferred_qualifications=skills[20:],
+                    addons={"benefits": ["health", "401k"], "level": i % 5},
+                    why_join_us="Impact. " * 20,
+                    created_at=now - timedelta(minutes=i),
+                )
+            )
+        for i in range(candidates):
+            db.add(
+                Candidate(
+                    job_post_id=1 + i % job_posts,
+                    name=f"Candidate {i}",
+                    current_location="New York",
+                    email=f"candidate{i}@example.com",
+                    contact_number="555-0100",
+                    slot_availability=now + timedelta(days=i % 30),
+                    rate_card_hourly=50 + i % 40,
+                    experience_years=i % 15,
+                    visa_type="h1b",
+                    willing_to_relocate=bool(i % 2),
+                    overall_gpt_score=0.5,
+                    notice_period_days=30,
+                    cv_file_url=f"https://cv.example.com/{i}.pdf",
+                    remarks="Strong backend profile",
+                    created_at=now - timedelta(seconds=i),
+                )
+            )
+        db.commit()
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(candidate.router, prefix="/fast/candidates")
+    app.include_router(jobpost.router, prefix="/fast/jobposts")
+
+    # The implementations replaced by the fast path
+    @app.get("/orm/candidates/", response_model=List[CandidateOut])
+    async def orm_candidates(
+        db: AsyncSession = Depends(get_async_db),
+        skip: int = 0,
+        limit: int = Query(10, le=100),
+    ):
+        stmt = select(Candidate).order_by(Candidate.id).offset(skip).limit(limit)
+        return (await db.scalars(stmt)).all()
+
+    @app.get("/orm/candidates/page", response_model=Page[CandidateOut])
+    async def orm_candidates_page(
+        db: AsyncSession = Depends(get_async_db),
+        cursor: Optional[str] = None,
+        limit: int = Query(10, ge=1, le=100),
+    ):
+        items, next_cursor = await keyset_paginate(
+            db, select(Candidate), Candidate, cursor, limit
+        )
+        return {"items": items, "next_cursor": next_cursor}
+
+    @app.get("/orm/jobposts/", response_model=List[JobPostOut])
+    async def orm_jobposts(
+        db: AsyncSession = Depends(get_async_db),
+        skip: int = 0,
+        limit: int = Query(10, le=100),
+    ):
+        stmt = select(JobPost).order_by(JobPost.id).offset(skip).limit(limit)
+        return (await db.scalars(stmt)).all()
+
+    @app.get("/orm/jobposts/page", response_model=Page[JobPostOut])
+    async def orm_jobposts_page(
+        db: AsyncSession = Depends(get_async_db),
+        cursor: Optional[str] = None,
+        limit: int = Query(10, ge=1, le=100),
+    ):
+        items, next_cursor = await keyset_paginate(
+            db, select(JobPost), JobPost, cursor, limit
+        )
+        return {"items": items, "next_cursor": next_cursor}
+
+    return app
+
+
+async def call(app, path: str, query: str) -> bytes:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query.encode(),
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+    body = []
+    status = None
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    assert status == 200, (path, status, b"".join(body))
+    return b"".join(body)
+
+
+async def measure(app, path: str, query: str, requests: int) -> float:
+    for _ in range(min(requests, 20)):
+        await call(app, path, query)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await call(app, path, query)
+    return requests * PAGE / (time.perf_counter() - start)
+
+
+async def main(requests: int) -> None:
+    seed()
+    app = build_app()
+    query = f"limit={PAGE}"
+    for resource in ("candidates", "jobposts"):
+        for path in ("/", "/page"):
+            orm_path = f"/orm/{resource}{path}"
+            fast_path = f"/fast/{resource}{path}"
+            orm_body = await call(app, orm_path, query)
+            fast_body = await call(app, fast_path, query)
+            assert orm_body == fast_body, f"{resource}{path}: bodies differ"
+            orm = await measure(app, orm_path, query, requests)
+            fast = await measure(app, fast_path, query, requests)
+            print(
+                f"{resource + path:<16} orm {orm:10,.0f} rows/s   "
+                f"fast {fast:10,.0f} rows/s   x{fast / orm:.2f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 300))
@@ -0,0 +1,146 @@
+"""Per-request overhead of the request-logging middleware.
+
+Drives three apps in process through raw ASGI calls (no server, no
+sockets), so the timings isolate the middleware itself:
+
+- ``none``: the bare app;
+- ``base_http``: the previous BaseHTTPMiddleware implementation;
+- ``asgi``: the current pure ASGI ``LoggingMiddleware``.
+
+Access logging is sampled out (ACCESS_LOG_SAMPLE_RATE=0) so both variants do
+the same bookkeeping without writing log lines. Run from backend/:
+
+    DB_URL=sqlite:// python -m benchmarks.middleware_overhead [requests]
+"""
+
+import os
+import sys
+import time
+import uuid
+from typing import Awaitable, Callable
+
+import asyncio
+
+os.environ.setdefault("DB_URL", "sqlite://")
+os.environ["ACCESS_LOG_SAMPLE_RATE"] = "0"
+
+from fastapi import FastAPI, Request  # noqa: E402
+from fastapi.responses import StreamingResponse  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+from starlette.responses import JSONResponse, Response  # noqa: E402
+
+from app.core.request_context import (  # noqa: E402
+    REQUEST_ID_HEADER,
+    RequestContext,
+    current_request,
+)
+from app.middleware.logging_middleware import LoggingMiddleware  # noqa: E402
+
+
+class BaseHTTPLoggingMiddleware(BaseHTTPMiddleware):
+    """The BaseHTTPMiddleware version replaced by LoggingMiddleware (minus logging)."""
+
+    async def dispatch(
+        self, request: Request, call_next: Callable[[Request], Awaitable[Response]]
+    ) -> Response:
+        ctx = RequestContext(request_id=uuid.uuid4().hex)
+        token = current_request.set(ctx)
+        try:
+            response = await call_next(request)
+        except Exception:
+            return JSONResponse({"detail": "Internal Server Error"}, status_code=500)
+        finally:
+            current_request.reset(token)
+        response.headers[REQUEST_ID_HEADER] = ctx.request_id
+        body = response.body_iterator
+
+        async def counted():
+            async for chunk in body:
+                yield chunk
+
+        response.body_iterator = counted()
+        return response
+
+
+def build_app(middleware=None) -> FastAPI:
+    app = FastAPI()
+    if middleware is not None:
+        app.add_middleware(middleware)
+
+    @app.get("/json")
+    async def json_endpoint():
+        return {"id": 1, "name": "candidate"}
+
+    @app.get("/stream")
+    async def stream_endpoint():
+        async def rows():
+            for i in range(20):
+                yield b'{"id":%d}\n' % i
+
+        return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+    return app
+
+
+async def call(app, path: str) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+
+    done = asyncio.Event()
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Streaming responses listen for a disconnect until the body is sent
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body" and not message.get("more_body"):
+            done.set()
+
+    await app(scope, receive, send)
+
+
+async def measure(app, path: str, requests: int) -> float:
+    for _ in range(min(requests, 500)):
+        await call(app, path)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await call(app, path)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+async def main(requests: int) -> None:
+    apps = {
+        "none": build_app(),
+        "base_http": build_app(BaseHTTPLoggingMiddleware),
+        "asgi": build_app(LoggingMiddleware),
+    }
+    for path in ("/json", "/stream"):
+        timings = {
+            name: await measure(app, path, requests) for name, app in apps.items()
+        }
+        base = timings["none"]
+        print(f"{path} ({requests} requests)")
+        for name, us in timings.items():
+            print(f"  {name:<10} {us:8.1f} us/request  overhead {us - base:+8.1f} us")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000))
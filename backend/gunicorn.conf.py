@@ -0,0 +1,60 @@
+"""Production server: gunicorn managing uvicorn workers.
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+Every setting can be overridden from the environment (the Ansible role sets
+them in the systemd unit):
+
+- WEB_CONCURRENCY: worker processes (default: one per CPU core plus one).
+  Exported to the app, which divides DB_MAX_CONNECTIONS between them.
+- BIND: listen address (default 0.0.0.0:8000).
+- GUNICORN_MAX_REQUESTS / GUNICORN_MAX_REQUESTS_JITTER: recycle a worker
+  after roughly this many requests, bounding slow leaks and fragmentation.
+- GUNICORN_TIMEOUT / GUNICORN_GRACEFUL_TIMEOUT: seconds before a silent
+  worker is killed, and seconds in-flight requests get on reload/shutdown.
+
+The app is imported once in the master (``preload_app``) and workers are
+forked from it, so code and import-time data are shared copy-on-write.
+Anything holding sockets or threads is re-created per worker in ``post_fork``
+(DB pools, the password hashing pool; logging restarts its own writer
+thread). Lifespan startup (config refresh, mailbox sync) runs in each worker.
+
+SIGHUP (``systemctl reload backend``) replaces workers gracefully. Because
+the app is preloaded, new code needs a restart of the master instead.
+"""
+
+import os
+
+import multiprocessing
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+workers = _env_int("WEB_CONCURRENCY", multiprocessing.cpu_count() + 1)
+# The app splits DB_MAX_CONNECTIONS between this many workers
+os.environ["WEB_CONCURRENCY"] = str(workers)
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = True
+
+max_requests = _env_int("GUNICORN_MAX_REQUESTS", 2000)
+max_requests_jitter = _env_int("GUNICORN_MAX_REQUESTS_JITTER", 200)
+timeout = _env_int("GUNICORN_TIMEOUT", 60)
+graceful_timeout = _env_int("GUNICORN_GRACEFUL_TIMEOUT", 30)
+keepalive = 5
+
+# The app writes its own JSON access records (LoggingMiddleware)
+accesslog = None
+errorlog = "-"
+loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "info")
+
+
+def post_fork(server, worker):
+    from app.core.database import dispose_engines_after_fork
+    from app.core.security import password_hasher
+
+    dispose_engines_after_fork()
+    password_hasher.after_fork()
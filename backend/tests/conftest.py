@@ -0,0 +1,46 @@
+import os
+import sys
+
+import pytest
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)
+os.environ["DB_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='backend_tests_')}/test.db"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core.database import Base, SessionLocal, engine  # noqa: E402
+from app.core.security import create_access_token, get_password_hash  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client():
+    Base.metadata.create_all(engine)
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def auth_headers(client):
+    with SessionLocal() as db:
+        user = User(
+            name="admin",
+            email="admin@example.com",
+            hashed_password=get_password_hash("password"),
+            role="admin",
+        )
+        db.add(user)
+        db.commit()
+        token = create_access_token({"sub": str(user.id), "role": "admin"})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def pytest_sessionfinish(session, exitstatus):
+    # Stop the log writer thread while pytest's captured stderr is still open
+    from app.utils.logging_utils import _get_pipeline
+
+    _get_pipeline().stop()
@@ -0,0 +1,179 @@
+import json
+
+import csv
+import io
+import pytest
+
+JOB_POST = {
+    "title": "Backend Engineer",
+    "company_intro": "We build things.",
+    "position": "Engineer",
+    "location": "Remote",
+    "employment_type": "full_time",
+    "department": "Platform",
+    "position_summary": "Own services end to end.",
+    "key_responsibilities": ["Ship"],
+    "required_qualifications": ["Python"],
+    "preferred_qualifications": ["Go"],
+    "why_join_us": "Impact.",
+}
+
+
+@pytest.fixture(scope="module")
+def job_post_id(client, auth_headers):
+    response = client.post("/api/v1/jobposts/", json=JOB_POST, headers=auth_headers)
+    return response.json()["id"]
+
+
+def candidate(job_post_id, name, remarks):
+    return {
+        "job_post_id": job_post_id,
+        "name": name,
+        "current_location": "New York, NY",
+        "email": f"{name.lower().replace(' ', '.')}@example.com",
+        "contact_number": "555-0100",
+        "slot_availability": "2026-01-01T00:00:00",
+        "rate_card_hourly": 55,
+        "experience_years": 4,
+        "visa_type": "h1b",
+        "willing_to_relocate": True,
+        "overall_gpt_score": 0.5,
+        "notice_period_days": 30,
+        "cv_file_url": "https://cv.example.com/cv.pdf",
+        "remarks": remarks,
+    }
+
+
+def test_csv_export_round_trips_through_import(client, auth_headers, job_post_id):
+    remarks = {
+        "Multi Line": 'line1\nline2, with "quotes"\n\nafter a blank line',
+        "Single Line": "plain",
+    }
+    for name, text in remarks.items():
+        created = client.post(
+            "/api/v1/candidates/",
+            json=candidate(job_post_id, name, text),
+            headers=auth_headers,
+        ).json()
+        client.post(
+            "/api/v1/candidateskills/",
+            json={"skill_name": "python", "score": 8, "candidate_id": created["id"]},
+            headers=auth_headers,
+        )
+
+    exported = client.get(
+        "/api/v1/candidates/export",
+        params={"format": "csv", "job_post_id": job_post_id},
+        headers=auth_headers,
+    ).text
+    renamed = exported.replace("Multi Line", "Multi Copy").replace(
+        "Single Line", "Single Copy"
+    )
+    result = client.post(
+        "/api/v1/candidates/import",
+        content=renamed.encode(),
+        headers={**auth_headers, "Content-Type": "text/csv"},
+    ).json()
+    assert result == {"inserted": 2, "failed": 0, "errors": []}
+
+    records = [
+        json.loads(line)
+        for line in client.get(
+            "/api/v1/candidates/export",
+            params={"job_post_id": job_post_id},
+            headers=auth_headers,
+        ).text.splitlines()
+    ]
+    by_name = {record["name"]: record for record in records}
+    for original, copy in (
+        ("Multi Line", "Multi Copy"),
+        ("Single Line", "Single Copy"),
+    ):
+        assert by_name[copy]["remarks"] == remarks[original]
+        assert by_name[copy]["skills"] == [{"skill_name": "python", "score": 8}]
+
+
+def test_invalid_utf8_is_reported_per_row(client, auth_headers, job_post_id):
+    good = json.dumps(candidate(job_post_id, "Utf Good", "ok")).encode()
+    bad = (
+        json.dumps(candidate(job_post_id, "Utf Bad", "café"))
+        .encode()
+        .replace(b"caf\\u00e9", b"caf\xe9")
+    )
+    body = b"\n".join([good, bad, good.replace(b"Utf Good", b"Utf Good Two")])
+    response = client.post(
+        "/api/v1/candidates/import",
+        content=body,
+        headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    result = response.json()
+    assert result["inserted"] == 2
+    assert [error["row"] for error in result["errors"]] == [2]
+    assert "not valid UTF-8" in result["errors"][0]["errors"][0]
+
+
+def test_csv_header_with_invalid_utf8_is_rejected(client, auth_headers):
+    response = client.post(
+        "/api/v1/candidates/import",
+        content=b"na\xffme,email\nA,a@example.com\n",
+        headers={**auth_headers, "Content-Type": "text/csv"},
+    )
+    assert response.status_code == 400
+
+
+def csv_body(job_post_id, rows):
+    """CSV import body with one row per ``(name, remarks)``. Both cells are
+    written verbatim, unquoted; the other cells are quoted as needed."""
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator="\n")
+    for index, (name, remarks) in enumerate(rows):
+        record = candidate(job_post_id, "@name@", "@remarks@")
+        record["email"] = f"row.{index}@example.com"
+        if index == 0:
+            writer.writerow(record)
+        writer.writerow(record.values())
+    body = out.getvalue()
+    for name, remarks in rows:
+        body = body.replace("@name@", name, 1).replace("@remarks@", remarks, 1)
+    return body.encode()
+
+
+def post_csv(client, auth_headers, body):
+    return client.post(
+        "/api/v1/candidates/import",
+        content=body,
+        headers={**auth_headers, "Content-Type": "text/csv"},
+    )
+
+
+def test_csv_quotes_inside_unquoted_fields_are_literal(
+    client, auth_headers, job_post_id
+):
+    body = csv_body(
+        job_post_id,
+        [('Jo O"Brien', "fine"), ("Tall Person", '5" tall'), ("Plain", "ok")],
+    )
+    response = post_csv(client, auth_headers, body)
+    assert response.status_code == 200
+    assert response.json() == {"inserted": 3, "failed": 0, "errors": []}
+
+
+def test_csv_stray_opening_quote_only_fails_its_row(client, auth_headers, job_post_id):
+    body = csv_body(
+        job_post_id,
+        [
+            ("Before Stray", "ok"),
+            ("Stray Quote", '"never closed'),
+            ("After Stray", "ok"),
+            ("Bad Quoting", '"closed"then text'),
+            ("Last Row", "ok"),
+        ],
+    )
+    response = post_csv(client, auth_headers, body)
+    assert response.status_code == 200
+    result = response.json()
+    assert result["inserted"] == 3
+    assert [error["row"] for error in result["errors"]] == [2, 4]
+    assert "line 3:" in result["errors"][0]["errors"][0]
+    assert "line 5:" in result["errors"][1]["errors"][0]
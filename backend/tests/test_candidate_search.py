@@ -0,0 +1,75 @@
+import pytest
+
+JOB_POST = {
+    "title": "Data Engineer",
+    "company_intro": "We move data.",
+    "position": "Engineer",
+    "location": "Remote",
+    "employment_type": "full_time",
+    "department": "Data",
+    "position_summary": "Own the pipelines.",
+    "key_responsibilities": ["Ship"],
+    "required_qualifications": ["Python"],
+    "preferred_qualifications": ["Spark"],
+    "why_join_us": "Impact.",
+}
+
+
+@pytest.fixture(scope="module")
+def job_post_id(client, auth_headers):
+    job_post_id = client.post(
+        "/api/v1/jobposts/", json=JOB_POST, headers=auth_headers
+    ).json()["id"]
+    for name, skills in (("Ada Search", ["Python", "SPARK"]), ("Bob Search", ["Go"])):
+        created = client.post(
+            "/api/v1/candidates/",
+            json={
+                "job_post_id": job_post_id,
+                "name": name,
+                "current_location": "Remote",
+                "email": f"{name.lower().replace(' ', '.')}@example.com",
+                "contact_number": "555-0100",
+                "slot_availability": "2026-01-01T00:00:00",
+                "rate_card_hourly": 60,
+                "experience_years": 6,
+                "visa_type": "l1",
+                "willing_to_relocate": False,
+                "overall_gpt_score": 0.5,
+                "notice_period_days": 30,
+                "cv_file_url": "https://cv.example.com/cv.pdf",
+                "remarks": "",
+            },
+            headers=auth_headers,
+        ).json()
+        for skill in skills:
+            client.post(
+                "/api/v1/candidateskills/",
+                json={"skill_name": skill, "score": 7, "candidate_id": created["id"]},
+                headers=auth_headers,
+            )
+    return job_post_id
+
+
+def search(client, auth_headers, **params):
+    response = client.get(
+        "/api/v1/candidates/search", params=params, headers=auth_headers
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.parametrize("skills", [["python"], ["PYTHON", " spark "]])
+def test_skill_filter_ignores_case(client, auth_headers, job_post_id, skills):
+    result = search(client, auth_headers, job_post_id=job_post_id, skills=skills)
+    assert [item["name"] for item in result["items"]] == ["Ada Search"]
+    assert result["total"] == 1
+
+
+def test_facets_are_opt_in(client, auth_headers, job_post_id):
+    assert search(client, auth_headers, job_post_id=job_post_id)["facets"] == {}
+
+    facets = search(client, auth_headers, job_post_id=job_post_id, facets=True)[
+        "facets"
+    ]
+    assert facets["visa_type"] == {"l1": 2}
+    assert facets["skills"] == {"python": 1, "spark": 1, "go": 1}
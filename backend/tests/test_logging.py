@@ -0,0 +1,33 @@
+import logging
+
+from app.utils.logging_utils import BoundedQueueHandler, flush_logs, setup_logger
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def test_queued_records_do_not_reach_root_handlers():
+    root_handler = ListHandler()
+    logging.getLogger().addHandler(root_handler)
+    try:
+        setup_logger("app.tests.logging").warning("queued once")
+        flush_logs()
+    finally:
+        logging.getLogger().removeHandler(root_handler)
+    assert root_handler.records == []
+
+
+def test_module_loggers_share_the_top_level_queue_handler():
+    module_logger = setup_logger("app.tests.module")
+    top = logging.getLogger("app")
+    assert module_logger.handlers == []
+    assert module_logger.propagate
+    queued = [h for h in top.handlers if isinstance(h, BoundedQueueHandler)]
+    assert len(queued) == 1
+    assert not top.propagate
@@ -0,0 +1,42 @@
+from sqlalchemy import func, select
+
+from app.core.database import SessionLocal
+from app.models.candidate import Candidate
+from app.models.candidateskill import CandidateSkill
+from app.utils.matching import SkillMatrix
+
+
+def add_skill(candidate_id, row_id, skill_name):
+    with SessionLocal() as db:
+        db.add(
+            CandidateSkill(
+                id=row_id, candidate_id=candidate_id, skill_name=skill_name, score=5
+            )
+        )
+        db.commit()
+
+
+def test_rows_committed_below_the_watermark_are_loaded(client):
+    with SessionLocal() as db:
+        candidate = Candidate(name="Late Commit")
+        db.add(candidate)
+        db.commit()
+        candidate_id = candidate.id
+        base = db.scalar(select(func.max(CandidateSkill.id))) or 0
+    # base + 2 was handed out first but its transaction commits last
+    add_skill(candidate_id, base + 1, "Fortran")
+    add_skill(candidate_id, base + 3, "Ada")
+
+    matrix = SkillMatrix()
+    index = client.portal.call(matrix.refresh)
+    assert index.last_skill_row_id == base + 3
+    assert index.missing_row_ids == {base + 2}
+
+    add_skill(candidate_id, base + 2, "COBOL")
+    index = client.portal.call(matrix.refresh)
+    assert index.missing_row_ids == set()
+
+    weights, _ = index.job_weights(["cobol"], [])
+    assert [(cid, skills) for cid, _, skills in index.rank(weights, 5)] == [
+        (candidate_id, ["cobol"])
+    ]
@@ -0,0 +1,120 @@
+import os
+import time
+from datetime import datetime, timezone
+
+import pytest
+import tempfile
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import Session
+
+from app.core import replicas
+from app.core.database import Base, SessionLocal
+from app.core.replicas import READ_PRIMARY_COOKIE, ReplicaRouter
+from app.models.candidate import Candidate
+
+TOKEN = "replicarouting"
+WINDOW_SECONDS = 0.5
+
+
+JOB_POST = {
+    "title": "Support Engineer",
+    "company_intro": "We help.",
+    "position": "Engineer",
+    "location": "Remote",
+    "employment_type": "full_time",
+    "department": "Support",
+    "position_summary": "Answer tickets.",
+    "key_responsibilities": ["Ship"],
+    "required_qualifications": ["SQL"],
+    "preferred_qualifications": [],
+    "why_join_us": "Impact.",
+}
+
+
+def candidate(name, job_post_id):
+    """Request body for a candidate the search below finds."""
+    return {
+        "job_post_id": job_post_id,
+        "name": name,
+        "current_location": "Remote",
+        "email": f"{name.lower().replace(' ', '.')}@example.com",
+        "contact_number": "555-0100",
+        "slot_availability": "2026-01-01T00:00:00",
+        "rate_card_hourly": 50,
+        "experience_years": 3,
+        "visa_type": "f1",
+        "willing_to_relocate": True,
+        "overall_gpt_score": 0.5,
+        "notice_period_days": 30,
+        "cv_file_url": "https://cv.example.com/cv.pdf",
+        "remarks": TOKEN,
+    }
+
+
+@pytest.fixture
+def job_post_id(client, auth_headers):
+    response = client.post("/api/v1/jobposts/", json=JOB_POST, headers=auth_headers)
+    return response.json()["id"]
+
+
+@pytest.fixture
+def router(client, monkeypatch, job_post_id):
+    """Route reads to a separate SQLite database standing in for a replica.
+
+    Its rows differ from the primary's, so each response shows which
+    database served it.
+    """
+    path = os.path.join(tempfile.mkdtemp(prefix="replica_"), "replica.db")
+
+    def row(name):
+        slot = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        return Candidate(**{**candidate(name, job_post_id), "slot_availability": slot})
+
+    seed = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(seed)
+    with Session(seed) as db:
+        db.add(row("Replica Row"))
+        db.commit()
+    seed.dispose()
+    with SessionLocal() as db:
+        db.add(row("Primary Row"))
+        db.commit()
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    router = ReplicaRouter([engine], WINDOW_SECONDS)
+    monkeypatch.setattr(replicas, "replica_router", router)
+    yield router
+    client.cookies.delete(READ_PRIMARY_COOKIE)
+    client.portal.call(engine.dispose)
+
+
+def search(client, auth_headers):
+    response = client.get(
+        "/api/v1/candidates/search", params={"q": TOKEN}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    return {item["name"] for item in response.json()["items"]}
+
+
+def test_reads_follow_the_read_your_writes_window(
+    client, auth_headers, job_post_id, router
+):
+    assert search(client, auth_headers) == {"Replica Row"}
+    assert router.replicas[0].reads == 1
+
+    response = client.post(
+        "/api/v1/candidates/",
+        json=candidate("Written Row", job_post_id),
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert READ_PRIMARY_COOKIE in response.cookies
+
+    # Inside the window the write is visible: reads go to the primary
+    assert search(client, auth_headers) == {"Primary Row", "Written Row"}
+    assert router.pinned_reads == 1
+
+    time.sleep(WINDOW_SECONDS + 0.1)
+    assert search(client, auth_headers) == {"Replica Row"}
+    assert router.replicas[0].reads == 2
@@ -0,0 +1,82 @@
+import uuid
+
+from app.core.database import AsyncSessionLocal, SessionLocal
+from app.core.response_cache import response_cache
+from app.core.security import get_password_hash
+from app.models.user import User
+
+USERS = "/api/v1/users/"
+
+
+def get_users(client, auth_headers, **headers):
+    return client.get(USERS, headers={**auth_headers, **headers})
+
+
+def test_matching_if_none_match_is_answered_with_304(client, auth_headers):
+    etag = get_users(client, auth_headers).headers["ETag"]
+    before = response_cache.stats()["not_modified"]
+
+    response = get_users(client, auth_headers, **{"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    assert response_cache.stats()["not_modified"] == before + 1
+
+
+def test_lru_hit_is_served_as_200(client, auth_headers):
+    first = get_users(client, auth_headers)
+    before = response_cache.stats()["hits"]
+
+    second = get_users(client, auth_headers)
+
+    assert second.status_code == 200
+    assert second.content == first.content
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert second.headers["Content-Type"] == "application/json"
+    assert int(second.headers["Content-Length"]) == len(first.content)
+    assert response_cache.stats()["hits"] == before + 1
+
+
+def test_committed_bump_changes_the_etag(client, auth_headers):
+    etag = get_users(client, auth_headers).headers["ETag"]
+    with SessionLocal() as db:
+        user = User(
+            name="cache",
+            email=f"{uuid.uuid4().hex}@example.com",
+            hashed_password=get_password_hash("password"),
+            role="user",
+        )
+        db.add(user)
+        db.commit()
+        user_id = user.id
+
+    response = client.put(
+        f"{USERS}{user_id}",
+        json={"email": f"{uuid.uuid4().hex}@example.com", "role": "user"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+
+    response = get_users(client, auth_headers, **{"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert any(user["id"] == user_id for user in response.json())
+
+
+def test_rolled_back_bump_keeps_the_etag(client, auth_headers):
+    etag = get_users(client, auth_headers).headers["ETag"]
+    version = response_cache.stats()["versions"].get("users", 0)
+
+    async def bump_and_roll_back():
+        async with AsyncSessionLocal() as db:
+            await response_cache.bump(db, "users")
+            await db.rollback()
+            # Nothing may be left pending for a later commit to apply
+            await db.commit()
+
+    client.portal.call(bump_and_roll_back)
+
+    assert response_cache.stats()["versions"].get("users", 0) == version
+    response = get_users(client, auth_headers, **{"If-None-Match": etag})
+    assert response.status_code == 304
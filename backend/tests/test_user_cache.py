@@ -0,0 +1,79 @@
+import uuid
+
+import pytest
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.security import create_access_token, get_password_hash
+from app.core.user_cache import user_cache
+from app.models.user import User
+
+
+@pytest.fixture
+def member(client):
+    with SessionLocal() as db:
+        user = User(
+            name="member",
+            email=f"{uuid.uuid4().hex}@example.com",
+            hashed_password=get_password_hash("password"),
+            role="user",
+        )
+        db.add(user)
+        db.commit()
+        token = create_access_token({"sub": str(user.id), "role": "user"})
+        return user.id, {"Authorization": f"Bearer {token}"}
+
+
+def update(client, auth_headers, user_id, **changes):
+    body = {"email": f"member{user_id}@example.com", "role": "user", **changes}
+    response = client.put(f"/api/v1/users/{user_id}", json=body, headers=auth_headers)
+    assert response.status_code == 200
+
+
+def test_role_change_invalidates_cached_user(client, auth_headers, member):
+    user_id, headers = member
+    assert client.get("/api/v1/config/", headers=headers).status_code == 200
+    assert user_cache.get(user_id).role == "user"
+    assert (
+        client.get("/api/v1/internal/response-cache", headers=headers).status_code
+        == 403
+    )
+
+    update(client, auth_headers, user_id, role="admin")
+
+    assert user_cache.get(user_id) is None
+    assert (
+        client.get("/api/v1/internal/response-cache", headers=headers).status_code
+        == 200
+    )
+
+
+def test_deactivation_invalidates_cached_user(client, auth_headers, member):
+    user_id, headers = member
+    assert client.get("/api/v1/config/", headers=headers).status_code == 200
+    assert user_cache.get(user_id).is_active
+
+    update(client, auth_headers, user_id, is_active=False)
+
+    response = client.get("/api/v1/config/", headers=headers)
+    assert response.status_code == 403
+    assert response.json()["detail"] == "Inactive user"
+
+
+def test_trusted_token_claims_skip_the_user_lookup(client, monkeypatch):
+    # No row has this id, so any database lookup would answer 404
+    missing_id = 987654
+    headers = {
+        "Authorization": "Bearer "
+        + create_access_token({"sub": str(missing_id), "role": "admin"})
+    }
+    user_cache.invalidate(missing_id)
+    assert client.get("/api/v1/config/", headers=headers).status_code == 404
+
+    monkeypatch.setattr(settings, "AUTH_TRUST_TOKEN_CLAIMS", True)
+    assert client.get("/api/v1/config/", headers=headers).status_code == 200
+    assert (
+        client.get("/api/v1/internal/response-cache", headers=headers).status_code
+        == 200
+    )
+    assert user_cache.get(missing_id) is None
@@ -36,7 +36,9 @@ async function fetchWithLogging(path: string, options: RequestInit = {}) {
   });
 
   const start = Date.now();
-  const res = await fetch(fullUrl, { ...options, headers });
+  // credentials: the backend's read-your-writes cookie must come back with
+  // reads that follow a write, or they may hit a lagging read replica
+  const res = await fetch(fullUrl, { credentials: 'include', ...options, headers });
   const time = Date.now() - start;
   try {
     // attempt to capture a brief response preview without consuming original stream
@@ -322,3 +324,18 @@ export async function loginApi(username: string, password: string) {
   }
   return res;
 }
+
+export async function fetchDashboardStats(days = 30) {
+  const response = await fetchWithLogging(`v1/stats/dashboard?days=${days}`, { method: 'GET' });
+  if (!response.ok) {
+    let errorMsg = 'Failed to fetch dashboard stats';
+    try {
+      const errorJson = await response.json();
+      errorMsg = errorJson.detail || JSON.stringify(errorJson);
+    } catch {
+      errorMsg = (await response.text()) || errorMsg;
+    }
+    throw new Error(errorMsg);
+  }
+  return response.json();
+}